@@ -0,0 +1,192 @@
+# Analizador ATS por línea de comandos
+#   python -m analizador_ats batch <carpeta|archivo.zip> --jd puesto.txt --jobs 4 > resultados.jsonl
+#   python -m analizador_ats entidades <carpeta|archivo.zip> --batch-size 64 --n-process 4 > entidades.jsonl
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, Optional, Tuple
+from modules.modelos import get_nlp
+from modules.procesador import MIME_TYPES, DocumentProcessor
+from modules.analizador import CVAnalyzer
+from modules.contexto import NER_BATCH_SIZE
+from modules.perfil_puesto import get_job_profile
+from modules.mejorador_cv import CVImprovementAnalyzer
+from modules.pipeline import analyze_cv_bytes, iter_zip_documents
+
+# Estado de cada proceso del pool: se prepara una vez en _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def iter_documents(source: str) -> Iterator[Tuple[str, bytes, Optional[str]]]:
+    """(nombre, contenido, tipo) de cada CV de una carpeta (recursiva) o un ZIP"""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for file_name in sorted(files):
+                file_type = MIME_TYPES.get(os.path.splitext(file_name)[1].lower())
+                if file_type is None or file_name.startswith(('.', '~$')):
+                    continue
+                path = os.path.join(root, file_name)
+                with open(path, 'rb') as document:
+                    yield os.path.relpath(path, source), document.read(), file_type
+    elif source.lower().endswith('.zip'):
+        yield from iter_zip_documents(source)
+    else:
+        with open(source, 'rb') as document:
+            yield os.path.basename(source), document.read(), MIME_TYPES.get(os.path.splitext(source)[1].lower())
+
+
+def _init_worker(job_description: str, improve: bool) -> None:
+    """Carga modelos y compila el puesto antes de recibir documentos"""
+    get_nlp()
+    _worker['job_description'] = job_description
+    _worker['profile'] = get_job_profile(job_description)
+    # Los PDFs largos no abren un segundo pool dentro de cada proceso
+    _worker['processor'] = DocumentProcessor(pdf_workers=1, notify=False)
+    _worker['improver'] = CVImprovementAnalyzer() if improve else None
+
+
+def analyze_document(name: str, data: bytes, file_type: Optional[str]) -> Dict[str, Any]:
+    """Analiza un CV y retorna un registro serializable a JSON"""
+    try:
+        analysis = analyze_cv_bytes(data, file_type, name, _worker['job_description'],
+                                    _worker['profile'], _worker['processor'])
+    except Exception as e:
+        return {'archivo': name, 'success': False, 'error': f"Error analizando: {str(e)}"}
+    if not analysis['success']:
+        return {'archivo': name, 'success': False, 'error': analysis['error']}
+
+    results = analysis['results']
+    record = {
+        'archivo': name,
+        'success': True,
+        'puntuacion_total': results['puntuacion_total'],
+        'desglose_adaptado': results['desglose_adaptado'],
+        'match_detallado': results['match_detallado'],
+        'recomendaciones_especificas': results['recomendaciones_especificas'],
+        'habilidades': {'tecnicas': analysis['skills']['tecnicas'], 'blandas': analysis['skills']['blandas']},
+        'años_experiencia': analysis['experience'].get('años_experiencia', 0),
+        'estadisticas': analysis['doc_stats']
+    }
+    if _worker['improver'] is not None:
+        report = _worker['improver'].generate_improvement_report(analysis['cv_text'], analysis['context'])
+        record['mejora'] = {
+            'overall_score': report['overall_score'],
+            'category_scores': report['category_scores'],
+            'improvement_priority': report['improvement_priority']
+        }
+    return record
+
+
+def run_batch(source: str, job_description: str, jobs: int, improve: bool, output) -> Tuple[int, int]:
+    """Procesa todos los CVs y escribe una línea JSON por CV a medida que terminan"""
+    documents = iter_documents(source)
+    processed = failed = 0
+
+    def emit(record: Dict[str, Any]) -> None:
+        nonlocal processed, failed
+        processed += 1
+        failed += 0 if record['success'] else 1
+        output.write(json.dumps(record, ensure_ascii=False) + '\n')
+        output.flush()
+
+    if jobs <= 1:
+        _init_worker(job_description, improve)
+        for document in documents:
+            emit(analyze_document(*document))
+        return processed, failed
+
+    # spawn: procesos limpios, sin heredar hilos ni locks del proceso principal
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=_init_worker,
+                             initargs=(job_description, improve)) as executor:
+        # Pocos documentos en vuelo: la memoria no crece con el tamaño del lote
+        pending = set()
+        for document in documents:
+            pending.add(executor.submit(analyze_document, *document))
+            if len(pending) >= jobs * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(future.result())
+        for future in wait(pending).done:
+            emit(future.result())
+    return processed, failed
+
+
+def run_entities(source: str, batch_size: int, n_process: int, output) -> Tuple[int, int]:
+    """Empresas e instituciones de todos los CVs con NER por lotes; una línea JSON por CV"""
+    processor = DocumentProcessor(notify=False)
+    names = deque()
+    processed = failed = 0
+
+    def texts() -> Iterator[str]:
+        nonlocal processed, failed
+        for name, data, file_type in iter_documents(source):
+            text, success = processor.extract_text_from_bytes(data, file_type, name)
+            if not success:
+                processed += 1
+                failed += 1
+                output.write(json.dumps({'archivo': name, 'success': False, 'error': text}, ensure_ascii=False) + '\n')
+                continue
+            names.append(name)
+            yield text
+
+    # nlp.pipe conserva el orden de entrada: cada resultado corresponde al nombre más antiguo pendiente
+    for entities in CVAnalyzer().extract_organizations(texts(), batch_size, n_process):
+        processed += 1
+        output.write(json.dumps({'archivo': names.popleft(), 'success': True, **entities}, ensure_ascii=False) + '\n')
+        output.flush()
+    return processed, failed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='analizador_ats', description='Analizador de CVs ATS sin interfaz web')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    batch = subcommands.add_parser('batch', help='Analiza todos los CVs de una carpeta o ZIP (salida JSONL)')
+    batch.add_argument('source', help='Carpeta, archivo .zip o CV individual (PDF, DOCX, TXT)')
+    batch.add_argument('--jd', help='Archivo de texto con la descripción del puesto')
+    batch.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Procesos de análisis en paralelo')
+    batch.add_argument('--output', '-o', help='Archivo JSONL de salida (por defecto, la salida estándar)')
+    batch.add_argument('--improve', action='store_true', help='Incluye el reporte de mejora de cada CV')
+
+    entities = subcommands.add_parser('entidades', help='Empresas e instituciones de todos los CVs con NER por lotes (salida JSONL)')
+    entities.add_argument('source', help='Carpeta, archivo .zip o CV individual (PDF, DOCX, TXT)')
+    entities.add_argument('--batch-size', type=int, default=NER_BATCH_SIZE, help='Textos por lote de nlp.pipe')
+    entities.add_argument('--n-process', type=int, default=1, help='Procesos de spaCy (-1: uno por CPU)')
+    entities.add_argument('--output', '-o', help='Archivo JSONL de salida (por defecto, la salida estándar)')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if not os.path.exists(args.source):
+        print(f"No existe: {args.source}", file=sys.stderr)
+        return 2
+
+    job_description = ""
+    if getattr(args, 'jd', None):
+        with open(args.jd, encoding='utf-8') as jd_file:
+            job_description = jd_file.read()
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.command == 'entidades':
+            processed, failed = run_entities(args.source, max(args.batch_size, 1), args.n_process, output)
+        else:
+            processed, failed = run_batch(args.source, job_description, max(args.jobs, 1), args.improve, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"{processed} CVs procesados, {failed} con errores", file=sys.stderr)
+    return 1 if failed and failed == processed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,291 @@
+# Servicio HTTP del analizador ATS (WSGI)
+#   gunicorn app:app   (la configuración se lee de gunicorn.conf.py)
+import base64
+import binascii
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+from modules.modelos import get_model_stats, is_model_loaded
+from modules.metricas import get_stage_stats
+from modules.arranque import WARMUP_ENABLED, get_warmup_stats, warmup as warmup_models
+from modules.perfil_puesto import get_job_profile
+from modules.procesador import DocumentProcessor
+from modules.mejorador_cv import CVImprovementAnalyzer
+from modules.contexto import AnalysisContext
+from modules.pipeline import (BATCH_WORKERS, analyze_batch, analyze_cv_bytes, analyze_cv_text, get_cache_stats,
+                             get_feature_cache_stats, ranking_rows)
+from modules.ranking import build_index
+
+# Análisis simultáneos por proceso; el resto espera un lugar hasta QUEUE_TIMEOUT
+MAX_CONCURRENCY = int(os.getenv('ATS_HTTP_MAX_CONCURRENCY', '4'))
+QUEUE_TIMEOUT = float(os.getenv('ATS_HTTP_QUEUE_TIMEOUT', '10'))
+
+# Segundos máximos de análisis por petición: al vencer se responde 504
+# (con workers gthread el timeout de gunicorn no corta peticiones lentas)
+REQUEST_TIMEOUT = float(os.getenv('ATS_HTTP_REQUEST_TIMEOUT', '45'))
+
+# Límites de tamaño de las peticiones
+MAX_BODY_BYTES = int(os.getenv('ATS_HTTP_MAX_BODY_MB', '20')) * 1024 * 1024
+MAX_BATCH_DOCUMENTS = int(os.getenv('ATS_HTTP_MAX_BATCH', '200'))
+
+# Un lote analiza en paralelo y ocupa un lugar por cada hilo que usa
+BATCH_SLOTS = max(1, min(BATCH_WORKERS, MAX_CONCURRENCY))
+
+_slots = threading.BoundedSemaphore(max(MAX_CONCURRENCY, 1))
+# Solo una petición a la vez reserva varios lugares: dos lotes no se quedan con la mitad cada uno
+_multi_slot_lock = threading.Lock()
+
+# Hilos que ejecutan los análisis; se crean en cada worker, no en el maestro (los hilos no sobreviven al fork)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class HTTPError(Exception):
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def warmup() -> bool:
+    """Carga modelos y buscadores antes de atender peticiones
+
+    Con preload_app (gunicorn.conf.py) corre una sola vez en el proceso
+    maestro, y los workers comparten esas páginas de memoria tras el fork.
+    """
+    warmup_models()
+    return is_model_loaded()
+
+
+def _acquire_slots(count: int, deadline: float) -> int:
+    """Reserva hasta count lugares antes de deadline; retorna cuántos consiguió"""
+    acquired = 0
+    while acquired < count and _slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+        acquired += 1
+    return acquired
+
+
+def _reserve_slots(count: int = 1) -> int:
+    """Reserva count lugares del límite de concurrencia (varios para peticiones que usan varios hilos)"""
+    deadline = time.monotonic() + QUEUE_TIMEOUT
+    acquired = 0
+    if count == 1:
+        acquired = _acquire_slots(1, deadline)
+    elif _multi_slot_lock.acquire(timeout=QUEUE_TIMEOUT):
+        try:
+            acquired = _acquire_slots(count, deadline)
+        finally:
+            _multi_slot_lock.release()
+    if acquired < count:
+        _release_slots(acquired)
+        raise HTTPError('503 Service Unavailable', "Servicio saturado, reintenta en unos segundos")
+    return acquired
+
+
+def _release_slots(count: int) -> None:
+    for _ in range(count):
+        _slots.release()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(MAX_CONCURRENCY, 1), thread_name_prefix='analisis')
+        return _executor
+
+
+def _run_with_deadline(handler: Callable[[Dict[str, Any], threading.Event], Dict[str, Any]],
+                       payload: Dict[str, Any], slots: int) -> Dict[str, Any]:
+    """Ejecuta el handler en un hilo de análisis y espera a lo sumo REQUEST_TIMEOUT
+
+    Al vencer el plazo responde 504 y activa cancel_event para que el
+    análisis se detenga en su siguiente punto de control; sus lugares se
+    liberan recién cuando el hilo termina.
+    """
+    acquired = _reserve_slots(slots)
+    cancel_event = threading.Event()
+
+    def run() -> Dict[str, Any]:
+        try:
+            return handler(payload, cancel_event)
+        finally:
+            _release_slots(acquired)
+
+    try:
+        future = _get_executor().submit(run)
+    except Exception:
+        _release_slots(acquired)
+        raise
+    try:
+        return future.result(timeout=REQUEST_TIMEOUT)
+    except FutureTimeoutError:
+        cancel_event.set()
+        raise HTTPError('504 Gateway Timeout', f"El análisis superó el límite de {REQUEST_TIMEOUT:g} s")
+
+
+def _read_json(environ) -> Dict[str, Any]:
+    try:
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+    if length > MAX_BODY_BYTES:
+        raise HTTPError('413 Payload Too Large', f"La petición supera {MAX_BODY_BYTES // (1024 * 1024)} MB")
+    try:
+        payload = json.loads(environ['wsgi.input'].read(length) or b'{}')
+    except ValueError:
+        raise HTTPError('400 Bad Request', "El cuerpo debe ser JSON válido")
+    if not isinstance(payload, dict):
+        raise HTTPError('400 Bad Request', "El cuerpo debe ser un objeto JSON")
+    return payload
+
+
+def _decode_document(document: Dict[str, Any]) -> Tuple[str, bytes, Optional[str]]:
+    """(nombre, contenido, tipo) de un documento {"filename", "file" (base64), "file_type"}"""
+    if not isinstance(document, dict) or not document.get('file'):
+        raise HTTPError('400 Bad Request', "Falta 'file' con el documento en base64")
+    try:
+        data = base64.b64decode(document['file'], validate=True)
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPError('400 Bad Request', "'file' no es base64 válido")
+    return document.get('filename', ""), data, document.get('file_type')
+
+
+def _text_field(payload: Dict[str, Any], name: str) -> str:
+    """Campo de texto opcional del JSON ("" si falta)"""
+    value = payload.get(name) or ""
+    if not isinstance(value, str):
+        raise HTTPError('400 Bad Request', f"'{name}' debe ser texto")
+    return value
+
+
+def _cv_text(payload: Dict[str, Any], processor: DocumentProcessor, cancel_event: threading.Event) -> str:
+    """Texto del CV: 'cv_text' directo o extraído del documento"""
+    if _text_field(payload, 'cv_text'):
+        return payload['cv_text']
+    name, data, file_type = _decode_document(payload)
+    text, success = processor.extract_text_from_bytes(data, file_type, name, cancel_event)
+    if not success:
+        raise HTTPError('422 Unprocessable Entity', text)
+    return text
+
+
+def _analysis(payload: Dict[str, Any]) -> Dict[str, Any]:
+    job_description = _text_field(payload, 'job_description')
+    profile = get_job_profile(job_description)
+    if _text_field(payload, 'cv_text'):
+        return analyze_cv_text(payload['cv_text'], job_description, profile)
+    name, data, file_type = _decode_document(payload)
+    analysis = analyze_cv_bytes(data, file_type, name, job_description, profile, DocumentProcessor(notify=False))
+    if not analysis['success']:
+        raise HTTPError('422 Unprocessable Entity', analysis['error'])
+    return analysis
+
+
+def extract(payload: Dict[str, Any], cancel_event: threading.Event) -> Dict[str, Any]:
+    processor = DocumentProcessor(notify=False)
+    text = _cv_text(payload, processor, cancel_event)
+    return {'text': text, 'stats': processor.get_document_stats(text)}
+
+
+def analyze(payload: Dict[str, Any], cancel_event: threading.Event) -> Dict[str, Any]:
+    analysis = _analysis(payload)
+    return {key: value for key, value in analysis.items() if key not in ('context', 'cv_text', 'success')}
+
+
+def score(payload: Dict[str, Any], cancel_event: threading.Event) -> Dict[str, Any]:
+    return _analysis(payload)['results']
+
+
+def improve(payload: Dict[str, Any], cancel_event: threading.Event) -> Dict[str, Any]:
+    text = _cv_text(payload, DocumentProcessor(notify=False), cancel_event)
+    return CVImprovementAnalyzer().generate_improvement_report(text, AnalysisContext(text))
+
+
+def batch(payload: Dict[str, Any], cancel_event: threading.Event) -> Dict[str, Any]:
+    documents = payload.get('documents') or []
+    if not isinstance(documents, list) or not documents:
+        raise HTTPError('400 Bad Request', "Falta 'documents' con la lista de CVs")
+    if len(documents) > MAX_BATCH_DOCUMENTS:
+        raise HTTPError('413 Payload Too Large', f"Máximo {MAX_BATCH_DOCUMENTS} documentos por lote")
+    job_description = _text_field(payload, 'job_description')
+    profile = get_job_profile(job_description)
+    top_k = payload.get('top_k')
+    # Solo se extraen características: el índice de candidatos puntúa el lote y elige los top_k
+    batch_items = analyze_batch([_decode_document(document) for document in documents],
+                                max_workers=BATCH_SLOTS, cancel_event=cancel_event, features_only=True)
+    index, _ = build_index(batch_items)
+    return {'ranking': ranking_rows(index, profile, top_k if isinstance(top_k, int) and top_k > 0 else None)}
+
+
+# Cada handler recibe el JSON y el evento que se activa al vencer REQUEST_TIMEOUT
+ROUTES: Dict[str, Callable[[Dict[str, Any], threading.Event], Dict[str, Any]]] = {
+    '/extract': extract,
+    '/analyze': analyze,
+    '/score': score,
+    '/improve': improve,
+    '/batch': batch
+}
+
+# Lugares del límite de concurrencia que ocupa cada ruta
+ROUTE_SLOTS: Dict[str, int] = {'/batch': BATCH_SLOTS}
+
+
+def _respond(start_response, status: str, body: Dict[str, Any], extra_headers=()):
+    content = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+    headers = [('Content-Type', 'application/json; charset=utf-8'), ('Content-Length', str(len(content)))]
+    start_response(status, headers + list(extra_headers))
+    return [content]
+
+
+def app(environ, start_response):
+    """Aplicación WSGI: JSON de entrada y salida"""
+    method = environ.get('REQUEST_METHOD', 'GET')
+    path = environ.get('PATH_INFO', '/').rstrip('/') or '/'
+
+    if method == 'GET' and path == '/health':
+        return _respond(start_response, '200 OK', {'status': 'ok'})
+    if method == 'GET' and path == '/ready':
+        # Listo cuando el modelo está en memoria, lo haya cargado la precarga o un análisis
+        ready = is_model_loaded()
+        return _respond(start_response, '200 OK' if ready else '503 Service Unavailable', {
+            'ready': ready,
+            'models': get_model_stats(),
+            'analysis_cache': get_cache_stats(),
+            'feature_cache': get_feature_cache_stats(),
+            'warmup': get_warmup_stats()
+        })
+    if method == 'GET' and path == '/metrics':
+        # Percentiles por etapa de este worker (cada proceso mide por separado)
+        return _respond(start_response, '200 OK', {'pid': os.getpid(), 'stages': get_stage_stats()})
+
+    handler = ROUTES.get(path)
+    if handler is None:
+        return _respond(start_response, '404 Not Found', {'error': f"Ruta desconocida: {path}"})
+    if method != 'POST':
+        return _respond(start_response, '405 Method Not Allowed', {'error': "Usa POST"}, [('Allow', 'POST')])
+
+    try:
+        payload = _read_json(environ)
+        return _respond(start_response, '200 OK', _run_with_deadline(handler, payload, ROUTE_SLOTS.get(path, 1)))
+    except HTTPError as e:
+        extra_headers = [('Retry-After', '5')] if e.status.startswith('503') else []
+        return _respond(start_response, e.status, {'error': e.message}, extra_headers)
+    except Exception as e:
+        print(f"Error atendiendo {path}: {e}")
+        return _respond(start_response, '500 Internal Server Error', {'error': "Error interno del analizador"})
+
+
+if WARMUP_ENABLED:
+    warmup()
+
+
+if __name__ == "__main__":
+    # Servidor de desarrollo (un solo proceso); en producción usar gunicorn
+    from wsgiref.simple_server import make_server
+    port = int(os.getenv('PORT', '8000'))
+    print(f"Analizador ATS escuchando en http://localhost:{port}")
+    make_server('', port, app).serve_forever()
\ No newline at end of file
@@ -0,0 +1,228 @@
+# Generador reproducible de CVs y descripciones de puesto sintéticos en español
+import io
+import os
+import random
+from typing import List, NamedTuple, Optional
+import PyPDF2
+from docx import Document
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TXT_MIME = "text/plain"
+
+# Tamaños del corpus en palabras (a ~500 palabras por página: de 1 a 40 páginas)
+DEFAULT_SIZES = (200, 1000, 5000, 20000)
+DEFAULT_FORMATS = ('txt', 'docx', 'pdf')
+
+# CV real incluido en el repositorio
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'temp_file')
+
+# Líneas por página del PDF generado (Helvetica 10 pt en A4: 20k palabras ≈ 40 páginas)
+PDF_LINES_PER_PAGE = 50
+
+NOMBRES = ['María', 'José', 'Ana', 'Carlos', 'Lucía', 'Diego', 'Sofía', 'Javier', 'Valentina', 'Andrés', 'Gabriela', 'Luis']
+APELLIDOS = ['García', 'Rodríguez', 'López', 'Martínez', 'Pérez', 'Gómez', 'Hernández', 'Ramírez', 'Torres', 'Flores']
+CIUDADES = ['Guatemala', 'Ciudad de México', 'Bogotá', 'Lima', 'Madrid', 'Santiago', 'Quito', 'San José']
+EMPRESAS = ['Soluciones Andinas S.A.', 'TecnoRed', 'Banco Regional', 'Grupo Comercial del Sur', 'DataLatam',
+            'Ministerio de Finanzas', 'Logística Express', 'Clínica Santa Fe', 'Consultora Horizonte']
+PUESTOS = ['Desarrollador Backend', 'Analista de Datos', 'Ingeniero DevOps', 'Gerente de Proyectos',
+           'Desarrollador Full Stack', 'Científico de Datos', 'Administrador de Sistemas', 'Analista Financiero',
+           'Coordinador de Marketing', 'Especialista en Seguridad']
+TECNICAS = ['Python', 'Java', 'JavaScript', 'TypeScript', 'SQL', 'PostgreSQL', 'MongoDB', 'React', 'Angular',
+            'Django', 'Flask', 'FastAPI', 'Spring', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'Git', 'Jenkins',
+            'CI/CD', 'Scrum', 'Jira', 'Machine Learning', 'TensorFlow', 'Pandas', 'NumPy', 'Power BI', 'Excel',
+            'SAP', 'Linux', 'REST', 'GraphQL', 'microservicios']
+BLANDAS = ['liderazgo', 'trabajo en equipo', 'comunicación', 'resolución de problemas', 'pensamiento crítico',
+           'adaptabilidad', 'gestión del tiempo', 'organización', 'negociación', 'proactividad', 'creatividad']
+VERBOS = ['Desarrollé', 'Implementé', 'Lideré', 'Diseñé', 'Optimicé', 'Coordiné', 'Automaticé', 'Gestioné',
+          'Reduje', 'Incrementé', 'Mejoré', 'Migré', 'Supervisé', 'Analicé']
+OBJETOS = ['el sistema de facturación', 'la plataforma de pagos', 'los reportes gerenciales', 'la API de clientes',
+           'el proceso de despliegue', 'la base de datos de inventario', 'el portal de empleados',
+           'los tableros de indicadores', 'la integración con proveedores', 'el módulo de seguridad']
+RESULTADOS = ['reduciendo los tiempos de respuesta en {n}%', 'con un ahorro de ${m} anuales',
+              'para un equipo de {k} personas', 'mejorando la satisfacción del cliente en {n}%',
+              'atendiendo a más de {m} usuarios', 'en coordinación con las áreas de negocio']
+INSTITUCIONES = ['Universidad de San Carlos', 'Universidad Nacional', 'Universidad del Valle', 'Instituto Tecnológico',
+                 'Universidad Complutense', 'Universidad de los Andes']
+TITULOS = ['Ingeniería en Sistemas', 'Licenciatura en Administración', 'Maestría en Ciencia de Datos',
+           'Ingeniería Industrial', 'Licenciatura en Economía', 'Especialización en Seguridad Informática']
+CERTIFICACIONES = ['Certificación AWS Solutions Architect', 'Diplomado en Gestión de Proyectos', 'Curso de Scrum Master',
+                   'Certificado en Power BI', 'Bootcamp de Desarrollo Web', 'Capacitación en ISO 27001']
+IDIOMAS = ['Español nativo', 'Inglés avanzado', 'Inglés intermedio', 'Portugués básico', 'Francés básico']
+
+
+class CorpusDocument(NamedTuple):
+    name: str
+    data: bytes
+    file_type: str
+    words: int
+    pages: int
+
+
+def _achievement(rng: random.Random) -> str:
+    result = rng.choice(RESULTADOS).format(n=rng.randint(5, 60), m=rng.randint(10, 900) * 100, k=rng.randint(3, 25))
+    return f"• {rng.choice(VERBOS)} {rng.choice(OBJETOS)} con {rng.choice(TECNICAS)}, {result}."
+
+
+def generate_cv(rng: random.Random, target_words: int) -> str:
+    """Texto de un CV en español con aproximadamente target_words palabras"""
+    name = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}"
+    user = name.split()[0].lower().replace('í', 'i').replace('é', 'e').replace('á', 'a').replace('ó', 'o')
+    years = rng.randint(2, 20)
+    lines = [
+        name.upper(),
+        rng.choice(PUESTOS),
+        f"{rng.choice(CIUDADES)} | {user}.{rng.randint(1, 99)}@correo.com | +502 {rng.randint(3000, 5999)} {rng.randint(1000, 9999)}",
+        f"linkedin.com/in/{user}{rng.randint(100, 999)} | https://github.com/{user}",
+        "",
+        "PERFIL PROFESIONAL",
+        f"Profesional con {years} años de experiencia en {rng.choice(PUESTOS).lower()}, orientado a resultados "
+        f"y con dominio de {', '.join(rng.sample(TECNICAS, 3))}. Destaco por mi {rng.choice(BLANDAS)} y {rng.choice(BLANDAS)}.",
+        "",
+        "EXPERIENCIA LABORAL"
+    ]
+
+    end_year = 2024
+    words = sum(len(line.split()) for line in lines)
+    # Bloques de experiencia hasta alcanzar el tamaño pedido (dejando lugar para el resto de secciones)
+    while words < target_words - 120:
+        start_year = end_year - rng.randint(1, 4)
+        end = 'Actual' if end_year == 2024 else str(end_year)
+        block = [
+            "",
+            f"{rng.choice(PUESTOS)} - {rng.choice(EMPRESAS)}",
+            f"{start_year} - {end}"
+        ]
+        block += [_achievement(rng) for _ in range(rng.randint(3, 7))]
+        lines += block
+        words += sum(len(line.split()) for line in block)
+        end_year = start_year if start_year > 1970 else 2024
+
+    graduation = rng.randint(1995, 2020)
+    lines += [
+        "",
+        "EDUCACIÓN",
+        f"{rng.choice(TITULOS)} - {rng.choice(INSTITUCIONES)}",
+        f"{graduation - 5} - {graduation}",
+        f"{rng.choice(CERTIFICACIONES)} ({rng.randint(2015, 2024)})",
+        "",
+        "HABILIDADES",
+        f"Técnicas: {', '.join(rng.sample(TECNICAS, 8))}",
+        f"Blandas: {', '.join(rng.sample(BLANDAS, 4))}",
+        "",
+        "IDIOMAS",
+        ", ".join(rng.sample(IDIOMAS, 2))
+    ]
+    return "\n".join(lines)
+
+
+def generate_job_description(rng: random.Random, paragraphs: int = 3) -> str:
+    """Descripción de puesto con requisitos de experiencia, educación, habilidades e idiomas"""
+    puesto = rng.choice(PUESTOS)
+    lines = [
+        f"Buscamos {puesto} {rng.choice(['Junior', 'Semi Senior', 'Senior'])} para {rng.choice(EMPRESAS)}.",
+        f"Requisitos: {rng.randint(1, 8)} años de experiencia en puestos similares.",
+        f"Experiencia con {', '.join(rng.sample(TECNICAS, 5))}.",
+        f"Se valorará {rng.choice(BLANDAS)}, {rng.choice(BLANDAS)} y {rng.choice(BLANDAS)}.",
+        f"Educación: {rng.choice(TITULOS)} o carrera afín. {rng.choice(['Inglés avanzado', 'Inglés intermedio'])}.",
+        f"Contrato {rng.choice(['tiempo completo', 'remoto', 'híbrido'])} en el sector {rng.choice(['financiero', 'tecnología', 'salud', 'retail'])}."
+    ]
+    for _ in range(max(paragraphs - 1, 0)):
+        lines.append(f"Responsabilidades: {rng.choice(VERBOS).lower()} {rng.choice(OBJETOS)} usando {rng.choice(TECNICAS)}.")
+    return "\n".join(lines)
+
+
+def to_docx(text: str) -> bytes:
+    """Documento Word con un párrafo por línea"""
+    document = Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_string(line: str) -> bytes:
+    encoded = line.encode('cp1252', errors='replace')
+    return b'(' + encoded.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def to_pdf(text: str, lines_per_page: int = PDF_LINES_PER_PAGE) -> bytes:
+    """PDF con capa de texto (Helvetica, WinAnsi), sin dependencias externas"""
+    lines = []
+    for line in text.split('\n'):
+        # Líneas largas partidas a ~95 caracteres para que quepan en la página
+        while len(line) > 95:
+            cut = line.rfind(' ', 0, 95)
+            cut = cut if cut > 0 else 95
+            lines.append(line[:cut])
+            line = line[cut:].lstrip()
+        lines.append(line)
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Objetos: 1 catálogo, 2 páginas, 3 fuente, luego (página, contenido) por cada página
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    }
+    kids = []
+    for index, page_lines in enumerate(pages):
+        page_id, content_id = 4 + index * 2, 5 + index * 2
+        kids.append(f"{page_id} 0 R".encode())
+        stream = b"BT /F1 10 Tf 12 TL 50 800 Td " + b" ".join(_pdf_string(line) + b" '" for line in page_lines) + b" ET"
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        objects[page_id] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+    objects[2] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % len(pages)
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = output.tell()
+        output.write(b"%d 0 obj\n" % object_id + objects[object_id] + b"\nendobj\n")
+    xref = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for object_id in sorted(objects):
+        output.write(b"%010d 00000 n \n" % offsets[object_id])
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+def build_corpus(seed: int = 42, sizes=DEFAULT_SIZES, formats=DEFAULT_FORMATS,
+                 include_sample: bool = True) -> List[CorpusDocument]:
+    """Un CV por tamaño y formato, idéntico entre ejecuciones con la misma semilla"""
+    documents = []
+    for size in sizes:
+        text = generate_cv(random.Random(f"{seed}-{size}"), size)
+        words = len(text.split())
+        pdf = to_pdf(text)
+        # Páginas que ocuparía impreso, en cualquier formato
+        pages = pdf_page_count(pdf)
+        for file_format in formats:
+            if file_format == 'txt':
+                data, file_type = text.encode('utf-8'), TXT_MIME
+            elif file_format == 'docx':
+                data, file_type = to_docx(text), DOCX_MIME
+            else:
+                data, file_type = pdf, PDF_MIME
+            documents.append(CorpusDocument(f"cv-{size}w.{file_format}", data, file_type, words, pages))
+
+    sample = load_sample() if include_sample else None
+    if sample is not None:
+        documents.append(sample)
+    return documents
+
+
+def load_sample() -> Optional[CorpusDocument]:
+    """El CV de ejemplo del repositorio (temp_file), si existe"""
+    if not os.path.exists(SAMPLE_PDF):
+        return None
+    with open(SAMPLE_PDF, 'rb') as sample:
+        data = sample.read()
+    # Las palabras se conocen recién al extraer el texto
+    return CorpusDocument('temp_file.pdf', data, PDF_MIME, 0, pdf_page_count(data))
+
+
+def pdf_page_count(data: bytes) -> int:
+    return len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
\ No newline at end of file
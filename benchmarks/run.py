@@ -0,0 +1,265 @@
+# Benchmark reproducible del analizador
+#   python -m benchmarks.run -o base.json                 # mide y guarda la línea base
+#   python -m benchmarks.run --compare base.json          # mide y marca regresiones contra base.json
+# Termina con error si hay regresiones o si el índice de candidatos no puntúa igual que ATSScorer
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Sin cachés de disco ni registro de métricas: se mide el trabajo real de cada ejecución
+os.environ.setdefault('ATS_EXTRACTION_CACHE', '0')
+os.environ['ATS_METRICS_LOG'] = ''
+
+from benchmarks.corpus import DEFAULT_FORMATS, DEFAULT_SIZES, TXT_MIME, build_corpus, generate_job_description
+from modules.modelos import get_nlp
+from modules.procesador import DocumentProcessor
+from modules.analizador import CVAnalyzer
+from modules.puntuador import ATSScorer
+from modules.mejorador_cv import CVImprovementAnalyzer
+from modules.perfil_puesto import JobDescriptionAnalyzer, JobProfile, get_job_profile
+from modules.pipeline import RULESET_VERSION, analyze_cv_text, cv_features_from_text, score_cv_features
+from modules.ranking import CandidateIndex
+
+# Una medición es regresión si es REGRESSION_THRESHOLD veces más lenta y además
+# la diferencia supera MIN_DELTA_MS (evita falsas alarmas en métodos de microsegundos)
+REGRESSION_THRESHOLD = 1.25
+MIN_DELTA_MS = 0.5
+
+# Puesto y CVs con los casos límite del buscador: separadores, guiones, símbolos y plurales
+PARITY_PROFILE = JobProfile(job_hash='paridad', has_description=True,
+                            keywords=('desarrollo web', 'semi-senior', 'c++', 'base datos', 'node.js', 'api rest'),
+                            required_skills=(('lenguajes', ('python', 'c++')),), years_required=3)
+PARITY_TEXTS = (
+    "Desarrollo web semi-senior con C++, Node.js y API REST. 4 años de experiencia en Python.",
+    "Desarrollo\nweb, semi senior, base  datos, c+, nodes.js y apis rest",
+    "Desarrollos web; bases datos; node.jsx; c++11; semi-seniors",
+    "desarrollo-web base_datos api-rest"
+)
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Mediana y mínimo de repeat llamadas (tras una de calentamiento) y pico de memoria"""
+    function()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+
+    # El pico se mide aparte: tracemalloc enlentece la ejecución
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'median_ms': round(statistics.median(durations) * 1000, 3),
+        'min_ms': round(min(durations) * 1000, 3),
+        'peak_kb': round(peak / 1024, 1)
+    }
+
+
+def text_benchmarks(job_description: str) -> Dict[str, Callable[[str], Callable[[], Any]]]:
+    """Métodos públicos que reciben el texto del CV; cada llamada arma su propio contexto"""
+    processor = DocumentProcessor(notify=False, use_cache=False)
+    analyzer = CVAnalyzer()
+    improver = CVImprovementAnalyzer()
+    profile = get_job_profile(job_description)
+    scorer = ATSScorer(job_description, profile)
+
+    def score(text: str) -> Callable[[], Any]:
+        # Las entradas del puntuador se calculan una vez, fuera de la medición
+        inputs = (analyzer.extract_skills(text), analyzer.extract_experience(text),
+                  analyzer.extract_education(text), analyzer.extract_contact_info(text))
+        return lambda: scorer.calculate_adaptive_score(text, *inputs)
+
+    return {
+        'procesador.get_document_stats': lambda text: lambda: processor.get_document_stats(text),
+        'analizador.extract_skills': lambda text: lambda: analyzer.extract_skills(text),
+        'analizador.extract_experience': lambda text: lambda: analyzer.extract_experience(text),
+        'analizador.extract_education': lambda text: lambda: analyzer.extract_education(text),
+        'analizador.extract_contact_info': lambda text: lambda: analyzer.extract_contact_info(text),
+        'analizador.analyze_text_quality': lambda text: lambda: analyzer.analyze_text_quality(text),
+        'puntuador.calculate_adaptive_score': score,
+        'mejorador_cv.analyze_structure': lambda text: lambda: improver.analyze_structure(text),
+        'mejorador_cv.analyze_content_quality': lambda text: lambda: improver.analyze_content_quality(text),
+        'mejorador_cv.analyze_formatting': lambda text: lambda: improver.analyze_formatting(text),
+        'mejorador_cv.analyze_data_completeness': lambda text: lambda: improver.analyze_data_completeness(text),
+        'mejorador_cv.generate_improvement_report': lambda text: lambda: improver.generate_improvement_report(text),
+        'pipeline.analyze_cv_text': lambda text: lambda: analyze_cv_text(text, job_description, profile)
+    }
+
+
+def ranking_parity(texts: List[str], profiles: List[JobProfile]) -> List[Dict[str, Any]]:
+    """Diferencias entre CandidateIndex.score y ATSScorer.calculate_adaptive_score sobre los mismos CVs"""
+    analyses = [cv_features_from_text(text) for text in texts]
+    index = CandidateIndex()
+    for position, analysis in enumerate(analyses):
+        index.add(str(position), analysis)
+
+    mismatches = []
+    for profile in profiles:
+        scores = index.score(profile)
+        for position, analysis in enumerate(analyses):
+            results = score_cv_features(analysis, profile=profile)['results']
+            expected = {**results['desglose_adaptado'], 'puntuacion_total': results['puntuacion_total']}
+            for category, value in expected.items():
+                actual = float(scores[category][position])
+                if category == 'puntuacion_total':
+                    actual = round(actual, 1)
+                if abs(actual - value) > 1e-6:
+                    mismatches.append({'job_hash': profile.job_hash, 'cv': position, 'category': category,
+                                       'scorer': value, 'index': actual})
+    return mismatches
+
+
+def run(seed: int, sizes, formats, repeat: int, only: Optional[str] = None,
+        log: Callable[[str], None] = lambda line: None) -> Dict[str, Any]:
+    """Ejecuta todo el benchmark y retorna el documento JSON de resultados"""
+    started = time.time()
+    nlp = get_nlp()
+    corpus = build_corpus(seed, sizes, formats)
+    job_description = generate_job_description(random.Random(seed))
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def record(key: str, function: Callable[[], Any], words: int, size_bytes: int, pages: int) -> None:
+        if only and only not in key:
+            return
+        result = measure(function, repeat)
+        seconds = result['median_ms'] / 1000
+        result.update(
+            words=words,
+            bytes=size_bytes,
+            pages=pages,
+            words_per_s=round(words / seconds) if seconds else None,
+            mb_per_s=round(size_bytes / (1024 * 1024) / seconds, 2) if seconds else None
+        )
+        results[key] = result
+        log(f"{key:<60} {result['median_ms']:>10.2f} ms {result['peak_kb']:>10.0f} KB")
+
+    # Extracción: todos los formatos
+    processor = DocumentProcessor(notify=False, use_cache=False)
+    texts: List[Tuple[str, str, int]] = []
+    for document in corpus:
+        text, success = processor.extract_text_from_bytes(document.data, document.file_type, document.name)
+        if not success:
+            log(f"⚠️ {document.name}: {text}")
+            continue
+        words = len(text.split())
+        record(f"procesador.extract_text_from_bytes@{document.name}",
+               lambda document=document: processor.extract_text_from_bytes(document.data, document.file_type, document.name),
+               words, len(document.data), document.pages)
+        # El análisis no depende del formato: basta un texto por tamaño y el CV de ejemplo
+        if document.file_type == TXT_MIME or document.name == 'temp_file.pdf':
+            texts.append((os.path.splitext(document.name)[0], text, document.pages))
+
+    # Compilación de la descripción de puesto
+    record("perfil_puesto.compile@jd", lambda: JobDescriptionAnalyzer().compile(job_description),
+           len(job_description.split()), len(job_description.encode('utf-8')), 1)
+
+    # Métodos sobre texto
+    for name, factory in text_benchmarks(job_description).items():
+        for label, text, pages in texts:
+            record(f"{name}@{label}", factory(text), len(text.split()), len(text.encode('utf-8')), pages)
+
+    # Paridad del ranking por lotes con la puntuación individual
+    parity_texts = [text for _, text, _ in texts] + list(PARITY_TEXTS)
+    mismatches = ranking_parity(parity_texts, [get_job_profile(job_description), PARITY_PROFILE])
+    for mismatch in mismatches:
+        log(f"⚠️ Ranking distinto de ATSScorer: {mismatch}")
+
+    return {
+        'meta': {
+            'timestamp': round(started),
+            'duration_s': round(time.time() - started, 1),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'sizes': list(sizes),
+            'formats': list(formats),
+            'repeat': repeat,
+            'ruleset_version': RULESET_VERSION,
+            'spacy_model': nlp is not None
+        },
+        'ranking_mismatches': mismatches,
+        'results': results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = REGRESSION_THRESHOLD,
+            min_delta_ms: float = MIN_DELTA_MS) -> List[Dict[str, Any]]:
+    """Mediciones presentes en ambas corridas, con su razón de tiempo y si son regresión"""
+    rows = []
+    for key, result in current['results'].items():
+        previous = baseline['results'].get(key)
+        if previous is None:
+            continue
+        ratio = result['median_ms'] / previous['median_ms'] if previous['median_ms'] else float('inf')
+        rows.append({
+            'key': key,
+            'baseline_ms': previous['median_ms'],
+            'current_ms': result['median_ms'],
+            'ratio': round(ratio, 2),
+            'peak_kb_ratio': round(result['peak_kb'] / previous['peak_kb'], 2) if previous.get('peak_kb') else None,
+            'regression': ratio > threshold and result['median_ms'] - previous['median_ms'] > min_delta_ms
+        })
+    return sorted(rows, key=lambda row: row['ratio'], reverse=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='benchmarks.run', description='Benchmark reproducible del analizador ATS')
+    parser.add_argument('--output', '-o', help='Archivo JSON donde guardar los resultados (línea base)')
+    parser.add_argument('--compare', help='Resultados previos contra los que buscar regresiones')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='Razón de tiempo a partir de la cual se marca una regresión')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por medición (se reporta la mediana)')
+    parser.add_argument('--seed', type=int, default=42, help='Semilla del corpus sintético')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='Tamaños de CV en palabras')
+    parser.add_argument('--formats', nargs='+', default=list(DEFAULT_FORMATS), choices=DEFAULT_FORMATS)
+    parser.add_argument('--only', help='Mide solo las claves que contienen este texto')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    log = lambda line: print(line, file=sys.stderr)
+
+    current = run(args.seed, args.sizes, args.formats, max(args.repeat, 1), args.only, log)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(current, output, ensure_ascii=False, indent=2)
+        log(f"Resultados guardados en {args.output}")
+
+    if current['ranking_mismatches']:
+        log(f"{len(current['ranking_mismatches'])} puntuaciones del índice de candidatos difieren de ATSScorer")
+        return 1
+    if not args.compare:
+        return 0
+
+    with open(args.compare, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline['meta'].get('spacy_model') != current['meta']['spacy_model']:
+        log("⚠️ La línea base se midió con otra disponibilidad del modelo spaCy: los tiempos no son comparables")
+
+    rows = compare(current, baseline, args.threshold)
+    regressions = [row for row in rows if row['regression']]
+    log(f"\n{'medición':<60} {'base ms':>10} {'actual ms':>10} {'razón':>7}")
+    for row in rows:
+        flag = "  ← REGRESIÓN" if row['regression'] else ""
+        log(f"{row['key']:<60} {row['baseline_ms']:>10.2f} {row['current_ms']:>10.2f} {row['ratio']:>7.2f}{flag}")
+    log(f"\n{len(regressions)} regresiones de {len(rows)} mediciones comparadas (umbral {args.threshold}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,15 @@
+import streamlit as st
+
+# st.fragment (Streamlit >= 1.37) o su versión experimental (1.33 a 1.36)
+_st_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+FRAGMENTS_AVAILABLE = _st_fragment is not None
+
+
+def fragment(function=None, *, run_every=None):
+    """Decorador st.fragment; en versiones sin fragmentos la función se ejecuta con la página"""
+    def decorator(function):
+        if _st_fragment is None:
+            return function
+        return _st_fragment(function, run_every=run_every)
+    return decorator(function) if function is not None else decorator
\ No newline at end of file
@@ -23,6 +23,14 @@ def navbar(current_page_name):
             "target": "pages/2_📊_analisis_ATS.py"
         }
 
+    # Panel de rendimiento solo para ADMIN (misma regla que require_role en la página)
+    if user_role == "admin":
+        PAGES["rendimiento"] = {
+            "icon": "⏱️",
+            "label": "Rendimiento",
+            "target": "pages/3_⏱️_rendimiento.py"
+        }
+
     # +1 columna para botón logout
     columns = st.columns(len(PAGES) + 1)
 
@@ -0,0 +1,87 @@
+import time
+import streamlit as st
+from typing import Any, Callable, Optional
+from modules.trabajos import CANCELLED, FAILED, Job, get_job, submit_job
+from components.fragmentos import FRAGMENTS_AVAILABLE, fragment
+
+# Segundos entre consultas del avance de un trabajo
+POLL_SECONDS = 0.75
+
+
+def session_job(slot: str, key: Any, start: Callable[[], Job]) -> Job:
+    """Trabajo de la sesión para la entrada key; lo lanza con start() si no existe
+
+    Si la entrada cambió (otro archivo u otro puesto) el trabajo anterior se cancela.
+    """
+    state_key = f"trabajo_{slot}"
+    job = get_job(st.session_state.get(state_key))
+    if job is not None and job.key == key:
+        return job
+    if job is not None:
+        job.cancel()
+    job = start()
+    job.key = key
+    st.session_state[state_key] = job.id
+    return job
+
+
+def forget_job(slot: str) -> None:
+    """Descarta el trabajo de la sesión: el próximo rerun lanza uno nuevo"""
+    st.session_state.pop(f"trabajo_{slot}", None)
+
+
+def _render_progress(job: Job, label: str, render_partial: Optional[Callable[[Any], None]]) -> None:
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        st.progress(job.progress, text=f"{label} · {job.message or 'en cola...'} ({job.elapsed:.0f} s)")
+    with col2:
+        if st.button("✖️ Cancelar", key=f"cancelar_{job.id}", use_container_width=True):
+            job.cancel()
+    if render_partial is not None and job.partial:
+        render_partial(job.partial)
+
+
+def wait_for_job(job: Job, label: str, render_partial: Optional[Callable[[Any], None]] = None) -> bool:
+    """Muestra el avance hasta que el trabajo termine; retorna True si ya terminó
+
+    El script no espera al análisis: el avance se refresca en un fragmento
+    (o recargando la página) y, al terminar, se vuelve a ejecutar la página
+    completa para mostrar el resultado.
+    """
+    if job.done:
+        return True
+
+    if FRAGMENTS_AVAILABLE:
+        @fragment(run_every=POLL_SECONDS)
+        def progress():
+            if job.done:
+                st.rerun()
+            _render_progress(job, label, render_partial)
+        progress()
+    else:
+        _render_progress(job, label, render_partial)
+        time.sleep(POLL_SECONDS)
+        st.rerun()
+    return False
+
+
+def render_job_outcome(job: Job, slot: str) -> bool:
+    """Avisos de trabajos cancelados o fallidos; retorna True si hay un resultado para mostrar"""
+    if job.status == CANCELLED:
+        st.warning("⏹️ Análisis cancelado")
+        if st.button("🔄 Volver a analizar", key=f"reintentar_{slot}"):
+            forget_job(slot)
+            st.rerun()
+        return False
+    if job.status == FAILED:
+        st.error(f"❌ Error en el análisis: {job.error}")
+        if st.button("🔄 Reintentar", key=f"reintentar_{slot}"):
+            forget_job(slot)
+            st.rerun()
+        return False
+    return True
+
+
+def background(slot: str, key: Any, kind: str, function: Callable[..., Any], *args) -> Job:
+    """session_job que ejecuta function(job, *args) en el pool de trabajos"""
+    return session_job(slot, key, lambda: submit_job(kind, function, *args, key=key))
\ No newline at end of file
@@ -0,0 +1,30 @@
+# Configuración de gunicorn para el servicio HTTP (app.py)
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# El maestro importa app.py (y carga spaCy) antes de crear los workers:
+# el modelo queda en páginas compartidas copy-on-write entre procesos
+preload_app = True
+
+workers = int(os.getenv('WEB_CONCURRENCY', str(multiprocessing.cpu_count() + 1)))
+worker_class = 'gthread'
+threads = int(os.getenv('ATS_HTTP_THREADS', '4'))
+
+# Un worker que no responde en este tiempo se reinicia; con gthread no limita
+# la duración de cada petición: eso lo hace ATS_HTTP_REQUEST_TIMEOUT en app.py
+timeout = int(os.getenv('ATS_HTTP_TIMEOUT', '60'))
+graceful_timeout = 30
+keepalive = 5
+
+# Reciclar workers acota el crecimiento de las cachés en memoria
+max_requests = int(os.getenv('ATS_HTTP_MAX_REQUESTS', '2000'))
+max_requests_jitter = max_requests // 10
+
+
+def when_ready(server):
+    # Congelar los objetos ya cargados evita que el GC de cada worker
+    # toque (y copie) las páginas compartidas del modelo
+    gc.freeze()
\ No newline at end of file
@@ -5,6 +5,10 @@ require_auth()
 user_info = get_current_user()
 from style import aplicar_estilo_principal, crear_header, crear_tarjeta
 from components.navbar_superior import navbar
+from modules.arranque import start_background_warmup
+
+# La portada no analiza nada: aprovecha para precargar modelos en segundo plano
+start_background_warmup()
 
 st.set_page_config(
     page_title="Sistema de Análisis de CVs",
@@ -0,0 +1,82 @@
+import importlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Precarga de modelos al arrancar el servidor (ATS_WARMUP=0 la desactiva)
+WARMUP_ENABLED = os.getenv('ATS_WARMUP', '1') != '0'
+
+# Bibliotecas que solo necesitan las funciones que las usan; la precarga las importa por adelantado
+LIBRARY_IMPORTS = ('spacy', 'PyPDF2', 'docx')
+UI_IMPORTS = ('pandas', 'plotly.graph_objects', 'plotly.express')
+
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_stats: Dict[str, Any] = {'status': 'pendiente', 'steps': {}, 'total_seconds': None}
+
+
+def _build_steps() -> List[Tuple[str, Callable[[], Any]]]:
+    # Los módulos del analizador se importan aquí para que importar arranque no cargue nada
+    from modules.modelos import get_nlp
+    from modules.perfil_puesto import get_job_profile
+    from modules.procesador import DocumentProcessor
+    from modules.analizador import CVAnalyzer
+    from modules.mejorador_cv import CVImprovementAnalyzer
+
+    return [
+        ('modelo.spacy', get_nlp),
+        ('buscadores.analizador', CVAnalyzer),
+        ('buscadores.mejorador', CVImprovementAnalyzer),
+        ('perfil_puesto', lambda: get_job_profile("")),
+        # Sin caché de extracción: su conexión SQLite no puede heredarse al hacer fork (preload_app de gunicorn);
+        # cada proceso la abre al extraer el primer documento
+        ('procesador', lambda: DocumentProcessor(notify=False, use_cache=False))
+    ]
+
+
+def warmup(include_ui: bool = False) -> Dict[str, Any]:
+    """Importa bibliotecas pesadas, carga el modelo y compila los buscadores; retorna los tiempos
+
+    Cada paso falla por separado: una biblioteca ausente no impide precargar el resto.
+    """
+    start = time.perf_counter()
+    steps: Dict[str, Dict[str, Any]] = {}
+    _stats.update(status='en_curso', steps=steps, started_at=time.time())
+
+    modules = LIBRARY_IMPORTS + (UI_IMPORTS if include_ui else ())
+    plan = [(f"import.{name}", lambda name=name: importlib.import_module(name)) for name in modules]
+    plan += _build_steps()
+
+    nlp_loaded = False
+    for name, step in plan:
+        step_start = time.perf_counter()
+        try:
+            result = step()
+            steps[name] = {'seconds': round(time.perf_counter() - step_start, 3), 'ok': True}
+            if name == 'modelo.spacy':
+                nlp_loaded = result is not None
+                steps[name]['ok'] = nlp_loaded
+        except Exception as e:
+            steps[name] = {'seconds': round(time.perf_counter() - step_start, 3), 'ok': False, 'error': str(e)}
+
+    _stats.update(status='completada', total_seconds=round(time.perf_counter() - start, 3), nlp_loaded=nlp_loaded)
+    return get_warmup_stats()
+
+
+def start_background_warmup(include_ui: bool = True) -> bool:
+    """Lanza la precarga en un hilo una sola vez por proceso; retorna True si la lanzó esta llamada"""
+    global _thread
+    if not WARMUP_ENABLED:
+        return False
+    with _lock:
+        if _thread is not None:
+            return False
+        _thread = threading.Thread(target=warmup, args=(include_ui,), name='precarga', daemon=True)
+        _thread.start()
+    return True
+
+
+def get_warmup_stats() -> Dict[str, Any]:
+    """Estado de la precarga y segundos por paso"""
+    return {**_stats, 'enabled': WARMUP_ENABLED, 'steps': dict(_stats['steps'])}
\ No newline at end of file
@@ -0,0 +1,120 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+
+class TermMatch(NamedTuple):
+    term: str
+    start: int
+    end: int
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """Autómata Aho-Corasick: busca todos los términos en una sola pasada del texto
+
+    Las coincidencias respetan límites de palabra (como \\b en regex): "go"
+    no aparece dentro de "google" ni "java" dentro de "javascript". Para
+    términos de 4 o más letras se acepta el plural con "s"/"es", así
+    "curso" coincide con "cursos". El texto debe venir ya en minúsculas.
+    """
+
+    def __init__(self, terms: Iterable[str], allow_plural: bool = True):
+        self.terms: Tuple[str, ...] = tuple(dict.fromkeys(term.lower() for term in terms if term))
+        self.allow_plural = allow_plural
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        self._build()
+
+        # Qué bordes de cada término deben validarse y si admite plural
+        self._left_check = [_is_word_char(term[0]) for term in self.terms]
+        self._right_check = [_is_word_char(term[-1]) for term in self.terms]
+        self._plural = [allow_plural and len(term) >= 4 and term[-1].isalpha() for term in self.terms]
+
+    def _build(self) -> None:
+        """Construye el trie y los enlaces de fallo (BFS)"""
+        goto, output = self._goto, self._output
+        partial_output: List[List[int]] = [[]]
+
+        for index, term in enumerate(self.terms):
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    partial_output.append([])
+                    self._fail.append(0)
+                state = next_state
+            partial_output[state].append(index)
+
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+
+        # Las salidas heredan las de su estado de fallo (procesado antes en BFS)
+        output[:] = [()] * len(goto)
+        for state in [0] + queue:
+            inherited = output[self._fail[state]] if state else ()
+            output[state] = tuple(partial_output[state]) + inherited
+
+    def _right_boundary(self, text: str, end: int, plural: bool) -> int:
+        """Fin efectivo de la coincidencia, o -1 si no termina en borde de palabra"""
+        length = len(text)
+        if end >= length or not _is_word_char(text[end]):
+            return end
+        if plural:
+            for suffix in ('s', 'es'):
+                suffix_end = end + len(suffix)
+                if text.startswith(suffix, end) and (suffix_end >= length or not _is_word_char(text[suffix_end])):
+                    return suffix_end
+        return -1
+
+    def find_all(self, text_lower: str) -> List[TermMatch]:
+        """Todas las coincidencias con sus posiciones [start, end) en el texto"""
+        goto, fail, output = self._goto, self._fail, self._output
+        terms = self.terms
+        matches = []
+        state = 0
+
+        for position, char in enumerate(text_lower):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+
+            end = position + 1
+            for index in output[state]:
+                start = end - len(terms[index])
+                if self._left_check[index] and start > 0 and _is_word_char(text_lower[start - 1]):
+                    continue
+                match_end = end
+                if self._right_check[index]:
+                    match_end = self._right_boundary(text_lower, end, self._plural[index])
+                    if match_end < 0:
+                        continue
+                matches.append(TermMatch(terms[index], start, match_end))
+
+        return matches
+
+    def found(self, text_lower: str) -> Set[str]:
+        """Conjunto de términos presentes en el texto"""
+        return {match.term for match in self.find_all(text_lower)}
+
+
+@lru_cache(maxsize=64)
+def get_matcher(terms: Tuple[str, ...], allow_plural: bool = True) -> KeywordMatcher:
+    """Buscador compilado una sola vez por proceso para cada lista de términos"""
+    return KeywordMatcher(terms, allow_plural)
\ No newline at end of file
@@ -0,0 +1,201 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+def content_hash(data) -> str:
+    """SHA-256 hexadecimal de bytes, memoryview o texto"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class LRUCache:
+    """Caché en memoria de tamaño acotado con desalojo LRU y contadores"""
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = max(int(maxsize), 1)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Aciertos, fallos y ocupación actual de la caché"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0
+            }
+
+
+def _default_cache_dir() -> str:
+    """Directorio de caché persistente (configurable con ATS_CACHE_DIR)"""
+    configured = os.getenv('ATS_CACHE_DIR')
+    if configured:
+        return configured
+    return os.path.join(os.path.expanduser('~'), '.cache', 'analizador_ats')
+
+
+class ExtractionCache:
+    """Caché en disco de textos extraídos, direccionada por contenido
+
+    Usa SQLite en modo WAL, así que varios procesos de Streamlit en el mismo
+    host pueden leer y escribir a la vez. Cuando el total supera max_bytes se
+    desalojan las entradas usadas hace más tiempo. Cualquier error de disco
+    deja la caché inactiva en lugar de interrumpir la extracción.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or os.path.join(_default_cache_dir(), 'extraccion.sqlite3')
+        if max_bytes is None:
+            max_bytes = int(os.getenv('ATS_EXTRACTION_CACHE_MB', '256')) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            connection = self._connection()
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS extracciones ("
+                " key TEXT PRIMARY KEY,"
+                " text TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_extracciones_acceso ON extracciones (last_access)")
+        except (OSError, sqlite3.Error) as e:
+            print(f"Caché de extracción deshabilitada: {e}")
+            self.enabled = False
+
+    @staticmethod
+    def make_key(data, backend: str, version: str) -> str:
+        """Clave: hash del documento + motor de extracción + versión"""
+        return f"{content_hash(data)}:{backend}:{version}"
+
+    def _connection(self) -> sqlite3.Connection:
+        """Una conexión por hilo (y por proceso)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            connection = self._connection()
+            row = connection.execute("SELECT text FROM extracciones WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute("UPDATE extracciones SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return row[0]
+        except sqlite3.Error as e:
+            print(f"Error leyendo caché de extracción: {e}")
+            return None
+
+    def set(self, key: str, text: str) -> None:
+        if not self.enabled:
+            return
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO extracciones (key, text, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, text, size, time.time())
+            )
+            self._evict(connection)
+        except sqlite3.Error as e:
+            print(f"Error escribiendo caché de extracción: {e}")
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Borra las entradas menos usadas hasta volver bajo el límite de tamaño"""
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM extracciones").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        stale_keys = []
+        for key, size in connection.execute("SELECT key, size FROM extracciones ORDER BY last_access").fetchall():
+            stale_keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM extracciones WHERE key = ?", stale_keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Aciertos, fallos y ocupación en disco de la caché"""
+        stats = {'enabled': self.enabled, 'hits': self.hits, 'misses': self.misses, 'entries': 0, 'bytes': 0, 'max_bytes': self.max_bytes}
+        if self.enabled:
+            try:
+                entries, total = self._connection().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extracciones"
+                ).fetchone()
+                stats.update(entries=entries, bytes=total)
+            except sqlite3.Error:
+                pass
+        return stats
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Caché de extracción compartida del proceso (None si ATS_EXTRACTION_CACHE=0)"""
+    global _extraction_cache
+    if os.getenv('ATS_EXTRACTION_CACHE', '1') == '0':
+        return None
+    with _extraction_cache_lock:
+        if _extraction_cache is None:
+            _extraction_cache = ExtractionCache()
+        return _extraction_cache
@@ -0,0 +1,93 @@
+import os
+from functools import cached_property
+from itertools import tee
+from typing import Iterable, Iterator, List, Optional, Set
+from modules.modelos import get_nlp
+from modules.texto import TextFeatures
+from modules.patrones import PatternMatches
+from modules.buscador import KeywordMatcher, TermMatch
+from modules.metricas import timed
+
+# Textos por lote al calcular el NER de muchos CVs con nlp.pipe
+NER_BATCH_SIZE = int(os.getenv('ATS_NER_BATCH_SIZE', '32'))
+
+
+class AnalysisContext:
+    """Texto del CV preprocesado una sola vez y compartido entre analizadores
+
+    Cada vista (minúsculas, líneas, tokens, Doc de spaCy) se calcula la
+    primera vez que algún analizador la pide y se reutiliza después.
+    """
+
+    def __init__(self, text: str, nlp=None, doc=None):
+        self.text = text
+        self._nlp = nlp
+        self._found_terms = {}
+        self._term_matches = {}
+        # Doc ya calculado por lotes (build_contexts): no se vuelve a procesar
+        if doc is not None:
+            self.doc = doc
+
+    @cached_property
+    def features(self) -> TextFeatures:
+        return TextFeatures(self.text)
+
+    @cached_property
+    def matches(self) -> PatternMatches:
+        """Coincidencias del banco de regex (experiencia, fechas, contacto, logros)"""
+        return PatternMatches(self.text, self.text_lower)
+
+    @property
+    def text_lower(self) -> str:
+        return self.features.text_lower
+
+    @property
+    def lines(self) -> List[str]:
+        return self.features.lines
+
+    @property
+    def tokens(self) -> List[str]:
+        return self.features.tokens
+
+    @cached_property
+    def doc(self):
+        """Doc de spaCy del CV (None si el modelo no está disponible)"""
+        nlp = self._nlp if self._nlp is not None else get_nlp(profile='ner-only')
+        if nlp is None:
+            return None
+        with timed('ner', len(self.text)) as record:
+            try:
+                return nlp(self.text)
+            except Exception:
+                record['error'] = True
+                return None
+
+    def term_matches(self, matcher: KeywordMatcher) -> List[TermMatch]:
+        """Coincidencias del buscador con sus posiciones (un solo recorrido por buscador)"""
+        if matcher not in self._term_matches:
+            self._term_matches[matcher] = matcher.find_all(self.text_lower)
+        return self._term_matches[matcher]
+
+    def found_terms(self, matcher: KeywordMatcher) -> Set[str]:
+        """Términos del buscador presentes en el CV"""
+        if matcher not in self._found_terms:
+            self._found_terms[matcher] = {match.term for match in self.term_matches(matcher)}
+        return self._found_terms[matcher]
+
+
+def build_contexts(texts: Iterable[str], batch_size: int = NER_BATCH_SIZE, n_process: int = 1) -> Iterator[AnalysisContext]:
+    """Contextos de muchos CVs con el NER calculado por lotes (nlp.pipe), en el orden de entrada"""
+    nlp = get_nlp(profile='ner-only')
+    if nlp is None:
+        yield from (AnalysisContext(text) for text in texts)
+        return
+    texts, pipe_texts = tee(texts)
+    for text, doc in zip(texts, nlp.pipe(pipe_texts, batch_size=batch_size, n_process=n_process)):
+        yield AnalysisContext(text, doc=doc)
+
+
+def ensure_context(text: str, context: Optional[AnalysisContext] = None) -> AnalysisContext:
+    """Reutiliza el contexto recibido o crea uno nuevo para el texto"""
+    if context is not None:
+        return context
+    return AnalysisContext(text)
\ No newline at end of file
@@ -0,0 +1,153 @@
+import io
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+# PDFs con al menos esta cantidad de páginas se extraen en paralelo
+PARALLEL_PAGE_THRESHOLD = int(os.getenv('ATS_PARALLEL_PAGE_THRESHOLD', '8'))
+
+# Procesos dedicados a la extracción de texto de PDFs
+PDF_WORKERS = int(os.getenv('ATS_PDF_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Una página con menos caracteres alfanuméricos no tiene capa de texto utilizable
+MIN_PAGE_TEXT_CHARS = int(os.getenv('ATS_MIN_PAGE_TEXT_CHARS', '40'))
+
+# Fracción de la página cubierta por imágenes para considerarla escaneada
+IMAGE_COVERAGE_THRESHOLD = float(os.getenv('ATS_IMAGE_COVERAGE_THRESHOLD', '0.5'))
+
+# Resolución mínima a la que se asume dibujada una imagen al estimar su superficie
+IMAGE_REFERENCE_DPI = 150
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Pool de procesos compartido, creado la primera vez que se necesita"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn evita heredar locks de los hilos del servidor al hacer fork
+            _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = max_workers
+        return _pool
+
+
+def _reset_pool() -> None:
+    """Descarta el pool (por ejemplo, tras un BrokenProcessPool)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+
+
+def _image_pixels(resources, depth: int = 0) -> int:
+    """Suma de píxeles de las imágenes declaradas en los recursos (y formularios anidados)"""
+    try:
+        xobjects = resources.get('/XObject') if resources else None
+        if not xobjects:
+            return 0
+        xobjects = xobjects.get_object()
+    except Exception:
+        return 0
+
+    pixels = 0
+    for name in xobjects:
+        try:
+            xobject = xobjects[name].get_object()
+            subtype = xobject.get('/Subtype')
+            if subtype == '/Image':
+                pixels += int(xobject.get('/Width', 0)) * int(xobject.get('/Height', 0))
+            elif subtype == '/Form' and depth < 2:
+                pixels += _image_pixels(xobject.get('/Resources'), depth + 1)
+        except Exception:
+            continue
+    return pixels
+
+
+def page_image_coverage(page) -> float:
+    """Estima qué fracción de la página ocupan imágenes, sin decodificarlas
+
+    Se compara la cantidad de píxeles de las imágenes con la superficie de
+    la página a IMAGE_REFERENCE_DPI: un escaneo a 200-300 dpi satura en 1.0,
+    mientras que un logo o una foto de perfil quedan muy por debajo.
+    """
+    try:
+        box = page.mediabox
+        page_area = float(box.width) * float(box.height)
+        resources = page.get('/Resources')
+        resources = resources.get_object() if resources is not None else None
+    except Exception:
+        return 0.0
+    if page_area <= 0:
+        return 0.0
+
+    reference_area = page_area * (IMAGE_REFERENCE_DPI / 72) ** 2
+    return min(_image_pixels(resources) / reference_area, 1.0)
+
+
+def needs_ocr(page_text: str, page) -> bool:
+    """Decide si una página carece de capa de texto utilizable y debe pasar por OCR"""
+    usable_chars = sum(1 for char in page_text if char.isalnum())
+    if usable_chars >= MIN_PAGE_TEXT_CHARS:
+        return False
+    # Sin texto en absoluto: puede ser un escaneo con imágenes en línea
+    if usable_chars == 0:
+        return True
+    # Algunos caracteres sueltos sobre una página cubierta por una imagen
+    return page_image_coverage(page) >= IMAGE_COVERAGE_THRESHOLD
+
+
+def analyze_page(page) -> Tuple[str, bool]:
+    """Texto de la página y si requiere OCR"""
+    page_text = page.extract_text() or ""
+    return page_text, needs_ocr(page_text, page)
+
+
+def extract_page_range(data: bytes, start: int, end: int) -> List[Tuple[int, str, bool]]:
+    """Extrae y clasifica las páginas [start, end) de un PDF en memoria"""
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [(i,) + analyze_page(reader.pages[i]) for i in range(start, end)]
+
+
+def _split_ranges(page_count: int, chunks: int) -> List[Tuple[int, int]]:
+    """Divide las páginas en rangos contiguos de tamaño similar"""
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges = []
+    start = 0
+    for chunk in range(chunks):
+        end = start + size + (1 if chunk < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def extract_pages_parallel(data, page_count: int, max_workers: int = PDF_WORKERS) -> List[Tuple[str, bool]]:
+    """Extrae y clasifica todas las páginas repartiendo rangos entre procesos
+
+    Retorna (texto, requiere_ocr) de cada página en el orden original.
+    """
+    payload = bytes(data)
+    pool = _get_pool(max_workers)
+    futures = [pool.submit(extract_page_range, payload, start, end)
+               for start, end in _split_ranges(page_count, max_workers)]
+
+    pages: List[Tuple[str, bool]] = [("", True)] * page_count
+    try:
+        for future in futures:
+            for index, page_text, page_needs_ocr in future.result():
+                pages[index] = (page_text, page_needs_ocr)
+    except BrokenProcessPool:
+        # Un proceso caído deja el pool inutilizable; se recrea en la próxima llamada
+        _reset_pool()
+        raise
+    return pages
\ No newline at end of file
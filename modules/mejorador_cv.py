@@ -1,16 +1,16 @@
-import re
-import spacy
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional
 from collections import Counter
+from modules.modelos import get_nlp
+from modules.contexto import AnalysisContext, ensure_context
+from modules.buscador import get_matcher
+from modules.metricas import timed_stage
+from modules.taxonomia import SOFT, get_taxonomy
 
 class CVImprovementAnalyzer:
     def __init__(self):
-        try:
-            self.nlp = spacy.load("es_core_news_sm")
-            self.spacy_available = True
-        except OSError:
-            self.nlp = None
-            self.spacy_available = False
+        # Modelo compartido por todo el proceso (se carga una sola vez)
+        self.nlp = get_nlp(profile='ner-only')
+        self.spacy_available = self.nlp is not None
         
         # Palabras de acción recomendadas
         self.action_verbs = [
@@ -31,12 +31,9 @@ class CVImprovementAnalyzer:
             'ayudé', 'participé', 'colaboré', 'asistí', 'fui parte de',
             'tuve que', 'debía', 'intenté', 'traté de', 'quizás', 'tal vez'
         ]
-
-    def analyze_structure(self, text: str) -> Dict[str, Any]:
-        """Analiza la estructura general del CV"""
-        lines = text.split('\n')
-        sections_found = []
-        section_patterns = {
+        
+        # Palabras que identifican el encabezado de cada sección
+        self.section_patterns = {
             'información personal': ['nombre', 'teléfono', 'email', 'dirección', 'linkedin'],
             'experiencia laboral': ['experiencia', 'laboral', 'trabajo', 'empleo', 'profesional'],
             'educación': ['educación', 'formación', 'estudios', 'académico', 'universidad'],
@@ -46,11 +43,43 @@ class CVImprovementAnalyzer:
             'certificaciones': ['certificaciones', 'cursos', 'diplomas', 'certificates']
         }
         
-        # Detectar secciones
-        for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            for section, keywords in section_patterns.items():
-                if any(keyword in line_lower for keyword in keywords) and len(line_lower) < 100:
+        # Niveles educativos
+        self.education_keywords = {
+            'universidad': ['universidad', 'university', 'facultad'],
+            'grado': ['grado', 'licenciatura', 'bachiller', 'ingeniería'],
+            'posgrado': ['maestría', 'master', 'doctorado', 'phd'],
+            'certificaciones': ['certificación', 'certificado', 'diploma']
+        }
+        
+        # Habilidades de la taxonomía compartida; herramientas y cloud se cuentan aparte
+        self.taxonomy = get_taxonomy()
+        self.tool_categories = {'herramientas', 'cloud'}
+        
+        # Buscadores compilados una sola vez por proceso
+        self.section_matcher = get_matcher(tuple(
+            keyword for keywords in self.section_patterns.values() for keyword in keywords
+        ))
+        self.term_matcher = get_matcher(tuple(
+            term for terms in self.education_keywords.values() for term in terms
+        ) + self.taxonomy.terms)
+
+    def analyze_structure(self, text: str, context: Optional[AnalysisContext] = None) -> Dict[str, Any]:
+        """Analiza la estructura general del CV"""
+        features = ensure_context(text, context).features
+        lines = features.lines
+        sections_found = []
+        
+        # Detectar secciones: una sola pasada del buscador sobre todo el texto
+        terms_by_line: Dict[int, set] = {}
+        for match in self.section_matcher.find_all(features.text_lower):
+            terms_by_line.setdefault(features.line_index(match.start), set()).add(match.term)
+        
+        for i in sorted(terms_by_line):
+            line = lines[i]
+            if len(line.strip()) >= 100:
+                continue
+            for section, keywords in self.section_patterns.items():
+                if any(keyword in terms_by_line[i] for keyword in keywords):
                     sections_found.append({
                         'section': section,
                         'line': line.strip(),
@@ -59,9 +88,9 @@ class CVImprovementAnalyzer:
                     break
         
         # Análisis de densidad
-        word_count = len(text.split())
-        line_count = len(lines)
-        paragraph_count = len([p for p in text.split('\n\n') if p.strip()])
+        word_count = features.word_count
+        line_count = features.line_count
+        paragraph_count = features.paragraph_count
         
         return {
             'sections_found': sections_found,
@@ -73,53 +102,51 @@ class CVImprovementAnalyzer:
             'structure_score': self._calculate_structure_score(sections_found, word_count)
         }
 
-    def analyze_content_quality(self, text: str) -> Dict[str, Any]:
+    def analyze_content_quality(self, text: str, context: Optional[AnalysisContext] = None) -> Dict[str, Any]:
         """Analiza la calidad del contenido"""
-        text_lower = text.lower()
-        words = text.split()
-        sentences = [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
+        features = ensure_context(text, context).features
+        words = features.tokens_lower
         
         # Contar palabras de acción
-        action_verbs_count = sum(1 for word in words if word.lower() in self.action_verbs)
+        action_verbs_count = sum(1 for word in words if word in self.action_verbs)
         
         # Contar palabras débiles
-        weak_words_count = sum(1 for word in words if word.lower() in self.weak_words)
+        weak_words_count = sum(1 for word in words if word in self.weak_words)
         
         # Análisis de oraciones
-        sentence_lengths = [len(sentence.split()) for sentence in sentences]
+        sentence_lengths = features.sentence_word_counts
         avg_sentence_length = sum(sentence_lengths) / max(len(sentence_lengths), 1)
         
         # Densidad de keywords (simulada)
         professional_keywords = ['gestión', 'desarrollo', 'implementación', 'optimización', 'liderazgo']
-        keyword_density = sum(1 for word in words if word.lower() in professional_keywords)
+        keyword_density = sum(1 for word in words if word in professional_keywords)
         
         return {
             'action_verbs_count': action_verbs_count,
             'weak_words_count': weak_words_count,
-            'sentence_count': len(sentences),
+            'sentence_count': features.sentence_count,
             'avg_sentence_length': round(avg_sentence_length, 1),
             'keyword_density': keyword_density,
             'content_score': self._calculate_content_score(action_verbs_count, weak_words_count, avg_sentence_length, keyword_density)
         }
 
-    def analyze_formatting(self, text: str) -> Dict[str, Any]:
+    def analyze_formatting(self, text: str, context: Optional[AnalysisContext] = None) -> Dict[str, Any]:
         """Analiza el formato y presentación"""
-        lines = text.split('\n')
+        features = ensure_context(text, context).features
         
         # Analizar longitud de líneas
-        line_lengths = [len(line) for line in lines if line.strip()]
+        line_lengths = features.nonblank_line_lengths
         avg_line_length = sum(line_lengths) / max(len(line_lengths), 1)
         long_lines = sum(1 for length in line_lengths if length > 100)
         
         # Detectar uso de mayúsculas excesivas
-        uppercase_lines = sum(1 for line in lines if line.strip() and line.upper() == line and len(line) > 10)
+        uppercase_lines = features.uppercase_line_count
         
         # Detectar listas y bullet points
-        bullet_points = sum(1 for line in lines if line.strip().startswith(('-', '•', '*', '·')))
+        bullet_points = features.bullet_line_count
         
         # Espacios en blanco excesivos
-        empty_lines = sum(1 for line in lines if not line.strip())
-        empty_line_ratio = empty_lines / max(len(lines), 1)
+        empty_line_ratio = features.blank_line_count / max(features.line_count, 1)
         
         return {
             'avg_line_length': round(avg_line_length, 1),
@@ -130,12 +157,13 @@ class CVImprovementAnalyzer:
             'formatting_score': self._calculate_formatting_score(avg_line_length, long_lines, uppercase_lines, bullet_points, empty_line_ratio)
         }
 
-    def analyze_data_completeness(self, text: str) -> Dict[str, Any]:
+    def analyze_data_completeness(self, text: str, context: Optional[AnalysisContext] = None) -> Dict[str, Any]:
         """Analiza la completitud de los datos"""
-        contact_info = self._extract_contact_info(text)
-        education_info = self._extract_education_info(text)
-        experience_info = self._extract_experience_info(text)
-        skills_info = self._extract_skills_info(text)
+        context = ensure_context(text, context)
+        contact_info = self._extract_contact_info(text, context)
+        education_info = self._extract_education_info(text, context)
+        experience_info = self._extract_experience_info(text, context)
+        skills_info = self._extract_skills_info(text, context)
         
         completeness_score = self._calculate_completeness_score(
             contact_info, education_info, experience_info, skills_info
@@ -150,11 +178,12 @@ class CVImprovementAnalyzer:
             'missing_elements': self._identify_missing_elements(contact_info, education_info, experience_info, skills_info)
         }
 
-    def _extract_contact_info(self, text: str) -> Dict[str, bool]:
+    def _extract_contact_info(self, text: str, context: AnalysisContext) -> Dict[str, bool]:
         """Extrae y verifica información de contacto"""
-        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-        phones = re.findall(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]', text)
-        linkedin = re.findall(r'linkedin\.com/in/[^\s]+', text.lower())
+        matches = context.matches
+        emails = matches.emails
+        phones = matches.phones
+        linkedin = matches.linkedin_profiles
         
         return {
             'has_email': len(emails) > 0,
@@ -164,30 +193,16 @@ class CVImprovementAnalyzer:
             'phone_count': len(phones)
         }
 
-    def _extract_education_info(self, text: str) -> Dict[str, Any]:
+    def _extract_education_info(self, text: str, context: AnalysisContext) -> Dict[str, Any]:
         """Extrae información educativa"""
-        text_lower = text.lower()
-        
-        education_keywords = {
-            'universidad': ['universidad', 'university', 'facultad'],
-            'grado': ['grado', 'licenciatura', 'bachiller', 'ingeniería'],
-            'posgrado': ['maestría', 'master', 'doctorado', 'phd'],
-            'certificaciones': ['certificación', 'certificado', 'diploma']
-        }
+        found = context.found_terms(self.term_matcher)
         
         found_levels = {}
-        for level, keywords in education_keywords.items():
-            found_levels[level] = any(keyword in text_lower for keyword in keywords)
+        for level, keywords in self.education_keywords.items():
+            found_levels[level] = any(keyword in found for keyword in keywords)
         
         # Detectar años de estudio
-        year_patterns = [
-            r'(\d{4})\s*[-–]\s*(\d{4}|actual)',
-            r'(\d{4})\s*al\s*(\d{4})'
-        ]
-        
-        education_periods = []
-        for pattern in year_patterns:
-            education_periods.extend(re.findall(pattern, text))
+        education_periods = context.matches.date_ranges + context.matches.year_al_ranges
         
         return {
             'levels_found': found_levels,
@@ -195,31 +210,20 @@ class CVImprovementAnalyzer:
             'has_higher_education': found_levels['universidad'] or found_levels['grado'] or found_levels['posgrado']
         }
 
-    def _extract_experience_info(self, text: str) -> Dict[str, Any]:
+    def _extract_experience_info(self, text: str, context: AnalysisContext) -> Dict[str, Any]:
         """Extrae información de experiencia"""
-        text_lower = text.lower()
-        
-        # Patrones para experiencia
-        exp_patterns = [
-            r'(\d+)\s*años?\s*de\s*experiencia',
-            r'experiencia\s*:\s*(\d+)\s*años?',
-            r'(\d+)\s*años?\s*en\s*[a-z\s]+'
-        ]
+        matches = context.matches
         
-        years_experience = 0
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                for match in matches:
-                    if isinstance(match, tuple) and match[0].isdigit():
-                        years_experience = max(years_experience, int(match[0]))
-                    elif isinstance(match, str) and match.isdigit():
-                        years_experience = max(years_experience, int(match))
+        # N años de experiencia / experiencia: N años / N años en ...
+        years_experience = max(
+            matches.years_with('experiencia') + matches.experience_colon + matches.years_with('en'),
+            default=0
+        )
         
         # Detectar empresas
         if self.spacy_available:
             try:
-                doc = self.nlp(text)
+                doc = context.doc
                 companies = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
             except:
                 companies = []
@@ -227,29 +231,25 @@ class CVImprovementAnalyzer:
             companies = []
         
         # Periodos laborales
-        work_periods = re.findall(r'(\d{4})\s*[-–]\s*(\d{4}|actual)', text)
+        work_periods = matches.date_ranges
         
         return {
             'years_experience': years_experience,
             'companies_mentioned': len(companies),
             'work_periods': len(work_periods),
-            'has_quantifiable_achievements': self._has_quantifiable_achievements(text)
+            'has_quantifiable_achievements': matches.has_quantifiable_achievements
         }
 
-    def _extract_skills_info(self, text: str) -> Dict[str, Any]:
+    def _extract_skills_info(self, text: str, context: AnalysisContext) -> Dict[str, Any]:
         """Extrae información de habilidades"""
-        text_lower = text.lower()
-        
-        # Categorías de habilidades
-        skill_categories = {
-            'technical': ['python', 'java', 'sql', 'javascript', 'html', 'css', 'react', 'angular'],
-            'soft': ['liderazgo', 'comunicación', 'trabajo en equipo', 'resolución de problemas'],
-            'tools': ['git', 'docker', 'aws', 'azure', 'jenkins', 'jira']
-        }
-        
-        skills_found = {}
-        for category, skills in skill_categories.items():
-            skills_found[category] = sum(1 for skill in skills if skill in text_lower)
+        skills_found = {'technical': 0, 'soft': 0, 'tools': 0}
+        for skill_id in self.taxonomy.skills_in(context.term_matches(self.term_matcher)):
+            if self.taxonomy.groups[skill_id] == SOFT:
+                skills_found['soft'] += 1
+            elif self.taxonomy.categories[skill_id] in self.tool_categories:
+                skills_found['tools'] += 1
+            else:
+                skills_found['technical'] += 1
         
         return {
             'skills_by_category': skills_found,
@@ -258,24 +258,6 @@ class CVImprovementAnalyzer:
             'has_soft_skills': skills_found['soft'] > 0
         }
 
-    def _has_quantifiable_achievements(self, text: str) -> bool:
-        """Verifica si hay logros cuantificables"""
-        quantifiable_patterns = [
-            r'increment[oó]\s+en\s+\d+%',
-            r'reduj[eé]\s+en\s+\d+%',
-            r'aument[oó]\s+de\s+\$?\d+',
-            r'ahorr[oó]\s+\$?\d+',
-            r'mejor[oó]\s+en\s+\d+%',
-            r'\d+\s*%',
-            r'\$\d+',
-            r'\d+\s*(veces|times)'
-        ]
-        
-        for pattern in quantifiable_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        return False
-
     def _identify_missing_elements(self, contact_info: Dict, education_info: Dict, experience_info: Dict, skills_info: Dict) -> List[str]:
         """Identifica elementos faltantes en el CV"""
         missing = []
@@ -412,12 +394,14 @@ class CVImprovementAnalyzer:
         
         return min(score, 100)
 
-    def generate_improvement_report(self, text: str) -> Dict[str, Any]:
+    @timed_stage('mejora')
+    def generate_improvement_report(self, text: str, context: Optional[AnalysisContext] = None) -> Dict[str, Any]:
         """Genera un reporte completo de mejora"""
-        structure = self.analyze_structure(text)
-        content = self.analyze_content_quality(text)
-        formatting = self.analyze_formatting(text)
-        completeness = self.analyze_data_completeness(text)
+        context = ensure_context(text, context)
+        structure = self.analyze_structure(text, context)
+        content = self.analyze_content_quality(text, context)
+        formatting = self.analyze_formatting(text, context)
+        completeness = self.analyze_data_completeness(text, context)
         
         # Puntuación general
         overall_score = (
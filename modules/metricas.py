@@ -0,0 +1,170 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+# Duraciones recientes que se guardan por etapa para los percentiles
+METRICS_WINDOW = int(os.getenv('ATS_METRICS_WINDOW', '1000'))
+
+# Registro JSON por línea de cada etapa: ruta de archivo o "-" para stderr (vacío: desactivado)
+METRICS_LOG = os.getenv('ATS_METRICS_LOG', '')
+
+# ATS_METRICS=0 desactiva la medición por completo
+METRICS_ENABLED = os.getenv('ATS_METRICS', '1') != '0'
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada"""
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class StageStats:
+    """Ventana móvil de duraciones y contadores de una etapa"""
+
+    __slots__ = ('durations', 'count', 'errors', 'cache_hits', 'total_size', 'sized')
+
+    def __init__(self, window: int):
+        self.durations: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.total_size = 0
+        self.sized = 0
+
+    def add(self, seconds: float, size: Optional[int], cache_hit: bool, error: bool) -> None:
+        self.durations.append(seconds)
+        self.count += 1
+        self.errors += error
+        self.cache_hits += cache_hit
+        if size is not None:
+            self.total_size += size
+            self.sized += 1
+
+    def summary(self) -> Dict[str, Any]:
+        durations = sorted(self.durations)
+        summary = {
+            'count': self.count,
+            'errors': self.errors,
+            'cache_hits': self.cache_hits,
+            'cache_hit_rate': round(self.cache_hits / self.count, 3) if self.count else 0.0,
+            'avg_size': round(self.total_size / self.sized) if self.sized else None,
+            'window': len(durations)
+        }
+        if durations:
+            summary.update(
+                p50_ms=round(_percentile(durations, 0.50) * 1000, 2),
+                p95_ms=round(_percentile(durations, 0.95) * 1000, 2),
+                p99_ms=round(_percentile(durations, 0.99) * 1000, 2),
+                mean_ms=round(sum(durations) / len(durations) * 1000, 2),
+                max_ms=round(durations[-1] * 1000, 2)
+            )
+        return summary
+
+
+class StageMetrics:
+    """Tiempos por etapa del proceso (extracción, OCR, NER, puntuación, mejora)
+
+    Cada medición se acumula en una ventana móvil por etapa, de la que salen
+    p50/p95/p99, y opcionalmente se escribe como una línea JSON para que un
+    sistema externo pueda alertar sobre regresiones.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW, log_path: str = METRICS_LOG):
+        self.window = max(window, 1)
+        self.log_path = log_path
+        self._stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._log_file = None
+
+    def record(self, stage: str, seconds: float, size: Optional[int] = None,
+               cache_hit: bool = False, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats(self.window)
+            stats.add(seconds, size, cache_hit, error)
+        if self.log_path:
+            self._log({
+                'ts': round(time.time(), 3),
+                'stage': stage,
+                'ms': round(seconds * 1000, 3),
+                'size': size,
+                'cache_hit': cache_hit,
+                'error': error,
+                'pid': os.getpid()
+            })
+
+    def _log(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry) + '\n'
+        with self._log_lock:
+            try:
+                if self.log_path == '-':
+                    sys.stderr.write(line)
+                    return
+                if self._log_file is None:
+                    self._log_file = open(self.log_path, 'a', encoding='utf-8', buffering=1)
+                self._log_file.write(line)
+            except OSError as e:
+                print(f"Registro de métricas deshabilitado: {e}")
+                self.log_path = ''
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Resumen por etapa: conteos, tasa de aciertos de caché y percentiles en ms"""
+        with self._lock:
+            return {stage: stats.summary() for stage, stats in sorted(self._stages.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+
+_metrics = StageMetrics()
+
+
+@contextmanager
+def timed(stage: str, size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Mide el bloque como una etapa
+
+    El diccionario entregado permite anotar la medición desde dentro:
+    record['cache_hit'] = True, record['error'] = True, record['size'] = ...
+    """
+    record = {'size': size, 'cache_hit': False, 'error': False}
+    if not METRICS_ENABLED:
+        yield record
+        return
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException:
+        record['error'] = True
+        raise
+    finally:
+        _metrics.record(stage, time.perf_counter() - start, record['size'], record['cache_hit'], record['error'])
+
+
+def timed_stage(stage: str) -> Callable:
+    """Decorador de métodos: mide cada llamada; el tamaño es el del primer argumento"""
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            size = len(args[0]) if args and hasattr(args[0], '__len__') else None
+            with timed(stage, size):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_stage_stats() -> Dict[str, Dict[str, Any]]:
+    """Percentiles y contadores de cada etapa medida en el proceso"""
+    return _metrics.stats()
+
+
+def reset_stage_stats() -> None:
+    _metrics.reset()
\ No newline at end of file
@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+
+DEFAULT_MODEL = "es_core_news_sm"
+
+# Componentes que necesita cada tarea; None ejecuta todo lo cargado
+#   ner-only:  entidades (empresas e instituciones del CV)
+#   pos-lemma: categoría gramatical, lema y stopwords (keywords de la descripción de puesto)
+PIPELINE_PROFILES: Dict[str, Optional[Tuple[str, ...]]] = {
+    'ner-only': ('ner',),
+    'pos-lemma': ('tok2vec', 'morphologizer', 'tagger', 'attribute_ruler', 'lemmatizer'),
+    'full': None
+}
+DEFAULT_PROFILE = 'full'
+
+# Componentes que ningún perfil usa: spaCy ni siquiera los deserializa al cargar el modelo
+EXCLUDED_COMPONENTS = tuple(
+    component.strip() for component in os.getenv('ATS_SPACY_EXCLUDE', 'parser,senter').split(',') if component.strip()
+)
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Memoria residente actual del proceso en MB (None si no se puede medir)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+        # ru_maxrss es el pico (KB en Linux), sirve como aproximación
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except (ImportError, OSError):
+        return None
+
+
+class PipelineProfile:
+    """Vista de una pipeline cargada que ejecuta solo los componentes de un perfil
+
+    Comparte los pesos con la pipeline cargada (no hay una segunda carga) y, a
+    diferencia de nlp.select_pipes, no modifica el objeto compartido entre hilos.
+    """
+
+    def __init__(self, nlp, profile: str, components: Iterable[str]):
+        self.nlp = nlp
+        self.profile = profile
+        names = set(components) & set(nlp.pipe_names)
+        # Un componente que escucha a un tok2vec compartido necesita que ese tok2vec se ejecute antes
+        for name, component in nlp.pipeline:
+            if names.intersection(getattr(component, 'listening_components', None) or ()):
+                names.add(name)
+        self.pipeline = [(name, component) for name, component in nlp.pipeline if name in names]
+
+    @property
+    def pipe_names(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.pipeline)
+
+    def __call__(self, text: str):
+        doc = self.nlp.make_doc(text)
+        for _, component in self.pipeline:
+            doc = component(doc)
+        return doc
+
+    def pipe(self, texts: Iterable[str], batch_size: int = 64, n_process: int = 1) -> Iterator[Any]:
+        """Procesa varios textos por lotes con nlp.pipe (n_process > 1 reparte los lotes entre procesos)"""
+        # disable solo afecta a esta llamada: la pipeline compartida no cambia
+        enabled = set(self.pipe_names)
+        disable = [name for name in self.nlp.pipe_names if name not in enabled]
+        return self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=disable)
+
+
+class ModelRegistry:
+    """Carga cada pipeline de spaCy una sola vez por proceso y la comparte"""
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._profiles: Dict[Tuple[str, str], PipelineProfile] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str = DEFAULT_MODEL, profile: str = DEFAULT_PROFILE):
+        """Retorna el modelo cargado (o None si no está instalado), limitado a los componentes del perfil"""
+        if profile not in PIPELINE_PROFILES:
+            raise ValueError(f"Perfil de pipeline desconocido: {profile}")
+
+        if name not in self._models:
+            with self._lock:
+                # Otro hilo pudo cargarlo mientras esperábamos el lock
+                if name not in self._models:
+                    self._models[name] = self._load(name)
+
+        nlp = self._models[name]
+        components = PIPELINE_PROFILES[profile]
+        if nlp is None or components is None:
+            return nlp
+
+        key = (name, profile)
+        if key not in self._profiles:
+            self._profiles[key] = PipelineProfile(nlp, profile, components)
+        return self._profiles[key]
+
+    def is_loaded(self, name: str = DEFAULT_MODEL) -> bool:
+        """Si el modelo ya está en memoria; no lo carga ni espera a otro hilo"""
+        return self._models.get(name) is not None
+
+    def _load(self, name: str):
+        """Carga el modelo midiendo tiempo y memoria consumida"""
+        memory_before = _current_rss_mb()
+        start = time.perf_counter()
+
+        # spaCy se importa con el primer modelo: quien no lo usa no paga su carga
+        import spacy
+        imported = time.perf_counter()
+
+        try:
+            nlp = spacy.load(name, exclude=list(EXCLUDED_COMPONENTS))
+        except OSError:
+            # Se recuerda el fallo para no reintentar en cada análisis
+            nlp = None
+
+        elapsed = time.perf_counter() - start
+        memory_after = _current_rss_mb()
+
+        self._stats[name] = {
+            'loaded': nlp is not None,
+            'load_seconds': round(elapsed, 3),
+            'import_seconds': round(imported - start, 3),
+            'components': list(nlp.pipe_names) if nlp is not None else [],
+            'excluded': list(EXCLUDED_COMPONENTS),
+            'memory_mb': round(memory_after - memory_before, 1) if memory_before is not None and memory_after is not None else None
+        }
+        return nlp
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Estadísticas de carga de los modelos solicitados hasta ahora"""
+        return {name: dict(data) for name, data in self._stats.items()}
+
+
+_registry = ModelRegistry()
+
+
+def get_nlp(name: str = DEFAULT_MODEL, profile: str = DEFAULT_PROFILE):
+    """Obtiene la instancia compartida del modelo spaCy, reducida a los componentes del perfil"""
+    return _registry.get(name, profile)
+
+
+def is_model_loaded(name: str = DEFAULT_MODEL) -> bool:
+    """Si el modelo spaCy ya se cargó en este proceso (por la precarga o por un análisis)"""
+    return _registry.is_loaded(name)
+
+
+def get_model_stats() -> Dict[str, Dict[str, Any]]:
+    """Tiempo de carga y memoria de cada modelo cargado en el proceso"""
+    return _registry.stats()
\ No newline at end of file
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from importlib.util import find_spec
+from typing import Dict, Iterable, Optional
+
+# Solo se comprueba que estén instaladas: importar pytesseract cuesta ~0.5 s y se
+# hace recién en la primera página que necesita OCR
+OCR_AVAILABLE = find_spec('pdf2image') is not None and find_spec('pytesseract') is not None
+
+OCR_DPI = int(os.getenv('ATS_OCR_DPI', '300'))
+OCR_LANG = os.getenv('ATS_OCR_LANG', 'spa')
+
+# Máximo de páginas rasterizadas/en Tesseract a la vez en todo el proceso.
+# Cada página a 300 dpi ocupa ~9 MB en escala de grises, así que la memoria
+# queda acotada por este valor y no por el largo del documento.
+OCR_MAX_CONCURRENCY = int(os.getenv('ATS_OCR_MAX_CONCURRENCY', str(min(2, os.cpu_count() or 1))))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Pool de hilos compartido; poppler y Tesseract corren como subprocesos"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(OCR_MAX_CONCURRENCY, 1), thread_name_prefix='ocr')
+        return _executor
+
+
+def ocr_page(pdf_path: str, page_number: int, dpi: int = OCR_DPI, lang: str = OCR_LANG) -> str:
+    """Rasteriza una sola página (numeración desde 1) y le aplica OCR"""
+    from pdf2image import convert_from_path
+    import pytesseract
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=True)
+    try:
+        return "".join(pytesseract.image_to_string(image, lang=lang) for image in images)
+    finally:
+        for image in images:
+            image.close()
+
+
+def _ocr_task(pdf_path: str, page_number: int, dpi: int, lang: str,
+              cancel_event: Optional[threading.Event]) -> Optional[str]:
+    """ocr_page, salvo que el análisis se haya cancelado antes de que la tarea empiece"""
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+    return ocr_page(pdf_path, page_number, dpi, lang)
+
+
+def ocr_pages(data, page_numbers: Iterable[int], dpi: int = OCR_DPI, lang: str = OCR_LANG,
+              cancel_event: Optional[threading.Event] = None) -> Dict[int, str]:
+    """Aplica OCR a las páginas indicadas de un PDF en memoria
+
+    Las páginas se rasterizan de a una por tarea y se reparten en el pool
+    compartido, de modo que nunca hay más de OCR_MAX_CONCURRENCY imágenes
+    en memoria. Retorna {número de página: texto} de las páginas que se
+    procesaron: las que fallan, o que no alcanzaron a empezar antes de
+    activarse cancel_event, se omiten y el resto se conserva.
+    """
+    page_numbers = list(page_numbers)
+    if not page_numbers:
+        return {}
+
+    # poppler necesita una ruta: se escribe el PDF una sola vez para todas las páginas
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
+        tmp_file.write(data)
+        pdf_path = tmp_file.name
+
+    try:
+        executor = _get_executor()
+        futures = {page: executor.submit(_ocr_task, pdf_path, page, dpi, lang, cancel_event) for page in page_numbers}
+        # Esperar a todas las tareas antes de borrar el archivo temporal
+        wait(futures.values())
+        texts = {}
+        for page, future in futures.items():
+            try:
+                text = future.result()
+            except Exception as e:
+                print(f"Error en OCR de la página {page}: {e}")
+                continue
+            if text is not None:
+                texts[page] = text
+        return texts
+    finally:
+        os.unlink(pdf_path)
\ No newline at end of file
@@ -0,0 +1,101 @@
+import re
+from typing import List, NamedTuple, Optional
+
+# Banco de expresiones regulares compiladas una sola vez por proceso.
+# Las de experiencia se aplican sobre el texto en minúsculas.
+
+# "N años", clasificado según lo que sigue: "de experiencia", "de trayectoria" o "en ..."
+YEARS_MENTION = re.compile(
+    r'(?<!\d)(?P<years>\d+)(?P<plus>\+)?\s*años?'
+    r'(?:\s*de\s*(?P<de>experiencia|trayectoria)|\s*en\s*(?P<en>[a-z\s]+))?'
+)
+EXPERIENCE_COLON = re.compile(r'experiencia\s*:\s*(\d+)\s*años?')
+MORE_THAN_YEARS = re.compile(r'más\s+de\s+(\d+)\s*años')
+
+# Periodos de fechas
+DATE_RANGE = re.compile(r'(\d{4})\s*[-–]\s*(\d{4}|actual)', re.IGNORECASE)
+SINCE_UNTIL = re.compile(r'desde\s*(\d{4})\s*hasta\s*(\d{4})', re.IGNORECASE)
+MONTH_RANGE = re.compile(r'(\w+\s*\d{4})\s*[-–]\s*(\w+\s*\d{4}|presente)', re.IGNORECASE)
+YEAR_AL_RANGE = re.compile(r'(\d{4})\s*al\s*(\d{4})')
+
+# Contacto
+EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
+URL = re.compile(r'https?://[^\s]+')
+LINKEDIN = re.compile(r'linkedin\.com/in/[^\s]+')
+
+# Logros cuantificables: una sola alternación con grupos por tipo
+QUANTIFIABLE_ACHIEVEMENT = re.compile(
+    r'(?P<incremento>increment[oó]\s+en\s+\d+%)'
+    r'|(?P<reduccion>reduj[eé]\s+en\s+\d+%)'
+    r'|(?P<aumento>aument[oó]\s+de\s+\$?\d+)'
+    r'|(?P<ahorro>ahorr[oó]\s+\$?\d+)'
+    r'|(?P<mejora>mejor[oó]\s+en\s+\d+%)'
+    r'|(?P<porcentaje>\d+\s*%)'
+    r'|(?P<monto>\$\d+)'
+    r'|(?P<multiplicador>\d+\s*(?:veces|times))',
+    re.IGNORECASE
+)
+
+# Requisitos de experiencia en descripciones de puesto, en orden de evaluación
+JOB_EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\s*(\+)?\s*años?\s*de\s*experiencia'),
+    re.compile(r'experiencia\s*de\s*(\d+)\s*años?'),
+    re.compile(r'mínimo\s*de\s*(\d+)\s*años?'),
+    re.compile(r'(\d+)\s*años?\s*en\s*puestos?\s*similares')
+]
+
+# Extracción básica de keywords (sin spaCy)
+NON_WORD = re.compile(r'[^\w\s]')
+KEYWORD_WORD = re.compile(r'\b[a-záéíóúñ]{4,}\b')
+
+
+class YearsMention(NamedTuple):
+    years: int
+    plus: bool
+    context: Optional[str]  # 'experiencia', 'trayectoria', 'en' o None
+
+
+class DateRange(NamedTuple):
+    start: str
+    end: str
+
+
+class PatternMatches:
+    """Coincidencias de todo el banco sobre un CV, compartidas entre analizadores"""
+
+    __slots__ = (
+        'years_mentions', 'experience_colon', 'more_than_years',
+        'date_ranges', 'since_until', 'month_ranges', 'year_al_ranges',
+        'emails', 'phones', 'urls', 'linkedin_profiles', 'has_quantifiable_achievements'
+    )
+
+    def __init__(self, text: str, text_lower: Optional[str] = None):
+        text_lower = text.lower() if text_lower is None else text_lower
+
+        self.years_mentions: List[YearsMention] = [
+            YearsMention(int(match.group('years')), match.group('plus') is not None,
+                         match.group('de') or ('en' if match.group('en') else None))
+            for match in YEARS_MENTION.finditer(text_lower)
+        ]
+        self.experience_colon: List[int] = [int(years) for years in EXPERIENCE_COLON.findall(text_lower)]
+        self.more_than_years: List[int] = [int(years) for years in MORE_THAN_YEARS.findall(text_lower)]
+
+        self.date_ranges = [DateRange(*match) for match in DATE_RANGE.findall(text)]
+        self.since_until = [DateRange(*match) for match in SINCE_UNTIL.findall(text)]
+        self.month_ranges = [DateRange(*match) for match in MONTH_RANGE.findall(text)]
+        self.year_al_ranges = [DateRange(*match) for match in YEAR_AL_RANGE.findall(text)]
+
+        self.emails: List[str] = EMAIL.findall(text)
+        self.phones: List[str] = PHONE.findall(text)
+        self.urls: List[str] = URL.findall(text)
+        self.linkedin_profiles: List[str] = LINKEDIN.findall(text_lower)
+
+        self.has_quantifiable_achievements = QUANTIFIABLE_ACHIEVEMENT.search(text) is not None
+
+    def years_with(self, context: Optional[str] = None, allow_plus: bool = False) -> List[int]:
+        """Años de las menciones "N años" con el contexto indicado (None: todas)"""
+        return [
+            mention.years for mention in self.years_mentions
+            if (context is None or mention.context == context) and (allow_plus or not mention.plus)
+        ]
\ No newline at end of file
@@ -0,0 +1,303 @@
+import os
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Set, Tuple
+from modules.modelos import get_nlp
+from modules.cache import LRUCache, content_hash
+from modules.buscador import KeywordMatcher, get_matcher
+from modules.patrones import JOB_EXPERIENCE_PATTERNS, KEYWORD_WORD, NON_WORD
+from modules.taxonomia import get_taxonomy
+
+# Versión del análisis de descripciones de puesto.
+# Cambiarla invalida los perfiles guardados en caché; incluye el hash de la taxonomía de habilidades.
+PROFILE_VERSION = f"2+{get_taxonomy().version}"
+
+_profile_cache = LRUCache(maxsize=int(os.getenv('ATS_JOB_PROFILE_CACHE_SIZE', '64')))
+
+
+@dataclass(frozen=True)
+class JobProfile:
+    """Requisitos de un puesto, compilados una sola vez por descripción
+
+    Es inmutable y serializable (to_dict/from_dict), así que puede
+    compartirse entre reruns, hilos y todos los CVs evaluados contra la
+    misma vacante.
+    """
+
+    job_hash: str
+    has_description: bool = False
+    keywords: Tuple[str, ...] = ()
+    required_skills: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
+    years_required: Optional[int] = None
+    education_level: Optional[str] = None
+    languages: Tuple[str, ...] = ()
+    contract_types: Tuple[str, ...] = ()
+    seniority: str = 'no especificado'
+    industries: Tuple[str, ...] = ()
+    version: str = field(default=PROFILE_VERSION)
+
+    @cached_property
+    def matcher(self) -> KeywordMatcher:
+        """Buscador de keywords y habilidades requeridas sobre el texto de los CVs"""
+        skills = [skill for _, category_skills in self.required_skills for skill in category_skills]
+        return get_matcher(self.keywords + tuple(skills))
+
+    @cached_property
+    def analysis(self) -> Dict[str, Any]:
+        """Análisis del puesto en el formato de resultados de ATSScorer"""
+        if not self.has_description:
+            return {
+                'keywords': [],
+                'required_skills': {},
+                'requirements': {},
+                'has_description': False
+            }
+
+        requirements: Dict[str, Any] = {}
+        if self.years_required is not None:
+            requirements['años_experiencia'] = self.years_required
+        if self.education_level:
+            requirements['nivel_educativo'] = self.education_level
+        if self.languages:
+            requirements['idiomas'] = list(self.languages)
+        if self.contract_types:
+            requirements['tipo_contrato'] = list(self.contract_types)
+
+        return {
+            'keywords': list(self.keywords),
+            'required_skills': {category: list(skills) for category, skills in self.required_skills},
+            'requirements': requirements,
+            'seniority': self.seniority,
+            'industries': list(self.industries),
+            'has_description': True
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobProfile":
+        values = dict(data)
+        for name in ('keywords', 'languages', 'contract_types', 'industries'):
+            values[name] = tuple(values.get(name, ()))
+        values['required_skills'] = tuple(
+            (category, tuple(skills)) for category, skills in values.get('required_skills', ())
+        )
+        return cls(**values)
+
+
+class JobDescriptionAnalyzer:
+    """Extrae keywords, habilidades y requisitos de una descripción de puesto"""
+
+    def __init__(self):
+        # Modelo compartido por todo el proceso (se carga una sola vez)
+        self.nlp = get_nlp(profile='pos-lemma')
+        self.spacy_available = self.nlp is not None
+        
+        # Vocabulario para analizar descripciones de puesto (habilidades: taxonomía compartida con el CV)
+        self.taxonomy = get_taxonomy()
+        self.education_levels = {
+            'bachiller': ['bachiller', 'secundaria'],
+            'tecnico': ['técnico', 'tecnólogo'],
+            'pregrado': ['licenciatura', 'grado', 'ingeniería', 'universitario'],
+            'posgrado': ['maestría', 'master', 'doctorado', 'postgrado']
+        }
+        self.languages = ['inglés', 'español', 'francés', 'alemán', 'portugués']
+        self.contract_types = ['tiempo completo', 'medio tiempo', 'remoto', 'presencial', 'híbrido']
+        self.seniority_keywords = {
+            'senior': ['senior', 'experto', 'avanzado', 'lead', 'principal', 'arquitecto'],
+            'mid-level': ['semi-senior', 'semi senior', 'mid-level', 'intermedio'],
+            'junior': ['junior', 'trainee', 'principiante', 'entry level', 'recién graduado']
+        }
+        self.industry_keywords = {
+            'tecnologia': ['tecnología', 'software', 'it', 'sistemas', 'desarrollo'],
+            'finanzas': ['finanzas', 'bancario', 'fintech', 'contabilidad'],
+            'salud': ['salud', 'médico', 'farmacéutico', 'hospital'],
+            'educacion': ['educación', 'académico', 'enseñanza', 'universidad'],
+            'retail': ['retail', 'comercio', 'ventas', 'ecommerce'],
+            'manufactura': ['manufactura', 'producción', 'industrial', 'fábrica']
+        }
+        
+        # Un solo buscador para todo el vocabulario: la descripción se recorre una vez
+        vocabulary = self.languages + self.contract_types + list(self.taxonomy.terms)
+        for group in (self.education_levels, self.seniority_keywords, self.industry_keywords):
+            vocabulary += [term for terms in group.values() for term in terms]
+        self.term_matcher = get_matcher(tuple(vocabulary))
+    
+    def compile(self, job_description: str) -> JobProfile:
+        """Analiza profundamente la descripción del puesto para extraer requisitos"""
+        job_hash = content_hash(job_description or "")
+        if not job_description.strip():
+            return JobProfile(job_hash=job_hash)
+        
+        jd_lower = job_description.lower()
+        jd_matches = self.term_matcher.find_all(jd_lower)
+        jd_terms = {match.term for match in jd_matches}
+        
+        # 1. Extraer keywords principales
+        keywords = self._extract_job_keywords(job_description)
+        
+        # 2. Identificar habilidades requeridas
+        required_skills = self._identify_required_skills(self.taxonomy.skills_in(jd_matches))
+        
+        # 3. Extraer requisitos específicos
+        requirements = self._extract_specific_requirements(jd_lower, jd_terms)
+        
+        # 4. Detectar nivel de seniority
+        seniority = self._detect_seniority(jd_terms)
+        
+        # 5. Identificar industrias/áreas
+        industries = self._identify_industries(jd_terms)
+        
+        return JobProfile(
+            job_hash=job_hash,
+            has_description=True,
+            keywords=tuple(keywords),
+            required_skills=tuple((category, tuple(skills)) for category, skills in required_skills.items()),
+            years_required=requirements.get('años_experiencia'),
+            education_level=requirements.get('nivel_educativo'),
+            languages=tuple(requirements.get('idiomas', ())),
+            contract_types=tuple(requirements.get('tipo_contrato', ())),
+            seniority=seniority,
+            industries=tuple(industries)
+        )
+
+    def _extract_job_keywords(self, job_description: str) -> List[str]:
+        """Extrae palabras clave específicas del puesto"""
+        if not job_description.strip():
+            return []
+        
+        if self.spacy_available:
+            try:
+                doc = self.nlp(job_description.lower())
+                keywords = []
+                
+                # Extraer términos técnicos y específicos
+                technical_terms = []
+                for token in doc:
+                    if (token.pos_ in ['NOUN', 'PROPN'] and 
+                        len(token.text) > 3 and 
+                        not token.is_stop):
+                        technical_terms.append(token.lemma_.lower())
+                
+                # Extraer frases compuestas (bigrams)
+                bigrams = []
+                for i in range(len(doc) - 1):
+                    if (doc[i].pos_ in ['NOUN', 'ADJ'] and 
+                        doc[i+1].pos_ in ['NOUN', 'PROPN'] and
+                        not doc[i].is_stop and not doc[i+1].is_stop):
+                        bigram = f"{doc[i].text} {doc[i+1].text}"
+                        bigrams.append(bigram.lower())
+                
+                # Combinar y priorizar
+                all_terms = technical_terms + bigrams
+                term_freq = Counter(all_terms)
+                
+                # Filtrar términos muy genéricos
+                generic_terms = {'experiencia', 'trabajo', 'empresa', 'puesto', 'equipo'}
+                filtered_terms = [term for term, count in term_freq.most_common(25) 
+                                if term not in generic_terms]
+                
+                return filtered_terms
+                
+            except Exception as e:
+                print(f"Error con spaCy en keywords: {e}")
+        
+        # Fallback básico
+        return self._extract_keywords_basic(job_description)
+    
+    def _identify_required_skills(self, skill_ids: List[int]) -> Dict[str, List[str]]:
+        """Identifica habilidades específicamente requeridas, agrupadas por categoría"""
+        required_skills: Dict[str, List[str]] = {}
+        for skill_id in skill_ids:
+            # Las habilidades genéricas (ofimática, "redes", "api"...) no se exigen como requisito
+            if not self.taxonomy.is_generic(skill_id):
+                required_skills.setdefault(self.taxonomy.categories[skill_id], []).append(self.taxonomy.names[skill_id])
+        
+        return required_skills
+
+    def _extract_specific_requirements(self, jd_lower: str, jd_terms: Set[str]) -> Dict[str, Any]:
+        """Extrae requisitos específicos como años de experiencia, educación, etc."""
+        requirements = {}
+        
+        # Años de experiencia requeridos
+        for pattern in JOB_EXPERIENCE_PATTERNS:
+            matches = pattern.findall(jd_lower)
+            if matches:
+                for match in matches:
+                    if isinstance(match, tuple) and match[0].isdigit():
+                        requirements['años_experiencia'] = int(match[0])
+                        break
+                    elif isinstance(match, str) and match.isdigit():
+                        requirements['años_experiencia'] = int(match)
+                        break
+        
+        # Nivel educativo requerido
+        for level, keywords in self.education_levels.items():
+            if any(keyword in jd_terms for keyword in keywords):
+                requirements['nivel_educativo'] = level
+                break
+        
+        # Idiomas requeridos
+        found_languages = [lang for lang in self.languages if lang in jd_terms]
+        if found_languages:
+            requirements['idiomas'] = found_languages
+        
+        # Tipo de contrato/jornada
+        found_contracts = [ct for ct in self.contract_types if ct in jd_terms]
+        if found_contracts:
+            requirements['tipo_contrato'] = found_contracts
+        
+        return requirements
+    
+    def _detect_seniority(self, jd_terms: Set[str]) -> str:
+        """Detecta el nivel de seniority del puesto"""
+        # Orden de prioridad: senior, mid-level, junior
+        for seniority, keywords in self.seniority_keywords.items():
+            if any(keyword in jd_terms for keyword in keywords):
+                return seniority
+        return 'no especificado'
+    
+    def _identify_industries(self, jd_terms: Set[str]) -> List[str]:
+        """Identifica industrias o áreas específicas"""
+        found_industries = []
+        for industry, keywords in self.industry_keywords.items():
+            if any(keyword in jd_terms for keyword in keywords):
+                found_industries.append(industry)
+        
+        return found_industries
+    
+    def _extract_keywords_basic(self, job_description: str) -> List[str]:
+        """Método básico de extracción de keywords"""
+        text = job_description.lower()
+        text = NON_WORD.sub(' ', text)
+        words = KEYWORD_WORD.findall(text)
+        
+        stop_words = {
+            'para', 'con', 'del', 'los', 'las', 'por', 'como', 'más', 'sus',
+            'este', 'esta', 'esto', 'tiene', 'debe', 'puede', 'trabajo',
+            'empresa', 'puesto', 'equipo', 'nuestro', 'nuestra', 'busca',
+            'buscamos', 'responsable', 'encargado', 'funciones', 'tareas',
+            'deben', 'deberá', 'necesario', 'importante', 'además', 'también'
+        }
+        
+        filtered_words = [word for word in words if word not in stop_words]
+        word_freq = Counter(filtered_words)
+        
+        return [word for word, count in word_freq.most_common(15)]
+
+
+def get_job_profile(job_description: str) -> JobProfile:
+    """Perfil del puesto compilado una sola vez por descripción (caché por hash)"""
+    key = (content_hash(job_description or ""), PROFILE_VERSION)
+    profile = _profile_cache.get(key)
+    if profile is None:
+        profile = JobDescriptionAnalyzer().compile(job_description or "")
+        _profile_cache.set(key, profile)
+    return profile
+
+
+def get_profile_cache_stats() -> Dict[str, Any]:
+    """Contadores de la caché de perfiles de puesto"""
+    return _profile_cache.stats()
\ No newline at end of file
@@ -0,0 +1,329 @@
+import io
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from modules.cache import LRUCache, content_hash
+from modules.contexto import AnalysisContext
+from modules.procesador import MIME_TYPES, DocumentProcessor
+from modules.analizador import CVAnalyzer
+from modules.puntuador import ATSScorer
+from modules.perfil_puesto import JobProfile, get_job_profile
+from modules.mejorador_cv import CVImprovementAnalyzer
+from modules.metricas import timed
+from modules.trabajos import Job
+from modules.taxonomia import get_taxonomy
+
+if TYPE_CHECKING:
+    from modules.ranking import CandidateIndex
+
+# Versión de las reglas de extracción y puntuación.
+# Cambiarla invalida todos los resultados guardados en caché; incluye el hash de la taxonomía de habilidades.
+RULESET_VERSION = f"2+{get_taxonomy().version}"
+
+_analysis_cache = LRUCache(maxsize=int(os.getenv('ATS_ANALYSIS_CACHE_SIZE', '32')))
+
+# Características del CV independientes del puesto: editar la descripción no las desaloja
+_feature_cache = LRUCache(maxsize=int(os.getenv('ATS_FEATURE_CACHE_SIZE', '32')))
+
+# CVs analizados a la vez en el modo por lotes
+BATCH_WORKERS = int(os.getenv('ATS_BATCH_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+
+def analysis_cache_key(kind: str, file_bytes, file_type: str, job_description: str = "") -> Tuple[str, ...]:
+    """Clave por contenido: hash del archivo, de la descripción y versión de reglas"""
+    return (
+        kind,
+        content_hash(file_bytes),
+        file_type or "",
+        content_hash(job_description or ""),
+        RULESET_VERSION
+    )
+
+
+def analyze_uploaded_cv(uploaded_file, job_description: str = "") -> Dict[str, Any]:
+    """Ejecuta el análisis ATS completo de un archivo subido, memoizado por contenido
+
+    El resultado se comparte entre reruns: no debe modificarse.
+    """
+    return analyze_cv_bytes(uploaded_file.getbuffer(), uploaded_file.type, uploaded_file.name, job_description)
+
+
+def analyze_cv_bytes(data, file_type: Optional[str], file_name: str = "", job_description: str = "",
+                     profile: Optional[JobProfile] = None, processor: Optional[DocumentProcessor] = None) -> Dict[str, Any]:
+    """Análisis ATS completo de un documento en memoria, memoizado por contenido
+
+    Las características del CV se cachean aparte de la descripción del puesto:
+    al cambiar solo el puesto se vuelve a ejecutar únicamente el ATSScorer.
+    """
+    processor = processor or DocumentProcessor()
+    file_type = file_type or processor.guess_file_type(file_name)
+    with timed('analisis', len(data)) as record:
+        key = analysis_cache_key('ats', data, file_type, job_description)
+        cached = _analysis_cache.get(key)
+        if cached is not None:
+            record['cache_hit'] = True
+            return cached
+
+        features = extract_cv_features(data, file_type, file_name, processor)
+        if not features['success']:
+            record['error'] = True
+            return features
+
+        analysis = score_cv_features(features, job_description, profile)
+        _analysis_cache.set(key, analysis)
+        return analysis
+
+
+def extract_cv_features(data, file_type: Optional[str], file_name: str = "",
+                        processor: Optional[DocumentProcessor] = None,
+                        cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """Etapa independiente del puesto: extracción, extractores del CVAnalyzer y estadísticas
+
+    Memoizada por contenido del archivo; el resultado se comparte y no debe modificarse.
+    Si se activa cancel_event la extracción se detiene y no se guarda nada en caché.
+    """
+    processor = processor or DocumentProcessor()
+    file_type = file_type or processor.guess_file_type(file_name)
+    key = analysis_cache_key('cv', data, file_type)
+    cached = _feature_cache.get(key)
+    if cached is not None:
+        return cached
+
+    cv_text, success = processor.extract_text_from_bytes(data, file_type, file_name, cancel_event)
+    if not success:
+        # Los errores no se guardan: pueden ser transitorios
+        return {'success': False, 'error': cv_text}
+
+    features = cv_features_from_text(cv_text)
+    features['doc_stats'] = processor.get_document_stats(cv_text, features['context'].features)
+    # Un análisis cancelado no deja resultados que la interfaz muestre en el siguiente rerun
+    if not _is_cancelled(cancel_event):
+        _feature_cache.set(key, features)
+    return features
+
+
+def _is_cancelled(cancel_event: Optional[threading.Event]) -> bool:
+    return cancel_event is not None and cancel_event.is_set()
+
+
+def cv_features_from_text(cv_text: str) -> Dict[str, Any]:
+    """Habilidades, experiencia, educación, contacto y calidad de un texto ya extraído (sin caché)"""
+    context = AnalysisContext(cv_text)
+    analyzer = CVAnalyzer()
+    return {
+        'success': True,
+        'cv_text': cv_text,
+        'context': context,
+        'skills': analyzer.extract_skills(cv_text, context),
+        'experience': analyzer.extract_experience(cv_text, context),
+        'education': analyzer.extract_education(cv_text, context),
+        'contact_info': analyzer.extract_contact_info(cv_text, context),
+        'text_quality': analyzer.analyze_text_quality(cv_text, context)
+    }
+
+
+def score_cv_features(features: Dict[str, Any], job_description: str = "",
+                      profile: Optional[JobProfile] = None) -> Dict[str, Any]:
+    """Etapa de puntuación: solo el ATSScorer contra el puesto, sobre características ya calculadas"""
+    scorer = ATSScorer(job_description, profile)
+    results = scorer.calculate_adaptive_score(features['cv_text'], features['skills'], features['experience'],
+                                              features['education'], features['contact_info'], features['context'])
+    return {**features, 'results': results}
+
+
+def analyze_cv_text(cv_text: str, job_description: str = "", profile: Optional[JobProfile] = None) -> Dict[str, Any]:
+    """Análisis ATS de un texto ya extraído (sin caché ni estadísticas del documento)"""
+    return score_cv_features(cv_features_from_text(cv_text), job_description, profile)
+
+
+def improvement_report_for(cv_text: str, context: Optional[AnalysisContext] = None) -> Dict[str, Any]:
+    """Reporte de mejora de un texto, memoizado: no depende del puesto"""
+    key = ('mejora-texto', content_hash(cv_text), RULESET_VERSION)
+    cached = _feature_cache.get(key)
+    if cached is not None:
+        return cached
+    report = CVImprovementAnalyzer().generate_improvement_report(cv_text, context)
+    _feature_cache.set(key, report)
+    return report
+
+
+def iter_zip_documents(archive_file) -> Iterator[Tuple[str, bytes, Optional[str]]]:
+    """(nombre, contenido, tipo) de cada CV soportado dentro de un ZIP (ruta o archivo)"""
+    with zipfile.ZipFile(archive_file) as archive:
+        for member in archive.infolist():
+            base_name = os.path.basename(member.filename)
+            if member.is_dir() or base_name.startswith(('.', '~$')) or '__MACOSX' in member.filename:
+                continue
+            file_type = MIME_TYPES.get(os.path.splitext(base_name)[1].lower())
+            if file_type:
+                yield member.filename, archive.read(member), file_type
+
+
+def expand_uploads(uploaded_files) -> List[Tuple[str, bytes, Optional[str]]]:
+    """(nombre, contenido, tipo) de cada CV subido; los .zip se expanden como carpetas"""
+    documents = []
+    for uploaded_file in uploaded_files:
+        if uploaded_file.name.lower().endswith('.zip'):
+            documents.extend(iter_zip_documents(io.BytesIO(uploaded_file.getbuffer())))
+        else:
+            documents.append((uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type))
+    return documents
+
+
+def analyze_batch(documents: Iterable[Tuple[str, bytes, Optional[str]]], job_description: str = "",
+                  max_workers: int = BATCH_WORKERS,
+                  on_progress: Optional[Callable[[int, int, str], None]] = None,
+                  on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  cancel_event: Optional[threading.Event] = None,
+                  features_only: bool = False) -> List[Dict[str, Any]]:
+    """Analiza muchos CVs contra una misma descripción de puesto
+
+    El puesto se compila una sola vez y los documentos se procesan en un
+    pool de hilos. on_progress(completados, total, nombre) y on_item(item)
+    se invocan desde el hilo que llama a medida que terminan los CVs.
+    Retorna [{'name': ..., 'analysis': ...}] en el orden recibido; si se
+    activa cancel_event, solo los CVs que alcanzaron a terminar.
+    Con features_only no se ejecuta el ATSScorer: el lote se puntúa con el
+    índice de candidatos (modules.ranking).
+    """
+    documents = list(documents)
+    profile = get_job_profile(job_description)
+    processor = DocumentProcessor(notify=False)
+
+    def analyze(document):
+        name, data, file_type = document
+        try:
+            if features_only:
+                return extract_cv_features(data, file_type, name, processor, cancel_event)
+            return analyze_cv_bytes(data, file_type, name, job_description, profile, processor)
+        except Exception as e:
+            return {'success': False, 'error': f"Error analizando {name}: {str(e)}"}
+
+    batch: List[Optional[Dict[str, Any]]] = [None] * len(documents)
+    executor = ThreadPoolExecutor(max_workers=max(min(max_workers, len(documents)), 1), thread_name_prefix='lote')
+    cancelled = False
+    try:
+        futures = {executor.submit(analyze, document): index for index, document in enumerate(documents)}
+        for completed, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            batch[index] = {'name': documents[index][0], 'analysis': future.result()}
+            if on_item is not None:
+                on_item(batch[index])
+            if on_progress is not None:
+                on_progress(completed, len(documents), documents[index][0])
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+    finally:
+        # Al cancelar no se espera a los CVs en curso: sus resultados solo llegan a la caché
+        executor.shutdown(wait=not cancelled, cancel_futures=cancelled)
+    return [item for item in batch if item is not None]
+
+
+def ranking_rows(index: "CandidateIndex", profile: JobProfile, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Filas de la tabla de ranking: puntuación total y subpuntuaciones por CV, las top_k mejores primero
+
+    El índice se arma una sola vez por lote; puntuarlo contra otro puesto
+    no vuelve a procesar los CVs. Los fallidos van al final.
+    """
+    rows = [{**row, 'error': ""} for row in index.top_k(profile, top_k or len(index))]
+    return rows + [{'archivo': name, 'puntuacion_total': None, 'error': error} for name, error in list(index.failed)]
+
+
+def improve_uploaded_cv(uploaded_file) -> Dict[str, Any]:
+    """Genera el reporte de mejora de un archivo subido, memoizado por contenido"""
+    return improve_cv_bytes(uploaded_file.getbuffer(), uploaded_file.type, uploaded_file.name)
+
+
+def improve_cv_bytes(data, file_type: Optional[str], file_name: str = "",
+                     processor: Optional[DocumentProcessor] = None,
+                     on_stage: Optional[Callable[[float, str], None]] = None,
+                     cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """Reporte de mejora de un documento en memoria, memoizado por contenido (salvo si se cancela)"""
+    processor = processor or DocumentProcessor()
+    file_type = file_type or processor.guess_file_type(file_name)
+    key = analysis_cache_key('mejora', data, file_type)
+    cached = _analysis_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if on_stage is not None:
+        on_stage(0.1, "📄 Extrayendo texto del documento")
+    cv_text, success = processor.extract_text_from_bytes(data, file_type, file_name, cancel_event)
+    if not success:
+        return {'success': False, 'error': cv_text}
+
+    if on_stage is not None:
+        on_stage(0.6, "✨ Evaluando estructura, contenido y formato")
+    improvement_analyzer = CVImprovementAnalyzer()
+    analysis = {
+        'success': True,
+        'cv_text': cv_text,
+        'report': improvement_analyzer.generate_improvement_report(cv_text)
+    }
+    if not _is_cancelled(cancel_event):
+        _analysis_cache.set(key, analysis)
+    return analysis
+
+
+def has_cached_features(data, file_type: Optional[str]) -> bool:
+    """Si las características del CV ya están en caché (puntuarlo es inmediato)"""
+    return analysis_cache_key('cv', data, file_type) in _feature_cache
+
+
+def has_cached_improvement(data, file_type: Optional[str]) -> bool:
+    return analysis_cache_key('mejora', data, file_type) in _analysis_cache
+
+
+# Trabajos en segundo plano (modules.trabajos): function(job, ...) reporta avance con job.update,
+# que además es el punto de control donde se detienen al cancelarse; job.cancel_event detiene
+# también la extracción entre páginas y tareas de OCR
+
+def analysis_job(job: Job, data: bytes, file_type: Optional[str], file_name: str, job_description: str) -> Dict[str, Any]:
+    """Análisis ATS de un CV; job.partial recibe las características antes de puntuar"""
+    processor = DocumentProcessor(notify=False)
+    job.update(0.1, "📄 Extrayendo texto y analizando el CV")
+    features = extract_cv_features(data, file_type, file_name, processor, job.cancel_event)
+    job.check_cancelled()
+    if not features['success']:
+        return features
+    job.partial = features
+    job.update(0.8, "🎯 Puntuando contra el puesto")
+    return analyze_cv_bytes(data, file_type, file_name, job_description, processor=processor)
+
+
+def improvement_job(job: Job, data: bytes, file_type: Optional[str], file_name: str) -> Dict[str, Any]:
+    return improve_cv_bytes(data, file_type, file_name, DocumentProcessor(notify=False), on_stage=job.update,
+                            cancel_event=job.cancel_event)
+
+
+def batch_job(job: Job, documents: List[Tuple[str, bytes, Optional[str]]]) -> "CandidateIndex":
+    """Índice de candidatos de un lote; job.partial es el mismo índice mientras se llena
+
+    Solo se extraen las características, que no dependen del puesto: cambiar
+    la descripción vuelve a rankear el índice sin relanzar el lote.
+    """
+    # numpy se importa al rankear, no al arrancar
+    from modules.ranking import CandidateIndex
+    index = CandidateIndex()
+    job.partial = index
+
+    def update_progress(completed: int, total: int, name: str) -> None:
+        job.progress = completed / total
+        job.message = f"🔍 {completed}/{total} · {name}"
+
+    analyze_batch(documents, on_progress=update_progress, on_item=index.add_item,
+                  cancel_event=job.cancel_event, features_only=True)
+    return index
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Contadores de la caché de análisis del proceso"""
+    return _analysis_cache.stats()
+
+
+def get_feature_cache_stats() -> Dict[str, Any]:
+    """Contadores de la caché de características del CV (independiente del puesto)"""
+    return _feature_cache.stats()
\ No newline at end of file
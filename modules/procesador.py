@@ -1,86 +1,189 @@
-import PyPDF2
-from docx import Document
-import streamlit as st
+# PyPDF2, python-docx y streamlit se importan al usarse: el arranque no paga su carga
 import re
-import tempfile
+import io
 import os
-from typing import Optional, Tuple
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from modules.extractor_pdf import PARALLEL_PAGE_THRESHOLD, PDF_WORKERS, analyze_page, extract_pages_parallel
+from modules.ocr import OCR_AVAILABLE, OCR_DPI, OCR_LANG, ocr_pages
+from modules.cache import ExtractionCache, get_extraction_cache
+from modules.texto import TextFeatures
+from modules.metricas import timed
 
-try:
-    from pdf2image import convert_from_path
-    import pytesseract
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TXT_MIME = "text/plain"
+
+MIME_TYPES = {
+    '.pdf': PDF_MIME,
+    '.docx': DOCX_MIME,
+    '.txt': TXT_MIME
+}
+
+# Cambiarla al modificar la lógica de extracción invalida la caché persistente
+EXTRACTOR_VERSION = "1"
+
+CANCELLED_MESSAGE = "Extracción cancelada"
+
+
+@lru_cache(maxsize=None)
+def extraction_backend(file_type: Optional[str]) -> Optional[str]:
+    """Motor usado por tipo de archivo; forma parte de la clave de la caché"""
+    if file_type == PDF_MIME:
+        import PyPDF2
+        return f"pypdf2-{PyPDF2.__version__}+ocr-{OCR_LANG}-{OCR_DPI}"
+    return {DOCX_MIME: "python-docx", TXT_MIME: "text"}.get(file_type)
 
 class DocumentProcessor:
-    def __init__(self):
+    def __init__(self, parallel_page_threshold: int = PARALLEL_PAGE_THRESHOLD, pdf_workers: int = PDF_WORKERS,
+                 extraction_cache: Optional[ExtractionCache] = None, use_cache: bool = True, notify: bool = True):
         self.supported_formats = ['.pdf', '.docx', '.txt']
+        # Avisos de progreso en la interfaz (se desactivan al procesar lotes en hilos)
+        self.notify = notify
+        # PDFs largos se extraen por páginas en varios procesos
+        self.parallel_page_threshold = parallel_page_threshold
+        self.pdf_workers = pdf_workers
+        # Textos ya extraídos (sobre todo OCR) se reutilizan entre procesos y reinicios
+        self.extraction_cache = (extraction_cache or get_extraction_cache()) if use_cache else None
     
     def extract_text_from_uploaded_file(self, uploaded_file) -> Tuple[str, bool]:
         """Procesa archivos subidos a Streamlit y retorna texto y si fue exitoso"""
+        # getbuffer() expone el contenido en memoria sin copiarlo a disco
+        return self.extract_text_from_bytes(uploaded_file.getbuffer(), uploaded_file.type, uploaded_file.name)
+    
+    def extract_text_from_bytes(self, data, file_type: Optional[str] = None, file_name: str = "",
+                                cancel_event: Optional[threading.Event] = None) -> Tuple[str, bool]:
+        """Extrae texto directamente desde memoria (bytes o memoryview) y retorna si fue exitoso
+
+        Si se activa cancel_event, los PDFs dejan de extraerse entre páginas y
+        entre tareas de OCR, y el resultado es un fallo que no se guarda en caché.
+        """
+        with timed('extraccion', len(data)) as record:
+            text, success = self._extract_text(data, file_type, file_name, record, cancel_event)
+            record['error'] = not success
+            return text, success
+    
+    def _extract_text(self, data, file_type: Optional[str], file_name: str, record: Dict[str, Any],
+                      cancel_event: Optional[threading.Event] = None) -> Tuple[str, bool]:
         try:
-            # Crear archivo temporal
-            with tempfile.NamedTemporaryFile(delete=False, suffix=uploaded_file.name) as tmp_file:
-                tmp_file.write(uploaded_file.getbuffer())
-                temp_path = tmp_file.name
+            file_type = file_type or self.guess_file_type(file_name)
             
-            try:
-                # Extraer texto basado en el tipo de archivo
-                if uploaded_file.type == "application/pdf":
-                    text = self._extract_from_pdf(temp_path)
-                elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                    text = self._extract_from_docx(temp_path)
-                elif uploaded_file.type == "text/plain":
-                    text = self._extract_from_txt(temp_path)
-                else:
-                    return f"Tipo de archivo no soportado: {uploaded_file.type}", False
-                
-                # Verificar si se extrajo texto válido
-                if text and len(text.strip()) > 50:  # Mínimo 50 caracteres
-                    return text, True
-                else:
-                    return "No se pudo extraer texto suficiente del documento", False
-                    
-            finally:
-                # Limpiar archivo temporal
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+            cache_key = None
+            backend = extraction_backend(file_type) if self.extraction_cache is not None else None
+            if backend is not None:
+                cache_key = ExtractionCache.make_key(data, backend, EXTRACTOR_VERSION)
+                cached_text = self.extraction_cache.get(cache_key)
+                if cached_text is not None:
+                    record['cache_hit'] = True
+                    return cached_text, True
+            
+            # Extraer texto basado en el tipo de archivo
+            # complete es False si alguna página escaneada se quedó sin OCR: ese texto no se persiste
+            complete = True
+            if file_type == PDF_MIME:
+                text, complete = self._extract_from_pdf(data, cancel_event)
+            elif file_type == DOCX_MIME:
+                text = self._extract_from_docx(data)
+            elif file_type == TXT_MIME:
+                text = self._extract_from_txt(data)
+            else:
+                return f"Tipo de archivo no soportado: {file_type}", False
+            
+            if cancel_event is not None and cancel_event.is_set():
+                return CANCELLED_MESSAGE, False
+            
+            # Verificar si se extrajo texto válido
+            if text and len(text.strip()) > 50:  # Mínimo 50 caracteres
+                # Los mensajes de error no se persisten: pueden ser transitorios
+                if cache_key is not None and complete and not text.startswith(("Error", "No se pudo")):
+                    self.extraction_cache.set(cache_key, text)
+                return text, True
+            else:
+                return "No se pudo extraer texto suficiente del documento", False
                     
         except Exception as e:
             return f"Error procesando archivo: {str(e)}", False
     
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extrae texto de archivos PDF con manejo mejorado de errores"""
+    def guess_file_type(self, file_name: str) -> Optional[str]:
+        """Deduce el tipo MIME a partir de la extensión del archivo"""
+        return MIME_TYPES.get(os.path.splitext(file_name or "")[1].lower())
+    
+    def _extract_from_pdf(self, data, cancel_event: Optional[threading.Event] = None) -> Tuple[str, bool]:
+        """Extrae texto de archivos PDF; retorna también si todas las páginas que lo necesitaban pasaron por OCR"""
         try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                
-                if len(reader.pages) == 0:
-                    return "PDF vacío o corrupto"
-                
-                text = ""
-                pages_with_text = 0
-                
-                for i, page in enumerate(reader.pages):
-                    page_text = page.extract_text()
-                    if page_text and page_text.strip():
-                        text += f"--- Página {i+1} ---\n{page_text}\n\n"
-                        pages_with_text += 1
-                
-                if pages_with_text == 0 and OCR_AVAILABLE:
-                    st.info("📄 PDF parece ser escaneado. Usando OCR...")
-                    return self._extract_with_ocr(file_path)
-                
-                return text if text.strip() else "No se pudo extraer texto del PDF"
+            import PyPDF2
+            reader = PyPDF2.PdfReader(io.BytesIO(data))
+            
+            page_count = len(reader.pages)
+            if page_count == 0:
+                return "PDF vacío o corrupto", False
+            
+            pages = self._extract_pages(reader, data, page_count, cancel_event)
+            if cancel_event is not None and cancel_event.is_set():
+                return CANCELLED_MESSAGE, False
+            
+            # Solo las páginas sin capa de texto utilizable pasan por OCR
+            ocr_targets = [i + 1 for i, (_, page_needs_ocr) in enumerate(pages) if page_needs_ocr]
+            ocr_texts = {}
+            ocr_error = None
+            if ocr_targets and OCR_AVAILABLE:
+                if self.notify:
+                    import streamlit as st
+                    if len(ocr_targets) == page_count:
+                        st.info("📄 PDF parece ser escaneado. Usando OCR...")
+                    else:
+                        st.info(f"📄 {len(ocr_targets)} de {page_count} páginas parecen escaneadas. Usando OCR en ellas...")
+                try:
+                    ocr_texts = self._extract_with_ocr(data, ocr_targets, cancel_event)
+                except Exception as e:
+                    ocr_error = e
+            
+            text_parts = []
+            for page_number, (page_text, _) in enumerate(pages, 1):
+                ocr_text = ocr_texts.get(page_number, "")
+                if ocr_text.strip():
+                    text_parts.append(f"--- Página {page_number} (OCR) ---\n{ocr_text}\n\n")
+                elif page_text and page_text.strip():
+                    text_parts.append(f"--- Página {page_number} ---\n{page_text}\n\n")
+            
+            # Sin OCR en esta réplica o con OCR fallido el texto es parcial: otra ejecución puede completarlo
+            complete = all(page_number in ocr_texts for page_number in ocr_targets)
+            
+            text = "".join(text_parts)
+            if text.strip():
+                return text, complete
+            if ocr_error is not None:
+                return f"Error en OCR: {str(ocr_error)}", False
+            return "No se pudo extraer texto del PDF", False
                 
         except Exception as e:
-            return f"Error procesando PDF: {str(e)}"
+            return f"Error procesando PDF: {str(e)}", False
+    
+    def _extract_pages(self, reader, data, page_count: int,
+                       cancel_event: Optional[threading.Event] = None) -> List[Tuple[str, bool]]:
+        """(texto, requiere_ocr) de cada página en orden, en paralelo para documentos largos
+
+        En modo secuencial se deja de extraer al activarse cancel_event.
+        """
+        if self.pdf_workers > 1 and page_count >= self.parallel_page_threshold:
+            try:
+                return extract_pages_parallel(data, page_count, self.pdf_workers)
+            except Exception as e:
+                print(f"Extracción paralela no disponible, usando modo secuencial: {e}")
+        
+        pages = []
+        for page in reader.pages:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            pages.append(analyze_page(page))
+        return pages
     
-    def _extract_from_docx(self, file_path: str) -> str:
+    def _extract_from_docx(self, data) -> str:
         """Extrae texto de archivos Word con formato mejorado"""
         try:
-            doc = Document(file_path)
+            from docx import Document
+            doc = Document(io.BytesIO(data))
             text_parts = []
             
             for paragraph in doc.paragraphs:
@@ -102,53 +205,43 @@ class DocumentProcessor:
         except Exception as e:
             return f"Error procesando DOCX: {str(e)}"
     
-    def _extract_from_txt(self, file_path: str) -> str:
+    def _extract_from_txt(self, data) -> str:
         """Extrae texto de archivos TXT con múltiples codificaciones"""
         encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1', 'windows-1252']
+        raw = bytes(data)
         
         for encoding in encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    content = file.read()
-                    if content.strip():
-                        return content
+                # Normalizar saltos de línea como lo haría open() en modo texto
+                content = raw.decode(encoding).replace('\r\n', '\n').replace('\r', '\n')
+                if content.strip():
+                    return content
             except UnicodeDecodeError:
                 continue
         
         return "No se pudo decodificar el archivo de texto con ninguna codificación común"
     
-    def _extract_with_ocr(self, file_path: str) -> str:
-        """Usa OCR para PDFs escaneados con manejo de errores"""
+    def _extract_with_ocr(self, data, page_numbers: List[int],
+                          cancel_event: Optional[threading.Event] = None) -> Dict[int, str]:
+        """Aplica OCR a las páginas indicadas (numeradas desde 1) y retorna su texto"""
         if not OCR_AVAILABLE:
-            return "OCR no disponible. Instala pdf2image y pytesseract para esta funcionalidad."
+            return {}
         
-        try:
-            images = convert_from_path(file_path, dpi=300)
-            text = ""
-            
-            for i, image in enumerate(images):
-                page_text = pytesseract.image_to_string(image, lang='spa')
-                if page_text.strip():
-                    text += f"--- Página {i+1} (OCR) ---\n{page_text}\n\n"
-            
-            return text if text.strip() else "OCR no pudo extraer texto"
-            
-        except Exception as e:
-            return f"Error en OCR: {str(e)}"
+        # Rasterizado página a página con concurrencia acotada
+        with timed('ocr', len(page_numbers)):
+            return ocr_pages(data, page_numbers, cancel_event=cancel_event)
     
-    def get_document_stats(self, text: str) -> dict:
+    def get_document_stats(self, text: str, features: Optional[TextFeatures] = None) -> dict:
         """Obtiene estadísticas del documento"""
         if not text or text.startswith("Error") or text.startswith("No se pudo"):
             return {}
         
-        words = text.split()
-        lines = text.split('\n')
-        paragraphs = [p for p in text.split('\n\n') if p.strip()]
+        features = features or TextFeatures(text)
         
         return {
             'caracteres': len(text),
-            'palabras': len(words),
-            'lineas': len(lines),
-            'parrafos': len(paragraphs),
-            'densidad_palabras': len(words) / max(len(lines), 1)
+            'palabras': features.word_count,
+            'lineas': features.line_count,
+            'parrafos': features.paragraph_count,
+            'densidad_palabras': features.word_count / max(features.line_count, 1)
         }
\ No newline at end of file
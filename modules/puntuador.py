@@ -1,253 +1,29 @@
-import re
-import spacy
-from collections import Counter
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
+from modules.contexto import AnalysisContext, ensure_context
+from modules.perfil_puesto import JobProfile, get_job_profile
+from modules.metricas import timed_stage
 
 class ATSScorer:
-    def __init__(self, job_description: str = ""):
-        try:
-            self.nlp = spacy.load("es_core_news_sm")
-            self.spacy_available = True
-        except OSError:
-            self.nlp = None
-            self.spacy_available = False
-        
+    def __init__(self, job_description: str = "", profile: Optional[JobProfile] = None):
+        # Perfil del puesto compilado una sola vez por descripción y compartido
+        self.profile = profile if profile is not None else get_job_profile(job_description)
         self.job_description = job_description
-        self.job_analysis = self._analyze_job_description(job_description)
+        self.job_analysis = self.profile.analysis
         self.job_keywords = self.job_analysis['keywords']
         self.required_skills = self.job_analysis['required_skills']
         self.job_requirements = self.job_analysis['requirements']
     
-    def _analyze_job_description(self, job_description: str) -> Dict[str, Any]:
-        """Analiza profundamente la descripción del puesto para extraer requisitos"""
-        if not job_description.strip():
-            return {
-                'keywords': [],
-                'required_skills': {},
-                'requirements': {},
-                'has_description': False
-            }
-        
-        jd_lower = job_description.lower()
-        
-        # 1. Extraer keywords principales
-        keywords = self._extract_job_keywords(job_description)
-        
-        # 2. Identificar habilidades requeridas
-        required_skills = self._identify_required_skills(jd_lower)
-        
-        # 3. Extraer requisitos específicos
-        requirements = self._extract_specific_requirements(jd_lower)
-        
-        # 4. Detectar nivel de seniority
-        seniority = self._detect_seniority(jd_lower)
-        
-        # 5. Identificar industrias/áreas
-        industries = self._identify_industries(jd_lower)
-        
-        return {
-            'keywords': keywords,
-            'required_skills': required_skills,
-            'requirements': requirements,
-            'seniority': seniority,
-            'industries': industries,
-            'has_description': True
-        }
-    
-    def _extract_job_keywords(self, job_description: str) -> List[str]:
-        """Extrae palabras clave específicas del puesto"""
-        if not job_description.strip():
-            return []
-        
-        if self.spacy_available:
-            try:
-                doc = self.nlp(job_description.lower())
-                keywords = []
-                
-                # Extraer términos técnicos y específicos
-                technical_terms = []
-                for token in doc:
-                    if (token.pos_ in ['NOUN', 'PROPN'] and 
-                        len(token.text) > 3 and 
-                        not token.is_stop):
-                        technical_terms.append(token.lemma_.lower())
-                
-                # Extraer frases compuestas (bigrams)
-                bigrams = []
-                for i in range(len(doc) - 1):
-                    if (doc[i].pos_ in ['NOUN', 'ADJ'] and 
-                        doc[i+1].pos_ in ['NOUN', 'PROPN'] and
-                        not doc[i].is_stop and not doc[i+1].is_stop):
-                        bigram = f"{doc[i].text} {doc[i+1].text}"
-                        bigrams.append(bigram.lower())
-                
-                # Combinar y priorizar
-                all_terms = technical_terms + bigrams
-                term_freq = Counter(all_terms)
-                
-                # Filtrar términos muy genéricos
-                generic_terms = {'experiencia', 'trabajo', 'empresa', 'puesto', 'equipo'}
-                filtered_terms = [term for term, count in term_freq.most_common(25) 
-                                if term not in generic_terms]
-                
-                return filtered_terms
-                
-            except Exception as e:
-                print(f"Error con spaCy en keywords: {e}")
-        
-        # Fallback básico
-        return self._extract_keywords_basic(job_description)
-    
-    def _identify_required_skills(self, jd_lower: str) -> Dict[str, List[str]]:
-        """Identifica habilidades específicamente requeridas"""
-        skills_categories = {
-            'lenguajes_programacion': {
-                'keywords': ['python', 'java', 'javascript', 'typescript', 'c#', 'php', 'ruby', 'go', 'rust', 'swift'],
-                'found': []
-            },
-            'frameworks': {
-                'keywords': ['react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring', 'laravel', 'express'],
-                'found': []
-            },
-            'bases_datos': {
-                'keywords': ['sql', 'mysql', 'postgresql', 'mongodb', 'oracle', 'redis', 'sql server'],
-                'found': []
-            },
-            'herramientas_devops': {
-                'keywords': ['docker', 'kubernetes', 'aws', 'azure', 'gcp', 'jenkins', 'git', 'github', 'gitlab'],
-                'found': []
-            },
-            'analisis_datos': {
-                'keywords': ['machine learning', 'data science', 'pandas', 'numpy', 'tensorflow', 'pytorch', 'tableau', 'power bi'],
-                'found': []
-            },
-            'metodologias': {
-                'keywords': ['agile', 'scrum', 'kanban', 'devops', 'ci/cd'],
-                'found': []
-            },
-            'habilidades_blandas': {
-                'keywords': ['trabajo en equipo', 'comunicación', 'liderazgo', 'resolución de problemas', 'adaptabilidad', 'proactividad'],
-                'found': []
-            }
-        }
-        
-        for category, data in skills_categories.items():
-            for skill in data['keywords']:
-                if skill in jd_lower:
-                    data['found'].append(skill)
-        
-        # Devolver solo las categorías con habilidades encontradas
-        return {category: data['found'] for category, data in skills_categories.items() if data['found']}
-    
-    def _extract_specific_requirements(self, jd_lower: str) -> Dict[str, Any]:
-        """Extrae requisitos específicos como años de experiencia, educación, etc."""
-        requirements = {}
-        
-        # Años de experiencia requeridos
-        exp_patterns = [
-            r'(\d+)\s*(\+)?\s*años?\s*de\s*experiencia',
-            r'experiencia\s*de\s*(\d+)\s*años?',
-            r'mínimo\s*de\s*(\d+)\s*años?',
-            r'(\d+)\s*años?\s*en\s*puestos?\s*similares'
-        ]
-        
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, jd_lower)
-            if matches:
-                for match in matches:
-                    if isinstance(match, tuple) and match[0].isdigit():
-                        requirements['años_experiencia'] = int(match[0])
-                        break
-                    elif isinstance(match, str) and match.isdigit():
-                        requirements['años_experiencia'] = int(match)
-                        break
-        
-        # Nivel educativo requerido
-        education_levels = {
-            'bachiller': ['bachiller', 'secundaria'],
-            'tecnico': ['técnico', 'tecnólogo'],
-            'pregrado': ['licenciatura', 'grado', 'ingeniería', 'universitario'],
-            'posgrado': ['maestría', 'master', 'doctorado', 'postgrado']
-        }
-        
-        for level, keywords in education_levels.items():
-            if any(keyword in jd_lower for keyword in keywords):
-                requirements['nivel_educativo'] = level
-                break
-        
-        # Idiomas requeridos
-        languages = ['inglés', 'español', 'francés', 'alemán', 'portugués']
-        found_languages = [lang for lang in languages if lang in jd_lower]
-        if found_languages:
-            requirements['idiomas'] = found_languages
-        
-        # Tipo de contrato/jornada
-        contract_types = ['tiempo completo', 'medio tiempo', 'remoto', 'presencial', 'híbrido']
-        found_contracts = [ct for ct in contract_types if ct in jd_lower]
-        if found_contracts:
-            requirements['tipo_contrato'] = found_contracts
-        
-        return requirements
-    
-    def _detect_seniority(self, jd_lower: str) -> str:
-        """Detecta el nivel de seniority del puesto"""
-        junior_keywords = ['junior', 'trainee', 'principiante', 'entry level', 'recién graduado']
-        senior_keywords = ['senior', 'experto', 'avanzado', 'lead', 'principal', 'arquitecto']
-        mid_keywords = ['semi-senior', 'semi senior', 'mid-level', 'intermedio']
-        
-        if any(keyword in jd_lower for keyword in senior_keywords):
-            return 'senior'
-        elif any(keyword in jd_lower for keyword in mid_keywords):
-            return 'mid-level'
-        elif any(keyword in jd_lower for keyword in junior_keywords):
-            return 'junior'
-        else:
-            return 'no especificado'
-    
-    def _identify_industries(self, jd_lower: str) -> List[str]:
-        """Identifica industrias o áreas específicas"""
-        industries = {
-            'tecnologia': ['tecnología', 'software', 'it', 'sistemas', 'desarrollo'],
-            'finanzas': ['finanzas', 'bancario', 'fintech', 'contabilidad'],
-            'salud': ['salud', 'médico', 'farmacéutico', 'hospital'],
-            'educacion': ['educación', 'académico', 'enseñanza', 'universidad'],
-            'retail': ['retail', 'comercio', 'ventas', 'ecommerce'],
-            'manufactura': ['manufactura', 'producción', 'industrial', 'fábrica']
-        }
-        
-        found_industries = []
-        for industry, keywords in industries.items():
-            if any(keyword in jd_lower for keyword in keywords):
-                found_industries.append(industry)
-        
-        return found_industries
-    
-    def _extract_keywords_basic(self, job_description: str) -> List[str]:
-        """Método básico de extracción de keywords"""
-        text = job_description.lower()
-        text = re.sub(r'[^\w\s]', ' ', text)
-        words = re.findall(r'\b[a-záéíóúñ]{4,}\b', text)
-        
-        stop_words = {
-            'para', 'con', 'del', 'los', 'las', 'por', 'como', 'más', 'sus',
-            'este', 'esta', 'esto', 'tiene', 'debe', 'puede', 'trabajo',
-            'empresa', 'puesto', 'equipo', 'nuestro', 'nuestra', 'busca',
-            'buscamos', 'responsable', 'encargado', 'funciones', 'tareas',
-            'deben', 'deberá', 'necesario', 'importante', 'además', 'también'
-        }
-        
-        filtered_words = [word for word in words if word not in stop_words]
-        word_freq = Counter(filtered_words)
-        
-        return [word for word, count in word_freq.most_common(15)]
-    
-    def calculate_adaptive_score(self, cv_text: str, skills: Dict, experience: Dict, education: Dict, contact_info: Dict) -> Dict[str, Any]:
+    @timed_stage('puntuacion')
+    def calculate_adaptive_score(self, cv_text: str, skills: Dict, experience: Dict, education: Dict, contact_info: Dict, context: Optional[AnalysisContext] = None) -> Dict[str, Any]:
         """Calcula puntuación ADAPTADA específicamente al puesto"""
-        cv_text_lower = cv_text.lower()
-        
         if not self.job_analysis['has_description']:
             return self._calculate_generic_score(cv_text, skills, experience, education, contact_info)
         
+        context = ensure_context(cv_text, context)
+        cv_text_lower = context.text_lower
+        # Keywords del puesto presentes en el CV (una sola pasada del buscador)
+        cv_keywords = context.found_terms(self.profile.matcher)
+        
         scores = {}
         
         # 1. Score de ADAPTACIÓN a requisitos específicos (35%)
@@ -263,7 +39,7 @@ class ATSScorer:
         scores['experiencia_especifica'] = specific_experience_score
         
         # 4. Score de KEYWORDS del puesto (15%)
-        keyword_score = self._calculate_keyword_score(cv_text_lower)
+        keyword_score = self._calculate_keyword_score(cv_keywords)
         scores['keywords_puesto'] = keyword_score
         
         # 5. Score de COMPATIBILIDAD general (5%)
@@ -285,7 +61,7 @@ class ATSScorer:
             'puntuacion_total': round(total_score, 1),
             'desglose_adaptado': scores,
             'analisis_puesto': self.job_analysis,
-            'match_detallado': self._get_detailed_match(cv_text_lower, skills, experience, education),
+            'match_detallado': self._get_detailed_match(cv_keywords, skills, experience, education),
             'recomendaciones_especificas': self._generate_job_specific_recommendations(total_score, scores, skills, experience, education)
         }
     
@@ -383,12 +159,12 @@ class ATSScorer:
         
         return min(score, 100)
     
-    def _calculate_keyword_score(self, cv_text_lower: str) -> float:
+    def _calculate_keyword_score(self, cv_keywords: Set[str]) -> float:
         """Calcula score basado en keywords específicas del puesto"""
         if not self.job_analysis['keywords']:
             return 50.0
         
-        matches = sum(1 for keyword in self.job_analysis['keywords'] if keyword in cv_text_lower)
+        matches = sum(1 for keyword in self.job_analysis['keywords'] if keyword in cv_keywords)
         return (matches / len(self.job_analysis['keywords'])) * 100
     
     def _calculate_compatibility_score(self, experience: Dict, education: Dict) -> float:
@@ -428,7 +204,7 @@ class ATSScorer:
             'recomendaciones_especificas': ["ℹ️ Agrega una descripción del puesto para un análisis más preciso"]
         }
     
-    def _get_detailed_match(self, cv_text_lower: str, skills: Dict, experience: Dict, education: Dict) -> Dict[str, Any]:
+    def _get_detailed_match(self, cv_keywords: Set[str], skills: Dict, experience: Dict, education: Dict) -> Dict[str, Any]:
         """Proporciona un match detallado entre CV y puesto"""
         match_details = {
             'habilidades_coincidentes': {},
@@ -461,7 +237,7 @@ class ATSScorer:
         # Keywords coincidentes
         match_details['keywords_coincidentes'] = [
             kw for kw in self.job_analysis['keywords'] 
-            if kw in cv_text_lower
+            if kw in cv_keywords
         ]
         
         return match_details
@@ -487,7 +263,7 @@ class ATSScorer:
         
         # Recomendaciones de keywords
         if scores['keywords_puesto'] < 70:
-            missing_keywords = [kw for kw in self.job_analysis['keywords'][:5] if kw not in self._get_detailed_match("", skills, experience, education)['keywords_coincidentes']]
+            missing_keywords = [kw for kw in self.job_analysis['keywords'][:5] if kw not in self._get_detailed_match(set(), skills, experience, education)['keywords_coincidentes']]
             if missing_keywords:
                 recommendations.append(f"🔍 **Incluye estas palabras clave:** {', '.join(missing_keywords[:3])}")
         
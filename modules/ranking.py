@@ -0,0 +1,262 @@
+import re
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from modules.buscador import get_matcher
+from modules.perfil_puesto import JobProfile
+
+# Palabras de los términos que se indexan de antemano; los más largos se buscan al puntuar
+MAX_TERM_WORDS = 3
+
+# Escalas usadas por ATSScorer, replicadas en forma vectorial
+SENIORITY_POINTS = {'junior': 10, 'mid-level': 20, 'senior': 30}
+EDUCATION_RANK = {'bachiller': 1, 'tecnico': 2, 'pregrado': 3, 'posgrado': 4}
+SCORE_WEIGHTS = {
+    'adaptacion': 0.35,
+    'habilidades_requeridas': 0.25,
+    'experiencia_especifica': 0.20,
+    'keywords_puesto': 0.15,
+    'compatibilidad': 0.05
+}
+
+_WORD_RE = re.compile(r'\w+')
+# Empieza y termina en carácter de palabra (\w equivale al borde de palabra del buscador)
+_BOUNDED_RE = re.compile(r'\w(?:.*\w)?', re.DOTALL)
+
+
+def text_terms(text_lower: str, max_words: int = MAX_TERM_WORDS) -> Set[str]:
+    """Términos que KeywordMatcher encontraría en el texto, de hasta max_words palabras
+
+    Son los fragmentos literales que empiezan y terminan en borde de palabra
+    (con los separadores tal como aparecen: "desarrollo\\nweb" no equivale a
+    "desarrollo web"), más su singular si terminan en "s" o "es".
+    """
+    words = [(match.start(), match.end()) for match in _WORD_RE.finditer(text_lower)]
+    terms = set()
+    for i, (start, _) in enumerate(words):
+        for _, end in words[i:i + max_words]:
+            term = text_lower[start:end]
+            terms.add(term)
+            # Plural aceptado por el buscador: el término tiene 4 o más letras y termina en letra
+            if term.endswith('s') and len(term) >= 5 and term[-2].isalpha():
+                terms.add(term[:-1])
+                if term.endswith('es') and len(term) >= 6 and term[-3].isalpha():
+                    terms.add(term[:-2])
+    return terms
+
+
+def _is_precomputed(term: str) -> bool:
+    """Si text_terms cubre el término: empieza y termina en letra o dígito y no es muy largo"""
+    return _BOUNDED_RE.fullmatch(term) is not None and len(_WORD_RE.findall(term)) <= MAX_TERM_WORDS
+
+
+class CandidateIndex:
+    """Índice de CVs analizados para puntuarlos en bloque contra cualquier puesto
+
+    Cada CV se guarda una sola vez como listas invertidas (término -> filas),
+    es decir, las columnas de una matriz dispersa de presencia. Puntuar un
+    puesto nuevo arma solo las columnas de sus keywords y habilidades y
+    calcula todas las subpuntuaciones de ATSScorer con operaciones de NumPy.
+    Se puede consultar mientras otro hilo le agrega CVs.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        # CVs que no se pudieron analizar: (nombre, error)
+        self.failed: List[Tuple[str, str]] = []
+        self._postings: Dict[str, Dict[str, array]] = {'keywords': {}, 'tecnicas': {}, 'blandas': {}}
+        # Keywords que text_terms no cubre ("c++", ".net"): se buscan en los textos la primera vez que se piden
+        self._scanned_keywords: List[str] = []
+        self._texts: List[str] = []
+        self._years: List[float] = []
+        self._companies: List[int] = []
+        self._periods: List[int] = []
+        self._education: List[int] = []
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _post(self, group: str, terms: Iterable[str], row: int) -> None:
+        postings = self._postings[group]
+        for term in terms:
+            rows = postings.get(term)
+            if rows is None:
+                rows = postings[term] = array('I')
+            rows.append(row)
+
+    def add(self, name: str, analysis: Dict[str, Any]) -> bool:
+        """Agrega un CV a partir de sus características (extract_cv_features); los fallidos quedan en failed"""
+        with self._lock:
+            if not analysis.get('success'):
+                self.failed.append((name, analysis.get('error', "")))
+                return False
+
+            row = len(self.names)
+            skills = analysis['skills']
+            experience = analysis['experience']
+            education = analysis['education']
+            text_lower = analysis['context'].text_lower
+
+            self._post('keywords', text_terms(text_lower), row)
+            if self._scanned_keywords:
+                self._post('keywords', get_matcher(tuple(self._scanned_keywords)).found(text_lower), row)
+            self._post('tecnicas', set(skills.get('tecnicas', [])), row)
+            self._post('blandas', set(skills.get('blandas', [])), row)
+
+            self.names.append(name)
+            self._texts.append(text_lower)
+            self._years.append(experience.get('años_experiencia', 0) or 0)
+            self._companies.append(len(experience.get('empresas', [])))
+            self._periods.append(experience.get('periodos_encontrados', 0) or 0)
+            self._education.append(max([EDUCATION_RANK.get(level, 0) for level in education.get('niveles', {})] or [0]))
+            self._arrays = None
+            return True
+
+    def add_item(self, item: Dict[str, Any]) -> bool:
+        """add() para los elementos de analyze_batch ({'name', 'analysis'})"""
+        return self.add(item['name'], item['analysis'])
+
+    def _scan_keywords(self, keywords: Iterable[str]) -> None:
+        """Busca en todos los textos las keywords que text_terms no cubre y aún no se buscaron"""
+        missing = [keyword for keyword in dict.fromkeys(keywords)
+                   if keyword and not _is_precomputed(keyword) and keyword not in self._scanned_keywords]
+        if not missing:
+            return
+        matcher = get_matcher(tuple(missing))
+        for row, text_lower in enumerate(self._texts):
+            self._post('keywords', matcher.found(text_lower), row)
+        self._scanned_keywords.extend(missing)
+
+    def _numeric(self) -> Dict[str, np.ndarray]:
+        """Atributos numéricos como arreglos (se recalculan solo tras agregar CVs)"""
+        if self._arrays is None:
+            self._arrays = {
+                'years': np.asarray(self._years, dtype=np.float64),
+                'companies': np.asarray(self._companies, dtype=np.float64),
+                'periods': np.asarray(self._periods, dtype=np.float64),
+                'education': np.asarray(self._education, dtype=np.int8)
+            }
+        return self._arrays
+
+    def presence_matrix(self, group: str, terms: List[str]) -> np.ndarray:
+        """Matriz booleana CVs x términos a partir de las listas invertidas"""
+        matrix = np.zeros((len(self.names), len(terms)), dtype=bool)
+        postings = self._postings[group]
+        for column, term in enumerate(terms):
+            rows = postings.get(term)
+            if rows is not None:
+                matrix[np.frombuffer(rows, dtype=np.uint32), column] = True
+        return matrix
+
+    def score(self, profile: JobProfile) -> Dict[str, np.ndarray]:
+        """Subpuntuaciones y puntuación total de todos los CVs contra un puesto"""
+        with self._lock:
+            return self._score(profile)
+
+    def _score(self, profile: JobProfile) -> Dict[str, np.ndarray]:
+        count = len(self.names)
+        if not profile.has_description:
+            return {'puntuacion_total': np.full(count, 50.0)}
+
+        numeric = self._numeric()
+        years = numeric['years']
+
+        # Habilidades requeridas: blandas contra las blandas del CV, el resto contra las técnicas
+        matched_skills = np.zeros(count)
+        required_total = 0
+        for category, category_skills in profile.required_skills:
+            group = 'blandas' if category == 'habilidades_blandas' else 'tecnicas'
+            matched_skills += self.presence_matrix(group, list(category_skills)).sum(axis=1)
+            required_total += len(category_skills)
+
+        # 1. Adaptación
+        adaptation = np.zeros(count)
+        required_years = profile.years_required
+        if required_years:
+            adaptation += np.select(
+                [years <= 0, years >= required_years, years >= required_years * 0.7],
+                [0, 30, 20],
+                default=10
+            )
+        if profile.seniority != 'no especificado':
+            adaptation += SENIORITY_POINTS.get(profile.seniority, 15)
+        if required_total:
+            adaptation += matched_skills / required_total * 40
+        adaptation = np.minimum(adaptation, 100)
+
+        # 2. Habilidades requeridas
+        if required_total:
+            required_skills = matched_skills / required_total * 100
+        else:
+            required_skills = np.full(count, 50.0)
+
+        # 3. Experiencia específica
+        if required_years:
+            experience = np.where(years >= required_years, 60, years / required_years * 60)
+        else:
+            experience = np.minimum(years * 10, 60)
+        experience = experience + np.minimum(numeric['companies'] * 5, 20) + np.minimum(numeric['periods'] * 4, 20)
+        experience = np.minimum(experience, 100)
+
+        # 4. Keywords del puesto
+        if profile.keywords:
+            # Mismas reglas que context.found_terms(profile.matcher) en ATSScorer
+            self._scan_keywords(profile.keywords)
+            keywords = list(profile.keywords)
+            keyword_score = self.presence_matrix('keywords', keywords).sum(axis=1) / len(keywords) * 100
+        else:
+            keyword_score = np.full(count, 50.0)
+
+        # 5. Compatibilidad
+        compatibility = np.zeros(count)
+        if profile.education_level:
+            compatibility += np.where(numeric['education'] >= EDUCATION_RANK.get(profile.education_level, 0), 50, 0)
+        if profile.industries:
+            compatibility += 50
+
+        scores = {
+            'adaptacion': adaptation,
+            'habilidades_requeridas': required_skills,
+            'experiencia_especifica': experience,
+            'keywords_puesto': keyword_score,
+            'compatibilidad': compatibility
+        }
+        scores['puntuacion_total'] = sum(scores[category] * weight for category, weight in SCORE_WEIGHTS.items())
+        return scores
+
+    def top_k(self, profile: JobProfile, k: int = 10) -> List[Dict[str, Any]]:
+        """Los k mejores CVs para el puesto, con sus subpuntuaciones
+
+        Usa una selección parcial (np.partition) y ordena solo los k elegidos.
+        Los empates se resuelven por orden de llegada al índice.
+        """
+        if not self.names or k <= 0:
+            return []
+
+        scores = self.score(profile)
+        total = scores['puntuacion_total']
+        k = min(k, len(total))
+        threshold = np.partition(total, len(total) - k)[len(total) - k]
+        above = np.flatnonzero(total > threshold)
+        tied = np.flatnonzero(total == threshold)[:k - len(above)]
+        candidates = np.concatenate([above, tied])
+        candidates = candidates[np.lexsort((candidates, -total[candidates]))]
+
+        rows = []
+        for index in candidates:
+            row: Dict[str, Any] = {'archivo': self.names[index], 'puntuacion_total': round(float(total[index]), 1)}
+            for category in SCORE_WEIGHTS:
+                if category in scores:
+                    row[category] = round(float(scores[category][index]), 1)
+            rows.append(row)
+        return rows
+
+
+def build_index(batch: List[Dict[str, Any]]) -> Tuple[CandidateIndex, List[str]]:
+    """Índice a partir de la salida de analyze_batch; retorna también los archivos omitidos"""
+    index = CandidateIndex()
+    skipped = [item['name'] for item in batch if not index.add_item(item)]
+    return index, skipped
\ No newline at end of file
@@ -0,0 +1,92 @@
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from modules.buscador import TermMatch
+from modules.cache import content_hash
+
+# Archivo con habilidades, alias y categorías (ATS_TAXONOMY_PATH permite usar otro)
+TAXONOMY_PATH = os.getenv('ATS_TAXONOMY_PATH', os.path.join(os.path.dirname(__file__), 'taxonomia_habilidades.json'))
+
+TECHNICAL = 'tecnica'
+SOFT = 'blanda'
+
+
+class SkillTaxonomy:
+    """Taxonomía de habilidades compilada en tablas hash con IDs enteros
+
+    Cada habilidad canónica tiene un ID (su posición en el archivo) y tanto
+    su nombre como sus alias apuntan a ese ID: clasificar una habilidad es
+    una búsqueda en un diccionario, sin importar cuántas haya.
+    """
+
+    def __init__(self, data: Dict[str, Any], version: str):
+        self.version = version
+        self.category_groups: Dict[str, str] = {}
+        # Categorías genéricas: se detectan en el CV, pero no se categorizan ni se exigen como requisito
+        self.generic_categories = set()
+        for category, info in data['categorias'].items():
+            if info['grupo'] not in (TECHNICAL, SOFT):
+                raise ValueError(f"Grupo desconocido en la taxonomía: {info['grupo']} ({category})")
+            self.category_groups[category] = info['grupo']
+            if info.get('generica'):
+                self.generic_categories.add(category)
+
+        names: List[str] = []
+        categories: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for entry in data['habilidades']:
+            name = entry['nombre'].lower()
+            category = entry['categoria']
+            if category not in self.category_groups:
+                raise ValueError(f"Categoría desconocida en la taxonomía: {category} ({name})")
+            skill_id = len(names)
+            names.append(name)
+            categories.append(category)
+            for term in [name] + [alias.lower() for alias in entry.get('alias', ())]:
+                if term in self.ids:
+                    raise ValueError(f"Término repetido en la taxonomía: {term}")
+                self.ids[term] = skill_id
+
+        self.names: Tuple[str, ...] = tuple(names)
+        self.categories: Tuple[str, ...] = tuple(categories)
+        self.groups: Tuple[str, ...] = tuple(self.category_groups[category] for category in categories)
+        # Nombres y alias: el vocabulario que buscan los analizadores
+        self.terms: Tuple[str, ...] = tuple(self.ids)
+
+    def skill_id(self, term: str) -> Optional[int]:
+        """ID de la habilidad a la que corresponde un nombre o alias"""
+        return self.ids.get(term.lower())
+
+    def category(self, skill: str) -> Optional[str]:
+        skill_id = self.ids.get(skill)
+        return self.categories[skill_id] if skill_id is not None else None
+
+    def is_generic(self, skill_id: int) -> bool:
+        return self.categories[skill_id] in self.generic_categories
+
+    def skills_in(self, matches: Iterable[TermMatch]) -> List[int]:
+        """IDs de las habilidades presentes entre las coincidencias de un buscador, en orden de la taxonomía
+
+        Un alias dentro de una coincidencia más larga no cuenta: "js" en "node.js".
+        """
+        found = set()
+        covered_until = -1
+        for match in sorted(matches, key=lambda match: (match.start, -match.end)):
+            skill_id = self.ids.get(match.term)
+            if skill_id is not None and (match.term == self.names[skill_id] or match.end > covered_until):
+                found.add(skill_id)
+            covered_until = max(covered_until, match.end)
+        return sorted(found)
+
+
+@lru_cache(maxsize=None)
+def load_taxonomy(path: str = TAXONOMY_PATH) -> SkillTaxonomy:
+    """Lee y compila la taxonomía una sola vez por proceso; su versión es el hash del archivo"""
+    with open(path, 'rb') as taxonomy_file:
+        raw = taxonomy_file.read()
+    return SkillTaxonomy(json.loads(raw), content_hash(raw)[:12])
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    return load_taxonomy(TAXONOMY_PATH)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import re
+from bisect import bisect_right
+from typing import List
+
+_SENTENCE_END = re.compile(r'[.!?]+')
+_BULLETS = ('-', '•', '*', '·')
+
+
+class TextFeatures:
+    """Estadísticas de superficie del texto, calculadas una sola vez
+
+    Reúne las vistas que antes cada analizador recalculaba por su cuenta
+    (minúsculas, palabras, líneas, oraciones y párrafos). Usa __slots__:
+    se crea una por CV y se comparte a través de AnalysisContext.
+    """
+
+    __slots__ = (
+        'text', 'text_lower', 'tokens', 'tokens_lower', 'token_chars',
+        'lines', 'line_starts', 'nonblank_line_lengths', 'blank_line_count',
+        'uppercase_line_count', 'bullet_line_count', 'paragraph_count',
+        'sentence_parts', 'sentence_word_counts'
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self.text_lower = text.lower()
+
+        # Palabras separadas por espacios (como str.split())
+        self.tokens: List[str] = text.split()
+        self.tokens_lower: List[str] = self.text_lower.split()
+        self.token_chars = sum(map(len, self.tokens))
+
+        # Líneas: posición inicial de cada una y rasgos de formato
+        self.lines: List[str] = text.split('\n')
+        self.line_starts: List[int] = []
+        self.nonblank_line_lengths: List[int] = []
+        blank_lines = uppercase_lines = bullet_lines = 0
+        position = 0
+        for line in self.lines:
+            self.line_starts.append(position)
+            position += len(line) + 1
+            stripped = line.strip()
+            if not stripped:
+                blank_lines += 1
+                continue
+            self.nonblank_line_lengths.append(len(line))
+            if len(line) > 10 and line.upper() == line:
+                uppercase_lines += 1
+            if stripped.startswith(_BULLETS):
+                bullet_lines += 1
+        self.blank_line_count = blank_lines
+        self.uppercase_line_count = uppercase_lines
+        self.bullet_line_count = bullet_lines
+
+        self.paragraph_count = sum(1 for paragraph in text.split('\n\n') if paragraph.strip())
+
+        # Oraciones delimitadas por . ! ? (sentence_parts incluye los tramos vacíos)
+        parts = _SENTENCE_END.split(text)
+        self.sentence_parts = len(parts)
+        self.sentence_word_counts: List[int] = [len(part.split()) for part in parts if part.strip()]
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def line_count(self) -> int:
+        return len(self.lines)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_word_counts)
+
+    def line_index(self, offset: int) -> int:
+        """Índice de la línea que contiene la posición dada del texto"""
+        return bisect_right(self.line_starts, offset) - 1
\ No newline at end of file
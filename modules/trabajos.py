@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Análisis en segundo plano simultáneos por proceso (compartidos por todas las sesiones)
+JOB_WORKERS = int(os.getenv('ATS_JOB_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Segundos que un trabajo terminado se conserva para que su sesión lo recoja
+JOB_TTL = int(os.getenv('ATS_JOB_TTL', '900'))
+
+PENDING = 'pendiente'
+RUNNING = 'en_curso'
+DONE = 'completado'
+FAILED = 'error'
+CANCELLED = 'cancelado'
+
+
+class JobCancelled(Exception):
+    """El usuario canceló el trabajo; se lanza en el siguiente punto de control"""
+
+
+class Job:
+    """Estado de un análisis en segundo plano, consultado por la interfaz en cada rerun"""
+
+    def __init__(self, kind: str, key: Any = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        # Identifica la entrada (archivo, puesto): la sesión lo usa para saber si puede reutilizarlo
+        self.key = key
+        self.status = PENDING
+        self.progress = 0.0
+        self.message = ""
+        # Resultados parciales que la interfaz puede mostrar antes de terminar
+        self.partial: Any = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self._future = None
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def update(self, progress: float, message: Optional[str] = None) -> None:
+        """Avance (0 a 1) y etapa actual; también es punto de control de cancelación"""
+        self.check_cancelled()
+        self.progress = max(0.0, min(progress, 1.0))
+        if message is not None:
+            self.message = message
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def cancel(self) -> None:
+        """Cancela de inmediato para la interfaz; el hilo se detiene en su siguiente punto de control"""
+        with self._lock:
+            if self.done:
+                return
+            self.cancel_event.set()
+            if self._future is not None:
+                self._future.cancel()
+            self.status = CANCELLED
+            self.finished_at = time.time()
+
+    def _set_status(self, status: str, **fields) -> bool:
+        """Cambia de estado salvo que el trabajo ya se haya cancelado"""
+        with self._lock:
+            if self.status == CANCELLED:
+                return False
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.status = status
+            if status != RUNNING:
+                self.finished_at = time.time()
+            return True
+
+
+class JobManager:
+    """Pool de hilos del proceso que ejecuta análisis largos fuera del hilo del script"""
+
+    def __init__(self, max_workers: int = JOB_WORKERS, ttl: int = JOB_TTL):
+        self.max_workers = max(max_workers, 1)
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, kind: str, function: Callable[..., Any], *args, key: Any = None, **kwargs) -> Job:
+        """Encola function(job, *args, **kwargs) y retorna el trabajo de inmediato"""
+        job = Job(kind, key)
+        with self._lock:
+            self._prune()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='trabajo')
+            self._jobs[job.id] = job
+            job._future = self._executor.submit(self._run, job, function, args, kwargs)
+        return job
+
+    def _run(self, job: Job, function: Callable[..., Any], args, kwargs) -> None:
+        if not job._set_status(RUNNING, started_at=time.time()):
+            return
+        try:
+            result = function(job, *args, **kwargs)
+        except JobCancelled:
+            return
+        except Exception as e:
+            job._set_status(FAILED, error=str(e))
+            return
+        job._set_status(DONE, result=result, progress=1.0)
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id) if job_id else None
+
+    def _prune(self) -> None:
+        """Olvida los trabajos terminados hace más de ttl segundos"""
+        limit = time.time() - self.ttl
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done and job.finished_at < limit]:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, int]:
+        """Cantidad de trabajos conservados por estado"""
+        with self._lock:
+            counts = {status: 0 for status in (PENDING, RUNNING, DONE, FAILED, CANCELLED)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+
+_manager = JobManager()
+
+
+def submit_job(kind: str, function: Callable[..., Any], *args, key: Any = None, **kwargs) -> Job:
+    """Ejecuta function(job, ...) en el pool de trabajos en segundo plano del proceso"""
+    return _manager.submit(kind, function, *args, key=key, **kwargs)
+
+
+def get_job(job_id: Optional[str]) -> Optional[Job]:
+    return _manager.get(job_id)
+
+
+def get_job_stats() -> Dict[str, int]:
+    return _manager.stats()
\ No newline at end of file
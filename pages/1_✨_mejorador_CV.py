@@ -2,12 +2,14 @@ import streamlit as st
 from controllers.auth import require_page_auth, get_current_user, logout, require_auth
 require_page_auth() 
 user_info = get_current_user()
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from modules.procesador import DocumentProcessor
+from modules.arranque import start_background_warmup
 from modules.mejorador_cv import CVImprovementAnalyzer
+from modules.pipeline import has_cached_improvement, improve_uploaded_cv, improvement_job
+from modules.cache import content_hash
 from components.navbar_superior import navbar
+from components.progreso import background, render_job_outcome, wait_for_job
+# plotly se importa al dibujar el primer gráfico; la precarga lo adelanta en segundo plano
+start_background_warmup()
 
 def main():
     st.set_page_config(
@@ -144,18 +146,25 @@ def main():
     
     # Contenido principal
     if uploaded_file:
-        with st.spinner("🔍 Analizando tu CV para identificar áreas de mejora..."):
-            # Procesar documento
-            processor = DocumentProcessor()
-            cv_text, success = processor.extract_text_from_uploaded_file(uploaded_file)
-            
-            if not success:
-                st.error(f"❌ {cv_text}")
+        # El análisis corre en segundo plano: la sesión sigue respondiendo y se puede cancelar
+        if not has_cached_improvement(uploaded_file.getbuffer(), uploaded_file.type):
+            job = background('mejora', (uploaded_file.name, content_hash(uploaded_file.getbuffer())), 'mejora', improvement_job,
+                             uploaded_file.getvalue(), uploaded_file.type, uploaded_file.name)
+            if not wait_for_job(job, "🔍 Analizando tu CV para identificar áreas de mejora"):
                 return
-            
-            # Analizar mejora del CV
-            improvement_analyzer = CVImprovementAnalyzer()
-            improvement_report = improvement_analyzer.generate_improvement_report(cv_text)
+            if not render_job_outcome(job, 'mejora'):
+                return
+            analysis = job.result
+        else:
+            # Procesar documento y analizar mejora (memoizado por contenido del archivo)
+            analysis = improve_uploaded_cv(uploaded_file)
+        
+        if not analysis['success']:
+            st.error(f"❌ {analysis['error']}")
+            return
+        
+        improvement_analyzer = CVImprovementAnalyzer()
+        improvement_report = analysis['report']
         
         # Header con puntuación general
         overall_score = improvement_report['overall_score']
@@ -210,6 +219,7 @@ def main():
             st.metric("✅ Completitud", f"{score}/100", delta_color="off")
         
         # Gráfico de radar - CORREGIDO
+        import plotly.graph_objects as go
         fig_radar = go.Figure()
         
         # Usar las mismas claves que en las métricas
@@ -2,14 +2,19 @@ import streamlit as st
 from controllers.auth import require_page_auth, get_current_user, require_role
 user_info = get_current_user()
 require_role(['admin'])
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from modules.procesador import DocumentProcessor
-from modules.analizador import CVAnalyzer
-from modules.puntuador import ATSScorer
+from modules.arranque import start_background_warmup
 from modules.mejorador_cv import CVImprovementAnalyzer
+from modules.modelos import get_model_stats
+from modules.pipeline import (analysis_job, analyze_uploaded_cv, batch_job, expand_uploads, get_cache_stats,
+                             get_feature_cache_stats, has_cached_features, improvement_report_for, ranking_rows)
+from modules.perfil_puesto import get_job_profile
+from modules.trabajos import submit_job
+from modules.cache import content_hash
 from components.navbar_superior import navbar
+from components.progreso import background, render_job_outcome, session_job, wait_for_job
+from components.fragmentos import fragment
+# Modelo, buscadores y bibliotecas de gráficos se cargan en segundo plano mientras se sube el CV
+start_background_warmup()
 
 
 def safe_get(dictionary, key, default=0):
@@ -26,6 +31,457 @@ def safe_multiply(value, multiplier, default=0):
     except (TypeError, ValueError):
         return default
 
+def render_batch_ranking(uploaded_files, job_description):
+    """Analiza un lote de CVs contra el puesto en segundo plano y muestra el ranking"""
+    if not uploaded_files:
+        st.info("📚 Sube varios CVs (o un ZIP con la carpeta) para generar el ranking de candidatos")
+        return
+    
+    if not job_description.strip():
+        st.warning("⚠️ Sin descripción del puesto todos los CVs reciben la misma puntuación genérica")
+    
+    # Un trabajo por conjunto de archivos: el índice no depende del puesto, así que editarlo solo vuelve a rankear
+    key = tuple((uploaded_file.name, content_hash(uploaded_file.getbuffer())) for uploaded_file in uploaded_files)
+    job = session_job('lote', key, lambda: submit_job('lote', batch_job, expand_uploads(uploaded_files)))
+    
+    if not wait_for_job(job, "🔍 Analizando CVs", render_partial=lambda index: render_ranking(index, job_description, partial=True)):
+        return
+    if not render_job_outcome(job, 'lote'):
+        # Lo analizado antes de cancelar sigue siendo útil
+        if job.partial:
+            render_ranking(job.partial, job_description, partial=True)
+        return
+    
+    if not len(job.result) and not job.result.failed:
+        st.warning("⚠️ No se encontraron archivos PDF, DOCX o TXT en lo que subiste")
+        return
+    render_ranking(job.result, job_description)
+
+def render_ranking(index, job_description, partial=False):
+    """Tabla ordenable del ranking (parcial mientras el lote sigue en curso)"""
+    import pandas as pd
+    rows = ranking_rows(index, get_job_profile(job_description))
+    ranking = pd.DataFrame(rows)
+    ranking.index = range(1, len(ranking) + 1)
+    
+    failed = int((ranking['error'] != "").sum())
+    st.subheader(f"🏆 Ranking de {len(ranking)} candidatos" + (" (parcial)" if partial else ""))
+    if failed:
+        st.warning(f"⚠️ {failed} archivo(s) no se pudieron analizar")
+    else:
+        ranking = ranking.drop(columns=['error'])
+    
+    # La tabla se puede ordenar por cualquier columna haciendo clic en el encabezado
+    st.dataframe(
+        ranking,
+        use_container_width=True,
+        column_config={
+            'archivo': st.column_config.TextColumn("Archivo"),
+            'puntuacion_total': st.column_config.ProgressColumn("Puntuación", min_value=0, max_value=100, format="%.1f")
+        }
+    )
+    if not partial:
+        st.download_button(
+            "⬇️ Descargar ranking (CSV)",
+            ranking.to_csv(index_label='posicion').encode('utf-8'),
+            file_name="ranking_ats.csv",
+            mime="text/csv"
+        )
+
+def render_skills_section(analysis):
+    """Pestaña de habilidades técnicas y blandas"""
+    skills = analysis['skills']
+    
+    st.subheader("Habilidades Identificadas")
+    
+    # Habilidades técnicas categorizadas
+    if safe_get(skills, 'categorizadas'):
+        st.write("**Habilidades Técnicas por Categoría:**")
+        for categoria, habilidades in skills['categorizadas'].items():
+            with st.expander(f"🔧 {categoria.replace('_', ' ').title()} ({len(habilidades)})"):
+                cols = st.columns(3)
+                for i, habilidad in enumerate(habilidades):
+                    cols[i % 3].write(f"✅ {habilidad}")
+    
+    # Habilidades técnicas simples
+    if safe_get(skills, 'tecnicas'):
+        st.write("**Todas las Habilidades Técnicas:**")
+        tech_cols = st.columns(4)
+        for i, skill in enumerate(skills['tecnicas'][:12]):  # Mostrar máximo 12
+            tech_cols[i % 4].write(f"• {skill}")
+    
+    # Habilidades blandas
+    if safe_get(skills, 'blandas'):
+        st.write("**Habilidades Blandas:**")
+        soft_cols = st.columns(3)
+        for i, skill in enumerate(skills['blandas']):
+            soft_cols[i % 3].write(f"💬 {skill}")
+
+def render_experience_section(analysis):
+    """Pestaña de experiencia laboral"""
+    experience = analysis['experience']
+    
+    st.subheader("Experiencia Laboral")
+    
+    exp_years = safe_get(experience, 'años_experiencia', 0)
+    if exp_years > 0:
+        st.metric("Años de Experiencia", exp_years)
+    else:
+        st.metric("Años de Experiencia", "No especificado")
+    
+    empresas = safe_get(experience, 'empresas', [])
+    if empresas:
+        st.write("**Empresas Detectadas:**")
+        for i, empresa in enumerate(empresas[:6], 1):
+            st.write(f"{i}. 🏢 {empresa}")
+    
+    periodos = safe_get(experience, 'periodos_encontrados', 0)
+    if periodos > 0:
+        st.write(f"**Periodos laborales identificados:** {periodos}")
+
+def render_analysis_section(analysis):
+    """Pestaña de puntuación por categoría y calidad del texto"""
+    skills = analysis['skills']
+    experience = analysis['experience']
+    education = analysis['education']
+    contact_info = analysis['contact_info']
+    text_quality = analysis['text_quality']
+    results = analysis['results']
+    
+    st.subheader("Análisis Detallado")
+    
+    # Gráfico de scores por categoría - COMPLETAMENTE CORREGIDO
+    if 'desglose_adaptado' in results and results['desglose_adaptado']:
+        # Usar el desglose adaptado si existe
+        scores_data = results['desglose_adaptado']
+        chart_title = "Puntuación por Categoría (Adaptado al Puesto)"
+    elif 'desglose' in results and results['desglose']:
+        # Fallback al desglose original
+        scores_data = results['desglose']
+        chart_title = "Puntuación por Categoría"
+    else:
+        # Si no hay desglose, crear uno básico - COMPLETAMENTE SEGURO
+        tech_skills_count = len(safe_get(skills, 'tecnicas', []))
+        exp_years = safe_get(experience, 'años_experiencia', 0)
+        education_levels = safe_get(education, 'total_niveles', 0)
+        email_count = len(safe_get(contact_info, 'emails', []))
+        word_count = safe_get(text_quality, 'total_palabras', 0)
+        
+        scores_data = {
+            'Habilidades': min(tech_skills_count * 5, 100),
+            'Experiencia': min(safe_multiply(exp_years, 10), 100),
+            'Educación': min(safe_multiply(education_levels, 15), 100),
+            'Contacto': min(email_count * 20, 100),
+            'Calidad': min(safe_multiply(word_count, 0.2), 100)  # word_count / 5
+        }
+        chart_title = "Puntuación Estimada por Categoría"
+    
+    import pandas as pd
+    import plotly.express as px
+    scores_df = pd.DataFrame({
+        'Categoría': list(scores_data.keys()),
+        'Puntuación': list(scores_data.values())
+    })
+    
+    fig_bar = px.bar(
+        scores_df, 
+        x='Categoría', 
+        y='Puntuación',
+        title=chart_title,
+        color='Puntuación',
+        color_continuous_scale='RdYlGn'
+    )
+    st.plotly_chart(fig_bar, use_container_width=True)
+    
+    # Calidad del texto - CORREGIDO
+    st.write("**Análisis de Calidad de Texto:**")
+    quality_cols = st.columns(4)
+    quality_cols[0].metric("Palabras", safe_get(text_quality, 'total_palabras', 0))
+    quality_cols[1].metric("Oraciones", safe_get(text_quality, 'total_oraciones', 0))
+    quality_cols[2].metric("Pal. Acción", safe_get(text_quality, 'palabras_accion', 0))
+    density = safe_get(text_quality, 'densidad_palabras_accion', 0)
+    quality_cols[3].metric("Densidad Acción", f"{density}%")
+
+def render_content_section(analysis):
+    """Pestaña de contacto y educación"""
+    education = analysis['education']
+    contact_info = analysis['contact_info']
+    
+    st.subheader("Información de Contacto y Educación")
+    
+    # Contacto - CORREGIDO
+    emails = safe_get(contact_info, 'emails', [])
+    telefonos = safe_get(contact_info, 'telefonos', [])
+    urls = safe_get(contact_info, 'urls', [])
+    
+    if emails or telefonos or urls:
+        st.write("**Información de Contacto:**")
+        if emails:
+            st.write(f"📧 **Emails:** {', '.join(emails)}")
+        if telefonos:
+            st.write(f"📞 **Teléfonos:** {', '.join(telefonos[:2])}")
+        if urls:
+            st.write("🌐 **URLs:**")
+            for url in urls[:3]:
+                st.write(f"   • {url}")
+    
+    # Educación - CORREGIDO
+    niveles = safe_get(education, 'niveles', {})
+    instituciones = safe_get(education, 'instituciones', [])
+    
+    if niveles:
+        st.write("**Niveles Educativos Detectados:**")
+        for nivel, cantidad in niveles.items():
+            st.write(f"🎓 {nivel.title()}: {cantidad} menciones")
+    
+    if instituciones:
+        st.write("**Instituciones Educativas:**")
+        for institucion in instituciones:
+            st.write(f"🏫 {institucion}")
+
+def render_match_section(analysis):
+    """Pestaña de adaptación al puesto"""
+    results = analysis['results']
+    
+    st.subheader("🎯 Análisis de Adaptación al Puesto")
+    
+    analisis_puesto = safe_get(results, 'analisis_puesto', {})
+    
+    if analisis_puesto.get('has_description'):
+        # Mostrar análisis del puesto
+        st.write("**📋 Requisitos del Puesto Detectados:**")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            requirements = safe_get(analisis_puesto, 'requirements', {})
+            exp_requerida = safe_get(requirements, 'años_experiencia')
+            if exp_requerida:
+                st.metric("Años de Experiencia Requeridos", exp_requerida)
+            
+            seniority = safe_get(analisis_puesto, 'seniority', 'no especificado')
+            if seniority != 'no especificado':
+                st.metric("Nivel de Seniority", seniority.title())
+        
+        with col2:
+            nivel_educativo = safe_get(requirements, 'nivel_educativo')
+            if nivel_educativo:
+                st.metric("Nivel Educativo Requerido", nivel_educativo.title())
+            
+            industries = safe_get(analisis_puesto, 'industries', [])
+            if industries:
+                st.write("**Industrias:**", ", ".join(industries))
+        
+        # Habilidades requeridas
+        required_skills = safe_get(analisis_puesto, 'required_skills', {})
+        if required_skills:
+            st.write("**🛠️ Habilidades Requeridas:**")
+            for category, skills_list in required_skills.items():
+                with st.expander(f"{category.replace('_', ' ').title()} ({len(skills_list)} habilidades)"):
+                    for skill in skills_list:
+                        st.write(f"• {skill}")
+        
+        # Match detallado
+        match_details = safe_get(results, 'match_detallado', {})
+        st.write("**✅ Coincidencias Encontradas:**")
+        
+        habilidades_coincidentes = safe_get(match_details, 'habilidades_coincidentes', {})
+        if habilidades_coincidentes:
+            st.success("**Habilidades que coinciden:**")
+            for category, skills in habilidades_coincidentes.items():
+                st.write(f"**{category.replace('_', ' ').title()}:** {', '.join(skills)}")
+        
+        habilidades_faltantes = safe_get(match_details, 'habilidades_faltantes', {})
+        if habilidades_faltantes:
+            st.error("**Habilidades faltantes:**")
+            for category, skills in habilidades_faltantes.items():
+                st.write(f"**{category.replace('_', ' ').title()}:** {', '.join(skills)}")
+    
+    else:
+        st.info("ℹ️ Agrega una descripción del puesto para ver el análisis de adaptación específico")
+
+def render_improvement_section(analysis):
+    """Pestaña de mejora de forma y estructura (reporte memoizado por texto)"""
+    cv_text = analysis['cv_text']
+    cv_context = analysis['context']
+    
+    st.subheader("🛠️ Mejora de CV - Análisis de Forma y Estructura")
+    
+    if cv_text and not cv_text.startswith("Error"):
+        # Analizar mejora del CV (memoizado: no cambia al editar el puesto)
+        improvement_report = improvement_report_for(cv_text, cv_context)
+        
+        # Mostrar puntuación general de mejora
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Puntuación General", f"{improvement_report['overall_score']}/100")
+        with col2:
+            st.metric("Estructura", f"{improvement_report['category_scores']['estructura']}/100")
+        with col3:
+            st.metric("Contenido", f"{improvement_report['category_scores']['contenido']}/100")
+        with col4:
+            st.metric("Formato", f"{improvement_report['category_scores']['formato']}/100")
+        
+        # Gráfico de radar para categorías
+        categories = list(improvement_report['category_scores'].keys())
+        scores = list(improvement_report['category_scores'].values())
+        
+        import plotly.graph_objects as go
+        fig_radar = go.Figure()
+        fig_radar.add_trace(go.Scatterpolar(
+            r=scores + [scores[0]],  # Cerrar el círculo
+            theta=categories + [categories[0]],
+            fill='toself',
+            name='Puntuación por Categoría'
+        ))
+        
+        fig_radar.update_layout(
+            polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+            showlegend=False,
+            title="Análisis por Categorías de Mejora",
+            height=400
+        )
+        
+        st.plotly_chart(fig_radar, use_container_width=True)
+        
+        # Recomendaciones de mejora
+        st.subheader("💡 Recomendaciones de Mejora")
+        
+        # Organizar por prioridad
+        high_priority = [r for r in improvement_report['recommendations'] if r['priority'] == 'alta']
+        medium_priority = [r for r in improvement_report['recommendations'] if r['priority'] == 'media']
+        low_priority = [r for r in improvement_report['recommendations'] if r['priority'] == 'baja']
+        
+        if high_priority:
+            st.error("**🚨 Mejoras de Alta Prioridad**")
+            for rec in high_priority:
+                with st.expander(f"🔴 {rec['message']}", expanded=True):
+                    st.write(f"**Sugerencia:** {rec['suggestion']}")
+                    st.write(f"**Categoría:** {rec['category']}")
+        
+        if medium_priority:
+            st.warning("**⚠️ Mejoras de Prioridad Media**")
+            for rec in medium_priority:
+                with st.expander(f"🟡 {rec['message']}"):
+                    st.write(f"**Sugerencia:** {rec['suggestion']}")
+                    st.write(f"**Categoría:** {rec['category']}")
+        
+        if low_priority:
+            st.info("**💡 Mejoras de Prioridad Baja**")
+            for rec in low_priority:
+                with st.expander(f"🔵 {rec['message']}"):
+                    st.write(f"**Sugerencia:** {rec['suggestion']}")
+                    st.write(f"**Categoría:** {rec['category']}")
+        
+        # Análisis detallado por categoría
+        st.subheader("📊 Análisis Detallado")
+        
+        detail_tab1, detail_tab2, detail_tab3, detail_tab4 = st.tabs(["🏗️ Estructura", "📝 Contenido", "🎨 Formato", "✅ Completitud"])
+        
+        with detail_tab1:
+            structure = improvement_report['detailed_analysis']['structure']
+            st.write("**Secciones Encontradas:**")
+            for section in structure['sections_found']:
+                st.write(f"✅ {section['section'].title()} (línea {section['line_number']})")
+            
+            if structure['sections_missing']:
+                st.write("**Secciones Faltantes:**")
+                for section in structure['sections_missing']:
+                    st.write(f"❌ {section.title()}")
+            
+            st.write("**Estadísticas de Estructura:**")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Palabras", structure['word_count'])
+            col2.metric("Líneas", structure['line_count'])
+            col3.metric("Párrafos", structure['paragraph_count'])
+        
+        with detail_tab2:
+            content = improvement_report['detailed_analysis']['content']
+            st.write("**Calidad del Contenido:**")
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Verbos Acción", content['action_verbs_count'])
+            col2.metric("Palabras Débiles", content['weak_words_count'])
+            col3.metric("Oraciones", content['sentence_count'])
+            col4.metric("Long. Prom. Oración", content['avg_sentence_length'])
+            
+            if content['action_verbs_count'] < 5:
+                st.info("**💡 Tip:** Usa más verbos de acción como: " + ", ".join(CVImprovementAnalyzer().action_verbs[:5]))
+        
+        with detail_tab3:
+            formatting = improvement_report['detailed_analysis']['formatting']
+            st.write("**Análisis de Formato:**")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Long. Prom. Línea", formatting['avg_line_length'])
+            col2.metric("Líneas Largas", formatting['long_lines_count'])
+            col3.metric("Viñetas", formatting['bullet_points_count'])
+            
+            if formatting['long_lines_count'] > 5:
+                st.warning("**📏 Considera dividir líneas muy largas para mejor legibilidad**")
+        
+        with detail_tab4:
+            completeness = improvement_report['detailed_analysis']['completeness']
+            st.write("**Completitud de Información:**")
+            
+            # Información de contacto
+            st.write("**📞 Contacto:**")
+            contact_cols = st.columns(4)
+            contact_cols[0].write(f"Email: {'✅' if completeness['contact_info']['has_email'] else '❌'}")
+            contact_cols[1].write(f"Teléfono: {'✅' if completeness['contact_info']['has_phone'] else '❌'}")
+            contact_cols[2].write(f"LinkedIn: {'✅' if completeness['contact_info']['has_linkedin'] else '❌'}")
+            
+            # Educación y experiencia
+            st.write("**🎓 Educación y Experiencia:**")
+            edu_exp_cols = st.columns(3)
+            edu_exp_cols[0].write(f"Educación Superior: {'✅' if completeness['education_info']['has_higher_education'] else '❌'}")
+            edu_exp_cols[1].write(f"Años Experiencia: {'✅' if completeness['experience_info']['years_experience'] > 0 else '❌'}")
+            edu_exp_cols[2].write(f"Logros Cuantificables: {'✅' if completeness['experience_info']['has_quantifiable_achievements'] else '❌'}")
+        
+        # Plantillas y ejemplos
+        with st.expander("📋 Plantillas y Ejemplos de Mejora"):
+            st.markdown("""
+            ### 🎯 Ejemplos de Mejoras:
+            
+            **❌ Antes:** "Ayudé en el desarrollo del proyecto"
+            **✅ Después:** "Lideré el desarrollo del proyecto que incrementó la eficiencia en 30%"
+            
+            **❌ Antes:** "Fui parte del equipo de ventas"
+            **✅ Después:** "Coordiné el equipo de ventas que superó los objetivos en 25%"
+            
+            ### 📝 Estructura Recomendada:
+            1. **Información de Contacto** (nombre, teléfono, email, LinkedIn)
+            2. **Resumen Profesional** (2-3 líneas con tu valor único)
+            3. **Experiencia Laboral** (orden inverso cronológico)
+            4. **Educación** (títulos y certificaciones)
+            5. **Habilidades** (técnicas y blandas)
+            6. **Logros y Certificaciones** (opcional)
+            
+            ### 💡 Consejos de Formato:
+            - Usa **viñetas** para listar logros
+            - Mantén las **líneas cortas** (60-80 caracteres)
+            - Usa **verbos de acción** al inicio de cada punto
+            - **Cuantifica** tus logros con números y porcentajes
+            """)
+    
+    else:
+        st.info("📄 Sube un CV para analizar y obtener recomendaciones de mejora")
+
+# Secciones de resultados del análisis individual (antes pestañas st.tabs)
+RESULT_SECTIONS = {
+    "🛠️ Habilidades": render_skills_section,
+    "💼 Experiencia": render_experience_section,
+    "📊 Análisis": render_analysis_section,
+    "📄 Contenido": render_content_section,
+    "🎯 Match con Puesto": render_match_section,
+    "✨ Mejorar CV": render_improvement_section
+}
+
+@fragment
+def render_result_sections(analysis):
+    """Selector de sección que solo construye el contenido visible"""
+    section = st.radio("Sección", list(RESULT_SECTIONS), horizontal=True, key="seccion_resultados", label_visibility="collapsed")
+    RESULT_SECTIONS[section](analysis)
+
 def main():
     st.set_page_config(
         page_title="Analizador de CVs ATS", 
@@ -101,13 +557,31 @@ def main():
     st.markdown('<h1 class="main-header">📄 Analizador de CVs - ATS</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Esta herramienta te ayuda a optimizar calificaciones utilizando el sistemas ATS (Applicant Tracking System) para filtrar candidatos.</p>', unsafe_allow_html=True)
     
-    st.header("📤 Sube el CV")
-        
-    uploaded_file = st.file_uploader(
-        "**Agrega el CV a analizar**",
-        type=['pdf', 'docx', 'txt'],
-        help="Formatos soportados: PDF, Word (DOCX), Texto (TXT)"
+    analysis_mode = st.radio(
+        "**Modo de análisis**",
+        ["📄 Un CV", "📚 Lote de CVs"],
+        horizontal=True,
+        help="El modo por lotes evalúa muchos CVs contra la misma descripción y genera un ranking"
     )
+    batch_mode = analysis_mode == "📚 Lote de CVs"
+    
+    if batch_mode:
+        st.header("📤 Sube los CVs")
+        uploaded_file = None
+        uploaded_files = st.file_uploader(
+            "**Agrega los CVs a comparar**",
+            type=['pdf', 'docx', 'txt', 'zip'],
+            accept_multiple_files=True,
+            help="Selecciona varios archivos o sube una carpeta comprimida en ZIP"
+        )
+    else:
+        st.header("📤 Sube el CV")
+        uploaded_files = []
+        uploaded_file = st.file_uploader(
+            "**Agrega el CV a analizar**",
+            type=['pdf', 'docx', 'txt'],
+            help="Formatos soportados: PDF, Word (DOCX), Texto (TXT)"
+        )
     job_description = st.text_area(
         "**Descripción del puesto**",
         height=200,
@@ -138,31 +612,56 @@ def main():
         - ✍️ **Calidad del contenido**
         """)
     
+    # Ranking de candidatos
+    if batch_mode:
+        render_batch_ranking(uploaded_files, job_description)
+        return
+    
     # Contenido principal
     if uploaded_file:
-        with st.spinner("🔍 Analizando tu CV... Esto puede tomar unos segundos"):
-            # Procesar documento
-            processor = DocumentProcessor()
-            cv_text, success = processor.extract_text_from_uploaded_file(uploaded_file)
-            
-            if not success:
-                st.error(f"❌ {cv_text}")
+        # La extracción y los extractores corren en segundo plano; con el CV ya
+        # analizado, un cambio de puesto solo vuelve a puntuar (inmediato)
+        if not has_cached_features(uploaded_file.getbuffer(), uploaded_file.type):
+            job = background('analisis', (uploaded_file.name, content_hash(uploaded_file.getbuffer())), 'analisis', analysis_job,
+                             uploaded_file.getvalue(), uploaded_file.type, uploaded_file.name, job_description)
+            if not wait_for_job(job, "🔍 Analizando tu CV"):
                 return
-            
-            # Obtener estadísticas del documento
-            doc_stats = processor.get_document_stats(cv_text)
-            
-            # Analizar contenido del CV
-            analyzer = CVAnalyzer()
-            skills = analyzer.extract_skills(cv_text)
-            experience = analyzer.extract_experience(cv_text)
-            education = analyzer.extract_education(cv_text)
-            contact_info = analyzer.extract_contact_info(cv_text)
-            text_quality = analyzer.analyze_text_quality(cv_text)
-            
-            # Calcular puntuación ATS - USANDO EL NUEVO MÉTODO ADAPTATIVO
-            scorer = ATSScorer(job_description)
-            results = scorer.calculate_adaptive_score(cv_text, skills, experience, education, contact_info)
+            if not render_job_outcome(job, 'analisis'):
+                return
+            if not job.result['success']:
+                st.error(f"❌ {job.result['error']}")
+                return
+        
+        # Extracción, análisis y puntuación ATS (memoizados por contenido del archivo y puesto)
+        analysis = analyze_uploaded_cv(uploaded_file, job_description)
+        
+        if not analysis['success']:
+            st.error(f"❌ {analysis['error']}")
+            return
+        
+        cv_text = analysis['cv_text']
+        cv_context = analysis['context']
+        doc_stats = analysis['doc_stats']
+        skills = analysis['skills']
+        experience = analysis['experience']
+        education = analysis['education']
+        contact_info = analysis['contact_info']
+        text_quality = analysis['text_quality']
+        results = analysis['results']
+        
+        # Costo de carga de los modelos NLP compartidos en este proceso
+        with st.sidebar:
+            st.markdown("### ⚙️ Modelos NLP")
+            for model_name, model_stats in get_model_stats().items():
+                if model_stats['loaded']:
+                    memory = f", {model_stats['memory_mb']} MB" if model_stats['memory_mb'] is not None else ""
+                    st.caption(f"✅ {model_name}: {model_stats['load_seconds']} s{memory}")
+                else:
+                    st.caption(f"⚠️ {model_name}: no disponible")
+            cache_stats = get_cache_stats()
+            st.caption(f"🗃️ Caché de análisis: {cache_stats['hits']} aciertos / {cache_stats['misses']} fallos ({cache_stats['size']}/{cache_stats['maxsize']})")
+            feature_stats = get_feature_cache_stats()
+            st.caption(f"🧩 Caché de características del CV: {feature_stats['hits']} aciertos / {feature_stats['misses']} fallos ({feature_stats['size']}/{feature_stats['maxsize']})")
         
         # Mostrar resultados principales
         col1, col2 = st.columns([1, 2])
@@ -175,6 +674,7 @@ def main():
             score_total = safe_get(results, 'puntuacion_total', 0)
             
             # Gráfico de gauge
+            import plotly.graph_objects as go
             fig = go.Figure(go.Indicator(
                 mode="gauge+number+delta",
                 value=score_total,
@@ -233,363 +733,14 @@ def main():
                 ]
             }
             
+            import pandas as pd
             stats_df = pd.DataFrame(stats_data)
             st.dataframe(stats_df, hide_index=True, use_container_width=True)
         
         with col2:
-            # Pestañas para organización
-            tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["🛠️ Habilidades", "💼 Experiencia", "📊 Análisis", "📄 Contenido", "🎯 Match con Puesto", "✨ Mejorar CV"])
-            
-            with tab1:
-                st.subheader("Habilidades Identificadas")
-                
-                # Habilidades técnicas categorizadas
-                if safe_get(skills, 'categorizadas'):
-                    st.write("**Habilidades Técnicas por Categoría:**")
-                    for categoria, habilidades in skills['categorizadas'].items():
-                        with st.expander(f"🔧 {categoria.replace('_', ' ').title()} ({len(habilidades)})"):
-                            cols = st.columns(3)
-                            for i, habilidad in enumerate(habilidades):
-                                cols[i % 3].write(f"✅ {habilidad}")
-                
-                # Habilidades técnicas simples
-                if safe_get(skills, 'tecnicas'):
-                    st.write("**Todas las Habilidades Técnicas:**")
-                    tech_cols = st.columns(4)
-                    for i, skill in enumerate(skills['tecnicas'][:12]):  # Mostrar máximo 12
-                        tech_cols[i % 4].write(f"• {skill}")
-                
-                # Habilidades blandas
-                if safe_get(skills, 'blandas'):
-                    st.write("**Habilidades Blandas:**")
-                    soft_cols = st.columns(3)
-                    for i, skill in enumerate(skills['blandas']):
-                        soft_cols[i % 3].write(f"💬 {skill}")
-            
-            with tab2:
-                st.subheader("Experiencia Laboral")
-                
-                exp_years = safe_get(experience, 'años_experiencia', 0)
-                if exp_years > 0:
-                    st.metric("Años de Experiencia", exp_years)
-                else:
-                    st.metric("Años de Experiencia", "No especificado")
-                
-                empresas = safe_get(experience, 'empresas', [])
-                if empresas:
-                    st.write("**Empresas Detectadas:**")
-                    for i, empresa in enumerate(empresas[:6], 1):
-                        st.write(f"{i}. 🏢 {empresa}")
-                
-                periodos = safe_get(experience, 'periodos_encontrados', 0)
-                if periodos > 0:
-                    st.write(f"**Periodos laborales identificados:** {periodos}")
-            
-            with tab3:
-                st.subheader("Análisis Detallado")
-                
-                # Gráfico de scores por categoría - COMPLETAMENTE CORREGIDO
-                if 'desglose_adaptado' in results and results['desglose_adaptado']:
-                    # Usar el desglose adaptado si existe
-                    scores_data = results['desglose_adaptado']
-                    chart_title = "Puntuación por Categoría (Adaptado al Puesto)"
-                elif 'desglose' in results and results['desglose']:
-                    # Fallback al desglose original
-                    scores_data = results['desglose']
-                    chart_title = "Puntuación por Categoría"
-                else:
-                    # Si no hay desglose, crear uno básico - COMPLETAMENTE SEGURO
-                    tech_skills_count = len(safe_get(skills, 'tecnicas', []))
-                    exp_years = safe_get(experience, 'años_experiencia', 0)
-                    education_levels = safe_get(education, 'total_niveles', 0)
-                    email_count = len(safe_get(contact_info, 'emails', []))
-                    word_count = safe_get(text_quality, 'total_palabras', 0)
-                    
-                    scores_data = {
-                        'Habilidades': min(tech_skills_count * 5, 100),
-                        'Experiencia': min(safe_multiply(exp_years, 10), 100),
-                        'Educación': min(safe_multiply(education_levels, 15), 100),
-                        'Contacto': min(email_count * 20, 100),
-                        'Calidad': min(safe_multiply(word_count, 0.2), 100)  # word_count / 5
-                    }
-                    chart_title = "Puntuación Estimada por Categoría"
-                
-                scores_df = pd.DataFrame({
-                    'Categoría': list(scores_data.keys()),
-                    'Puntuación': list(scores_data.values())
-                })
-                
-                fig_bar = px.bar(
-                    scores_df, 
-                    x='Categoría', 
-                    y='Puntuación',
-                    title=chart_title,
-                    color='Puntuación',
-                    color_continuous_scale='RdYlGn'
-                )
-                st.plotly_chart(fig_bar, use_container_width=True)
-                
-                # Calidad del texto - CORREGIDO
-                st.write("**Análisis de Calidad de Texto:**")
-                quality_cols = st.columns(4)
-                quality_cols[0].metric("Palabras", safe_get(text_quality, 'total_palabras', 0))
-                quality_cols[1].metric("Oraciones", safe_get(text_quality, 'total_oraciones', 0))
-                quality_cols[2].metric("Pal. Acción", safe_get(text_quality, 'palabras_accion', 0))
-                density = safe_get(text_quality, 'densidad_palabras_accion', 0)
-                quality_cols[3].metric("Densidad Acción", f"{density}%")
-            
-            with tab4:
-                st.subheader("Información de Contacto y Educación")
-                
-                # Contacto - CORREGIDO
-                emails = safe_get(contact_info, 'emails', [])
-                telefonos = safe_get(contact_info, 'telefonos', [])
-                urls = safe_get(contact_info, 'urls', [])
-                
-                if emails or telefonos or urls:
-                    st.write("**Información de Contacto:**")
-                    if emails:
-                        st.write(f"📧 **Emails:** {', '.join(emails)}")
-                    if telefonos:
-                        st.write(f"📞 **Teléfonos:** {', '.join(telefonos[:2])}")
-                    if urls:
-                        st.write("🌐 **URLs:**")
-                        for url in urls[:3]:
-                            st.write(f"   • {url}")
-                
-                # Educación - CORREGIDO
-                niveles = safe_get(education, 'niveles', {})
-                instituciones = safe_get(education, 'instituciones', [])
-                
-                if niveles:
-                    st.write("**Niveles Educativos Detectados:**")
-                    for nivel, cantidad in niveles.items():
-                        st.write(f"🎓 {nivel.title()}: {cantidad} menciones")
-                
-                if instituciones:
-                    st.write("**Instituciones Educativas:**")
-                    for institucion in instituciones:
-                        st.write(f"🏫 {institucion}")
-            
-            with tab5:
-                st.subheader("🎯 Análisis de Adaptación al Puesto")
-                
-                analisis_puesto = safe_get(results, 'analisis_puesto', {})
-                
-                if analisis_puesto.get('has_description'):
-                    # Mostrar análisis del puesto
-                    st.write("**📋 Requisitos del Puesto Detectados:**")
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        requirements = safe_get(analisis_puesto, 'requirements', {})
-                        exp_requerida = safe_get(requirements, 'años_experiencia')
-                        if exp_requerida:
-                            st.metric("Años de Experiencia Requeridos", exp_requerida)
-                        
-                        seniority = safe_get(analisis_puesto, 'seniority', 'no especificado')
-                        if seniority != 'no especificado':
-                            st.metric("Nivel de Seniority", seniority.title())
-                    
-                    with col2:
-                        nivel_educativo = safe_get(requirements, 'nivel_educativo')
-                        if nivel_educativo:
-                            st.metric("Nivel Educativo Requerido", nivel_educativo.title())
-                        
-                        industries = safe_get(analisis_puesto, 'industries', [])
-                        if industries:
-                            st.write("**Industrias:**", ", ".join(industries))
-                    
-                    # Habilidades requeridas
-                    required_skills = safe_get(analisis_puesto, 'required_skills', {})
-                    if required_skills:
-                        st.write("**🛠️ Habilidades Requeridas:**")
-                        for category, skills_list in required_skills.items():
-                            with st.expander(f"{category.replace('_', ' ').title()} ({len(skills_list)} habilidades)"):
-                                for skill in skills_list:
-                                    st.write(f"• {skill}")
-                    
-                    # Match detallado
-                    match_details = safe_get(results, 'match_detallado', {})
-                    st.write("**✅ Coincidencias Encontradas:**")
-                    
-                    habilidades_coincidentes = safe_get(match_details, 'habilidades_coincidentes', {})
-                    if habilidades_coincidentes:
-                        st.success("**Habilidades que coinciden:**")
-                        for category, skills in habilidades_coincidentes.items():
-                            st.write(f"**{category.replace('_', ' ').title()}:** {', '.join(skills)}")
-                    
-                    habilidades_faltantes = safe_get(match_details, 'habilidades_faltantes', {})
-                    if habilidades_faltantes:
-                        st.error("**Habilidades faltantes:**")
-                        for category, skills in habilidades_faltantes.items():
-                            st.write(f"**{category.replace('_', ' ').title()}:** {', '.join(skills)}")
-                
-                else:
-                    st.info("ℹ️ Agrega una descripción del puesto para ver el análisis de adaptación específico")
-
-            with tab6:  # Agregar esta nueva pestaña
-                st.subheader("🛠️ Mejora de CV - Análisis de Forma y Estructura")
-                
-                if cv_text and not cv_text.startswith("Error"):
-                    # Analizar mejora del CV
-                    improvement_analyzer = CVImprovementAnalyzer()
-                    improvement_report = improvement_analyzer.generate_improvement_report(cv_text)
-                    
-                    # Mostrar puntuación general de mejora
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Puntuación General", f"{improvement_report['overall_score']}/100")
-                    with col2:
-                        st.metric("Estructura", f"{improvement_report['category_scores']['estructura']}/100")
-                    with col3:
-                        st.metric("Contenido", f"{improvement_report['category_scores']['contenido']}/100")
-                    with col4:
-                        st.metric("Formato", f"{improvement_report['category_scores']['formato']}/100")
-                    
-                    # Gráfico de radar para categorías
-                    categories = list(improvement_report['category_scores'].keys())
-                    scores = list(improvement_report['category_scores'].values())
-                    
-                    fig_radar = go.Figure()
-                    fig_radar.add_trace(go.Scatterpolar(
-                        r=scores + [scores[0]],  # Cerrar el círculo
-                        theta=categories + [categories[0]],
-                        fill='toself',
-                        name='Puntuación por Categoría'
-                    ))
-                    
-                    fig_radar.update_layout(
-                        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-                        showlegend=False,
-                        title="Análisis por Categorías de Mejora",
-                        height=400
-                    )
-                    
-                    st.plotly_chart(fig_radar, use_container_width=True)
-                    
-                    # Recomendaciones de mejora
-                    st.subheader("💡 Recomendaciones de Mejora")
-                    
-                    # Organizar por prioridad
-                    high_priority = [r for r in improvement_report['recommendations'] if r['priority'] == 'alta']
-                    medium_priority = [r for r in improvement_report['recommendations'] if r['priority'] == 'media']
-                    low_priority = [r for r in improvement_report['recommendations'] if r['priority'] == 'baja']
-                    
-                    if high_priority:
-                        st.error("**🚨 Mejoras de Alta Prioridad**")
-                        for rec in high_priority:
-                            with st.expander(f"🔴 {rec['message']}", expanded=True):
-                                st.write(f"**Sugerencia:** {rec['suggestion']}")
-                                st.write(f"**Categoría:** {rec['category']}")
-                    
-                    if medium_priority:
-                        st.warning("**⚠️ Mejoras de Prioridad Media**")
-                        for rec in medium_priority:
-                            with st.expander(f"🟡 {rec['message']}"):
-                                st.write(f"**Sugerencia:** {rec['suggestion']}")
-                                st.write(f"**Categoría:** {rec['category']}")
-                    
-                    if low_priority:
-                        st.info("**💡 Mejoras de Prioridad Baja**")
-                        for rec in low_priority:
-                            with st.expander(f"🔵 {rec['message']}"):
-                                st.write(f"**Sugerencia:** {rec['suggestion']}")
-                                st.write(f"**Categoría:** {rec['category']}")
-                    
-                    # Análisis detallado por categoría
-                    st.subheader("📊 Análisis Detallado")
-                    
-                    detail_tab1, detail_tab2, detail_tab3, detail_tab4 = st.tabs(["🏗️ Estructura", "📝 Contenido", "🎨 Formato", "✅ Completitud"])
-                    
-                    with detail_tab1:
-                        structure = improvement_report['detailed_analysis']['structure']
-                        st.write("**Secciones Encontradas:**")
-                        for section in structure['sections_found']:
-                            st.write(f"✅ {section['section'].title()} (línea {section['line_number']})")
-                        
-                        if structure['sections_missing']:
-                            st.write("**Secciones Faltantes:**")
-                            for section in structure['sections_missing']:
-                                st.write(f"❌ {section.title()}")
-                        
-                        st.write("**Estadísticas de Estructura:**")
-                        col1, col2, col3 = st.columns(3)
-                        col1.metric("Palabras", structure['word_count'])
-                        col2.metric("Líneas", structure['line_count'])
-                        col3.metric("Párrafos", structure['paragraph_count'])
-                    
-                    with detail_tab2:
-                        content = improvement_report['detailed_analysis']['content']
-                        st.write("**Calidad del Contenido:**")
-                        col1, col2, col3, col4 = st.columns(4)
-                        col1.metric("Verbos Acción", content['action_verbs_count'])
-                        col2.metric("Palabras Débiles", content['weak_words_count'])
-                        col3.metric("Oraciones", content['sentence_count'])
-                        col4.metric("Long. Prom. Oración", content['avg_sentence_length'])
-                        
-                        if content['action_verbs_count'] < 5:
-                            st.info("**💡 Tip:** Usa más verbos de acción como: " + ", ".join(improvement_analyzer.action_verbs[:5]))
-                    
-                    with detail_tab3:
-                        formatting = improvement_report['detailed_analysis']['formatting']
-                        st.write("**Análisis de Formato:**")
-                        col1, col2, col3 = st.columns(3)
-                        col1.metric("Long. Prom. Línea", formatting['avg_line_length'])
-                        col2.metric("Líneas Largas", formatting['long_lines_count'])
-                        col3.metric("Viñetas", formatting['bullet_points_count'])
-                        
-                        if formatting['long_lines_count'] > 5:
-                            st.warning("**📏 Considera dividir líneas muy largas para mejor legibilidad**")
-                    
-                    with detail_tab4:
-                        completeness = improvement_report['detailed_analysis']['completeness']
-                        st.write("**Completitud de Información:**")
-                        
-                        # Información de contacto
-                        st.write("**📞 Contacto:**")
-                        contact_cols = st.columns(4)
-                        contact_cols[0].write(f"Email: {'✅' if completeness['contact_info']['has_email'] else '❌'}")
-                        contact_cols[1].write(f"Teléfono: {'✅' if completeness['contact_info']['has_phone'] else '❌'}")
-                        contact_cols[2].write(f"LinkedIn: {'✅' if completeness['contact_info']['has_linkedin'] else '❌'}")
-                        
-                        # Educación y experiencia
-                        st.write("**🎓 Educación y Experiencia:**")
-                        edu_exp_cols = st.columns(3)
-                        edu_exp_cols[0].write(f"Educación Superior: {'✅' if completeness['education_info']['has_higher_education'] else '❌'}")
-                        edu_exp_cols[1].write(f"Años Experiencia: {'✅' if completeness['experience_info']['years_experience'] > 0 else '❌'}")
-                        edu_exp_cols[2].write(f"Logros Cuantificables: {'✅' if completeness['experience_info']['has_quantifiable_achievements'] else '❌'}")
-                    
-                    # Plantillas y ejemplos
-                    with st.expander("📋 Plantillas y Ejemplos de Mejora"):
-                        st.markdown("""
-                        ### 🎯 Ejemplos de Mejoras:
-                        
-                        **❌ Antes:** "Ayudé en el desarrollo del proyecto"
-                        **✅ Después:** "Lideré el desarrollo del proyecto que incrementó la eficiencia en 30%"
-                        
-                        **❌ Antes:** "Fui parte del equipo de ventas"
-                        **✅ Después:** "Coordiné el equipo de ventas que superó los objetivos en 25%"
-                        
-                        ### 📝 Estructura Recomendada:
-                        1. **Información de Contacto** (nombre, teléfono, email, LinkedIn)
-                        2. **Resumen Profesional** (2-3 líneas con tu valor único)
-                        3. **Experiencia Laboral** (orden inverso cronológico)
-                        4. **Educación** (títulos y certificaciones)
-                        5. **Habilidades** (técnicas y blandas)
-                        6. **Logros y Certificaciones** (opcional)
-                        
-                        ### 💡 Consejos de Formato:
-                        - Usa **viñetas** para listar logros
-                        - Mantén las **líneas cortas** (60-80 caracteres)
-                        - Usa **verbos de acción** al inicio de cada punto
-                        - **Cuantifica** tus logros con números y porcentajes
-                        """)
-                
-                else:
-                    st.info("📄 Sube un CV para analizar y obtener recomendaciones de mejora")
+            # Solo se calcula y dibuja la sección elegida; cambiar de sección vuelve a
+            # ejecutar únicamente este fragmento, no la página completa
+            render_result_sections(analysis)
         
         # Sección de recomendaciones - CORREGIDA
         st.markdown("---")
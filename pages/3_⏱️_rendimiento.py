@@ -0,0 +1,86 @@
+import streamlit as st
+from controllers.auth import require_page_auth, get_current_user, require_role
+require_page_auth()
+user_info = get_current_user()
+require_role(['admin'])
+from modules.metricas import get_stage_stats, reset_stage_stats, METRICS_ENABLED, METRICS_LOG, METRICS_WINDOW
+from modules.modelos import get_model_stats
+from modules.pipeline import get_cache_stats, get_feature_cache_stats
+from modules.cache import get_extraction_cache
+from modules.trabajos import get_job_stats
+from modules.arranque import get_warmup_stats
+from components.navbar_superior import navbar
+
+# Orden del recorrido de un CV por el sistema
+STAGE_ORDER = ['analisis', 'extraccion', 'ocr', 'ner', 'analizador.habilidades', 'analizador.experiencia',
+               'analizador.educacion', 'analizador.contacto', 'analizador.calidad', 'puntuacion', 'mejora']
+
+
+def main():
+    st.set_page_config(
+        page_title="Rendimiento del Analizador",
+        page_icon="⏱️",
+        layout="wide",
+        initial_sidebar_state="collapsed"
+    )
+
+    navbar("rendimiento")
+
+    st.title("⏱️ Rendimiento por etapa")
+    st.caption(f"Métricas de este proceso (últimas {METRICS_WINDOW} mediciones por etapa). "
+               f"Registro JSONL: {METRICS_LOG or 'desactivado (ATS_METRICS_LOG)'}")
+
+    if not METRICS_ENABLED:
+        st.warning("⚠️ La medición está desactivada (ATS_METRICS=0)")
+        return
+
+    col1, col2 = st.columns([1, 5])
+    with col1:
+        if st.button("🔄 Actualizar", use_container_width=True):
+            st.rerun()
+        if st.button("🗑️ Reiniciar", use_container_width=True):
+            reset_stage_stats()
+            st.rerun()
+
+    stats = get_stage_stats()
+    if not stats:
+        st.info("📭 Aún no hay mediciones: analiza algún CV y vuelve a esta página")
+        return
+
+    import pandas as pd
+    ordered = [stage for stage in STAGE_ORDER if stage in stats] + [stage for stage in stats if stage not in STAGE_ORDER]
+    table = pd.DataFrame([{'etapa': stage, **stats[stage]} for stage in ordered]).set_index('etapa')
+    table = table.rename(columns={
+        'count': 'llamadas', 'errors': 'errores', 'cache_hits': 'aciertos caché',
+        'cache_hit_rate': 'tasa caché', 'avg_size': 'tamaño medio', 'window': 'ventana'
+    })
+
+    with col2:
+        st.dataframe(table, use_container_width=True)
+
+    latency_columns = [column for column in ('p50_ms', 'p95_ms', 'p99_ms') if column in table.columns]
+    if latency_columns:
+        st.subheader("📈 Latencia por etapa (ms)")
+        st.bar_chart(table[latency_columns])
+
+    st.subheader("🗃️ Cachés y modelos")
+    cache_col, extraction_col, model_col = st.columns(3)
+    with cache_col:
+        st.markdown("**Caché de análisis**")
+        st.json(get_cache_stats())
+        st.markdown("**Caché de características del CV**")
+        st.json(get_feature_cache_stats())
+        st.markdown("**Trabajos en segundo plano**")
+        st.json(get_job_stats())
+    with extraction_col:
+        st.markdown("**Caché de extracción**")
+        extraction_cache = get_extraction_cache()
+        st.json(extraction_cache.stats() if extraction_cache is not None else {'enabled': False})
+    with model_col:
+        st.markdown("**Modelos NLP**")
+        st.json(get_model_stats())
+        st.markdown("**Precarga al arrancar**")
+        st.json(get_warmup_stats())
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file